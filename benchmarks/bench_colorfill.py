@@ -0,0 +1,330 @@
+#   bench_colorfill.py
+#   Benchmarks for the Board backends' and ColorfillWorldEnv's hot paths, with JSON output and a comparison mode
+#
+#   Usage (from the repository root):
+#       python benchmarks/bench_colorfill.py run --output results.json [--sizes 8 14 20] [--backends object array] [--n-startup 10]
+#       python benchmarks/bench_colorfill.py compare baseline.json results.json [--threshold 0.10]
+#
+#   `compare` exits with status 1 if any benchmark's median latency regressed by more than the threshold.
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Any, Callable
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# imports from external libraries
+import numpy as np
+
+# import from within package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")   # human rendering without a display
+
+import colorfill_gym_env.envs.colorfill as cf
+from colorfill_gym_env.envs.colorfill_rollout import rollout
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+
+# constants
+ROLLOUT_PLAYOUTS: int = 16
+ROLLOUT_BATCH_PLAYOUTS: int = 4096
+
+
+### FUNCTION DEFINITIONS ###
+def time_calls(setup: Callable[[], Any], call: Callable[[Any], Any], n: int, warmup: int = 3) -> dict[str, float]:
+    """
+        Times `call(setup())` `n` times (only `call` is timed) and summarizes the latencies.
+        The garbage collector is paused while timing, so collections don't land in random samples.
+    """
+    for _ in range(warmup):
+        call(setup())
+
+    latencies_ns: np.ndarray = np.empty(n, dtype=np.int64)
+    gc_was_enabled: bool = gc.isenabled()
+    gc.disable()
+    try:
+        for i in range(n):
+            arg = setup()
+            start: int = time.perf_counter_ns()
+            call(arg)
+            latencies_ns[i] = time.perf_counter_ns() - start
+    finally:
+        if (gc_was_enabled):
+            gc.enable()
+
+    return summarize(latencies_ns)
+
+
+def summarize(latencies_ns: np.ndarray) -> dict[str, float]:
+    """Mean, percentiles (in microseconds) and throughput of a set of latencies."""
+    latencies_us: np.ndarray = np.asarray(latencies_ns) / 1000
+    return {
+        "n": latencies_us.size,
+        "mean_us": float(latencies_us.mean()),
+        "p50_us": float(np.percentile(latencies_us, 50)),
+        "p90_us": float(np.percentile(latencies_us, 90)),
+        "p99_us": float(np.percentile(latencies_us, 99)),
+        "ops_per_s": float(1e6 / latencies_us.mean()),
+    }
+
+
+def board_after(board_class: type, size: int, n_moves: int, seed: int) -> Any:
+    """A board of `board_class` (seeded), after `n_moves` random legal moves (or until it's filled)."""
+    rng = np.random.default_rng(seed)
+    board = board_class(rand_generator=np.random.default_rng(seed), rows=size, cols=size)
+    for _ in range(n_moves):
+        moves = board.possible_moves()
+        if (not moves):
+            break
+        board.make_move(moves[rng.integers(len(moves))])
+    return board
+
+
+def random_legal_move(board: Any, rng: np.random.Generator) -> Any:
+    moves = board.possible_moves()
+    return moves[rng.integers(len(moves))] if moves else cf.Color(0)
+
+
+def random_legal_action(board: Any, rng: np.random.Generator) -> int:
+    return random_legal_move(board, rng).color_index
+
+
+def bench_board(backend: str, size: int, n: int) -> dict[str, dict[str, float]]:
+    """Board construction, moves in each game phase, possible_moves, to_numpy_matrix and rollouts."""
+    board_class = ColorfillWorldEnv.board_backends[backend]
+    seeds = iter(range(10**9))
+    results: dict[str, dict[str, float]] = {}
+
+    results["init"] = time_calls(
+        lambda: np.random.default_rng(next(seeds)),
+        lambda rng: board_class(rand_generator=rng, rows=size, cols=size),
+        n,
+    )
+    results["make_random_matrix"] = time_calls(
+        lambda: np.random.default_rng(next(seeds)),
+        lambda rng: cf.Board.make_random_matrix(size, size, rand_generator=rng),
+        n,
+    )
+
+    # game phases, by moves already made (scaled with the board's side, so bigger boards get later phases).
+    #   The move is picked in the (untimed) setup, so only make_move is timed, not possible_moves.
+    phases: dict[str, int] = {"early": 1, "mid": size * 2 // 3, "late": size * 4 // 3}
+    rng = np.random.default_rng(0)
+
+    def board_and_move(n_moves: int) -> tuple[Any, Any]:
+        board = board_after(board_class, size, n_moves, next(seeds))
+        return board, random_legal_move(board, rng)
+
+    for phase, n_moves in phases.items():
+        results[f"make_move_{phase}"] = time_calls(
+            lambda: board_and_move(n_moves),
+            lambda board_move: board_move[0].make_move(board_move[1]),
+            n,
+        )
+
+    mid_board = board_after(board_class, size, phases["mid"], 0)
+    results["possible_moves"] = time_calls(lambda: mid_board, lambda board: board.possible_moves(), n)
+    results["to_numpy_matrix"] = time_calls(lambda: mid_board, lambda board: board.to_numpy_matrix(), n)
+    # a batch of ROLLOUT_PLAYOUTS random playouts to the env's move limit, e.g. what an MCTS leaf costs
+    results["rollout_random"] = time_calls(
+        lambda: mid_board, lambda board: rollout(board, n=ROLLOUT_PLAYOUTS, seed=0), max(1, n // 10)
+    )
+    # ... and one big batch, for playout throughput (ROLLOUT_BATCH_PLAYOUTS / latency)
+    results["rollout_random_batch"] = time_calls(
+        lambda: mid_board, lambda board: rollout(board, n=ROLLOUT_BATCH_PLAYOUTS, seed=0), max(1, n // 100), warmup=1
+    )
+    return results
+
+
+def bench_env(backend: str, size: int, n: int) -> dict[str, dict[str, float]]:
+    """ColorfillWorldEnv reset / step without rendering, and step + render in both render modes."""
+    results: dict[str, dict[str, float]] = {}
+    seeds = iter(range(10**9))
+    rng = np.random.default_rng(0)
+
+    env = ColorfillWorldEnv(size=size, board_backend=backend)
+    results["env_reset"] = time_calls(lambda: next(seeds), lambda seed: env.reset(seed=seed), n)
+
+    def env_and_action(env: ColorfillWorldEnv) -> tuple[ColorfillWorldEnv, int]:
+        # untimed: start a new episode when the last one ended (same rule as step's `terminated`),
+        #   and pick the action, so only step (and render) is timed
+        if (env._moves is None or len(env._moves) >= env.max_moves or env._board.n_blob_tiles == size**2):
+            env.reset(seed=next(seeds))
+        return env, random_legal_action(env._board, rng)
+
+    results["env_step"] = time_calls(
+        lambda: env_and_action(env),
+        lambda env_action: env_action[0].step(env_action[1]),
+        n,
+    )
+    env.close()
+
+    for render_mode in ColorfillWorldEnv.metadata["render_modes"]:
+        env = ColorfillWorldEnv(size=size, board_backend=backend, render_mode=render_mode, render_fps=0)
+        env.reset(seed=0)
+        results[f"env_step_render_{render_mode}"] = time_calls(
+            lambda: env_and_action(env),
+            lambda env_action: (env_action[0].step(env_action[1]), env_action[0].render()),
+            n,
+        )
+        env.close()
+    return results
+
+
+def bench_startup(n: int) -> dict[str, float]:
+    """
+        Headless startup: importing colorfill_world, building an env and the first reset(), each run in
+        a fresh interpreter (timed inside it, so interpreter startup itself isn't counted).
+    """
+    code: str = (
+        "import time; start = time.perf_counter_ns();"
+        "from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv;"
+        "ColorfillWorldEnv().reset(seed=0);"
+        "print(time.perf_counter_ns() - start)"
+    )
+    repo_root: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    latencies_ns: list[int] = [
+        int(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=repo_root).stdout)
+        for _ in range(n)
+    ]
+    return summarize(np.asarray(latencies_ns))
+
+
+def peak_env_memory(backend: str, size: int) -> int:
+    """Peak bytes allocated (per tracemalloc) while building an env and playing one full episode."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        env = ColorfillWorldEnv(size=size, board_backend=backend)
+        env.reset(seed=0)
+        rng = np.random.default_rng(0)
+        terminated = False
+        while not terminated:
+            _, _, terminated, _, _ = env.step(random_legal_action(env._board, rng))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    env.close()
+    return peak
+
+
+def run(sizes: list[int], backends: list[str], n: int, n_startup: int) -> dict[str, Any]:
+    results: dict[str, dict[str, float]] = {}
+    memory: dict[str, int] = {}
+    skipped: dict[str, str] = {}
+
+    if (n_startup > 0):
+        print("benchmarking startup ...", file=sys.stderr)
+        results["startup/import_construct_reset"] = bench_startup(n_startup)
+
+    for backend in backends:
+        for size in sizes:
+            prefix: str = f"{backend}/{size}"
+            print(f"benchmarking {prefix} ...", file=sys.stderr)
+            try:
+                for name, summary in {**bench_board(backend, size, n), **bench_env(backend, size, n)}.items():
+                    results[f"{prefix}/{name}"] = summary
+                memory[prefix] = peak_env_memory(backend, size)
+            except Exception as error:     # e.g. a backend that doesn't support this board size
+                skipped[prefix] = f"{type(error).__name__}: {error}"
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "n": n,
+            "n_startup": n_startup,
+        },
+        "results": results,
+        "peak_env_memory_bytes": memory,
+        "skipped": skipped,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float, metric: str = "p50_us") -> list[str]:
+    """
+        Prints the change in `metric` for every benchmark in both files.
+        Returns the names of the benchmarks that got slower by more than `threshold` (a fraction).
+    """
+    regressions: list[str] = []
+    print(f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name in sorted(baseline["results"].keys() & current["results"].keys()):
+        before: float = baseline["results"][name][metric]
+        after: float = current["results"][name][metric]
+        change: float = (after - before) / before if before > 0 else 0.0
+        flag: str = ""
+        if (change > threshold):
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48} {before:>10.1f}us {after:>10.1f}us {change:>+8.1%}{flag}")
+
+    for prefix in sorted(baseline["peak_env_memory_bytes"].keys() & current["peak_env_memory_bytes"].keys()):
+        before, after = baseline["peak_env_memory_bytes"][prefix], current["peak_env_memory_bytes"][prefix]
+        print(f"{prefix + ' peak memory':<48} {before / 1024:>10.0f}KB {after / 1024:>10.0f}KB {(after - before) / before:>+8.1%}")
+
+    missing: set[str] = baseline["results"].keys() - current["results"].keys()
+    if (missing):
+        print(f"not in current results: {', '.join(sorted(missing))}")
+    return regressions
+
+
+def _git_commit() -> str|None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks for the Colorfill Board backends and ColorfillWorldEnv.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks and write JSON results")
+    run_parser.add_argument("--output", "-o", default="-", help="results file, '-' for stdout")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[8, 14, 20])
+    run_parser.add_argument("--backends", nargs="+", default=list(ColorfillWorldEnv.board_backends))
+    run_parser.add_argument("--n", type=int, default=200, help="timed calls per benchmark")
+    run_parser.add_argument("--n-startup", type=int, default=10, help="fresh interpreters for the startup benchmark")
+
+    compare_parser = subparsers.add_parser("compare", help="compare two results files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, as a fraction")
+    compare_parser.add_argument("--metric", default="p50_us", choices=["mean_us", "p50_us", "p90_us", "p99_us"])
+
+    args = parser.parse_args()
+    if (args.command == "run"):
+        results = run(args.sizes, args.backends, args.n, args.n_startup)
+        text: str = json.dumps(results, indent=2)
+        if (args.output == "-"):
+            print(text)
+        else:
+            with open(args.output, "w") as output_file:
+                output_file.write(text)
+        return 0
+
+    with open(args.baseline) as baseline_file, open(args.current) as current_file:
+        regressions = compare(json.load(baseline_file), json.load(current_file), args.threshold, args.metric)
+    if (regressions):
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
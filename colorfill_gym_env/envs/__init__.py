@@ -1 +1,3 @@
 from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+from colorfill_gym_env.envs.colorfill_vector import ColorfillVectorEnv
+from colorfill_gym_env.envs.colorfill_shared_vector import ColorfillSharedVectorEnv
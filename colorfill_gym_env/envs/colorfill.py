@@ -4,12 +4,17 @@
 #   Developed for Python 3.11
 
 # imports from standard library
-from typing import Any, Self
+from typing import Self
 import copy
+import functools
+import weakref
 
 # imports from external libraries
 import numpy as np
 
+# import from within package
+from colorfill_gym_env.envs.colorfill_profile import Profiler
+
 
 ### CLASS DEFINITIONS ###
 class Color:
@@ -18,7 +23,16 @@ class Color:
 
     The default color scheme includes six (6) colors:
         Blue, Black, Red, Yellow, Orange, White
+
+    Boards can be played with more colors (see Board's `n_colors`), up to MAX_COLORS, which
+    extends the palette with:
+        Green, Purple, Cyan, Magenta, Brown, Teal
+
+    Colors are immutable flyweights: there is one Color object per color index, and Color(i)
+    returns it instead of allocating a new one, so Color(i) is Color(i).
     """
+    __slots__ = ("_color_index",)
+
     # constants
     N_COLORS: int = 6
     COLOR_RGB = [
@@ -27,8 +41,16 @@ class Color:
         (255, 0, 0),    # red
         (255, 255, 0),  # yellow
         (255, 165, 0),  # orange
-        (255, 255, 255) # white
+        (255, 255, 255),  # white
+        # extended palette, for boards with more than N_COLORS colors
+        (0, 160, 0),    # green
+        (128, 0, 128),  # purple
+        (0, 255, 255),  # cyan
+        (255, 0, 255),  # magenta
+        (139, 69, 19),  # brown
+        (0, 128, 128),  # teal
     ]
+    MAX_COLORS: int = len(COLOR_RGB)
 
     _COLOR_DICT_INDEX_TO_NAME = {
         0: "Blue",
@@ -37,6 +59,12 @@ class Color:
         3: "Yellow",
         4: "Orange",
         5: "White",
+        6: "Green",
+        7: "Purple",
+        8: "Cyan",
+        9: "Magenta",
+        10: "Brown",
+        11: "Teal",
     }
 
     _COLOR_DICT_NAME_TO_INDEX = {
@@ -45,7 +73,13 @@ class Color:
         "Red": 2,
         "Yellow": 3,
         "Orange": 4,
-        "White": 5
+        "White": 5,
+        "Green": 6,
+        "Purple": 7,
+        "Cyan": 8,
+        "Magenta": 9,
+        "Brown": 10,
+        "Teal": 11,
     }
 
     _COLOR_DICT_INDEX_TO_SHORT_NAME = {
@@ -55,6 +89,12 @@ class Color:
         3: "Y",
         4: "O",
         5: "W",
+        6: "G",
+        7: "P",
+        8: "C",
+        9: "M",
+        10: "N",
+        11: "T",
     }
 
     _COLOR_DICT_SHORT_NAME_TO_INDEX = {
@@ -63,13 +103,26 @@ class Color:
         "R": 2,
         "Y": 3,
         "O": 4,
-        "W": 5
+        "W": 5,
+        "G": 6,
+        "P": 7,
+        "C": 8,
+        "M": 9,
+        "N": 10,
+        "T": 11,
     }
 
+    _FLYWEIGHTS: dict[int, "Color"] = {}
+
     # methods
-    def __init__(self, color_index: int) -> Self:
-        assert color_index in range(0, self.N_COLORS)
-        self._color_index: int = color_index
+    def __new__(cls, color_index: int) -> Self:
+        color = cls._FLYWEIGHTS.get(color_index)
+        if (color is None):
+            assert color_index in range(0, cls.MAX_COLORS)
+            color = super().__new__(cls)
+            color._color_index = int(color_index)
+            cls._FLYWEIGHTS[color._color_index] = color
+        return color
 
     def __eq__(self: Self, other: Self) -> bool:
         return self.color_index == other.color_index
@@ -79,15 +132,20 @@ class Color:
     
     def __repr__(self) -> str:
         return f"Color({self.color_name})"
+
+    def __reduce__(self) -> tuple:
+        # copies and unpickled Colors are the flyweight too
+        return (Color, (self._color_index,))
+
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Self:
+        return self
     
     @property
     def color_index(self) -> int:
         return self._color_index
-    
-    @color_index.setter
-    def color_index(self, new_index: int) -> None:
-        assert new_index in range(0, self.N_COLORS)
-        self._color_index = new_index
 
     @property
     def color_name(self) -> str:
@@ -138,64 +196,130 @@ class Position:
         - two-element coordinate of format (row, column)
         - (0,0) is top-left, row cooridnates increase rightward 
             and column coordinates increase downward
+
+    Positions are immutable, so a Board's Tiles can share one grid of them (see grid(...)),
+    and a Board can precompute each one's on-board neighbors (see grid_neighbors(...)).
     """
+    __slots__ = ("_row", "_col", "_neighbors")
+
     # constants
 
     # methods
     def __init__(self, row: int, col: int) -> Self:
-        self.row: int = row
-        self.col: int = col
+        self._row: int = row
+        self._col: int = col
+        self._neighbors: dict[str, Self]|None = None    # built by neighbors() on first use
 
     def __eq__(self: Self, other: Self) -> bool:
         return ((self.row == other.row) and (self.col == other.col))
     
-    def __hash__(self) -> tuple[int, int]:
-        return (self.row, self.col)
+    def __hash__(self) -> int:
+        return hash((self._row, self._col))
     
     def __str__(self) -> str:
         return f"({str(self.row)},{str(self.col)})"
+
+    def __reduce__(self) -> tuple:
+        return (Position, (self._row, self._col))
+
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Self:
+        return self
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def col(self) -> int:
+        return self._col
     
     def above(self) -> Self:
-        return Position(self.row - 1, self.col)
+        return Position(self._row - 1, self._col)
     
     def below(self) -> Self:
-        return Position(self.row + 1, self.col)
+        return Position(self._row + 1, self._col)
     
     def left(self) -> Self:
-        return Position(self.row, self.col - 1)
+        return Position(self._row, self._col - 1)
     
     def right(self) -> Self:
-        return Position(self.row, self.col + 1)
+        return Position(self._row, self._col + 1)
     
     def neighbors(self) -> dict[str, Self]:
-        return {
-            "above": self.above(),
-            "below": self.below(),
-            "left": self.left(),
-            "right": self.right()
-        }
+        """The four adjacent Positions, on a Board or not. Built once, then the same dict is returned."""
+        if (self._neighbors is None):
+            self._neighbors = {
+                "above": self.above(),
+                "below": self.below(),
+                "left": self.left(),
+                "right": self.right()
+            }
+        return self._neighbors
+
+    @staticmethod
+    def grid(rows: int, cols: int) -> tuple[tuple["Position", ...], ...]:
+        """New Positions for a (rows, cols) board, indexed [row][col]."""
+        return tuple(tuple(Position(row, col) for col in range(cols)) for row in range(rows))
+
+    @staticmethod
+    def grid_neighbors(grid: tuple[tuple["Position", ...], ...]) -> tuple[tuple[tuple["Position", ...], ...], ...]:
+        """Indexed [row][col], the neighbors of each Position of `grid` that are on the board, from `grid` itself."""
+        rows, cols = len(grid), len(grid[0])
+        return tuple(
+            tuple(
+                tuple(
+                    grid[n_row][n_col]
+                    for n_row, n_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                    if (0 <= n_row < rows and 0 <= n_col < cols)
+                )
+                for col in range(cols)
+            )
+            for row in range(rows)
+        )
 
 
 class Tile:
     """
     A single square on a Board.
+
+    While a Tile is part of a Blob, it takes the Blob's color (so recoloring a Blob doesn't
+    have to touch its Tiles); it keeps its own color again once it leaves the Blob.
+    Recolor a Tile in a Blob through the Blob (Blob.filled_color), not the Tile.
     """
+    __slots__ = ("_color", "_position", "_blob", "_board")
+
     # constants
 
     # methods
     def __init__(self, color: Color, position: Position) -> Self:
         self._color: Color = color
         self._position: Position = position
+        self._blob: Blob|None = None    # the Blob this Tile is part of, if any
+        self._board: weakref.ref|None = None    # (weak reference to) the Board this Tile is on, once it's on one
     
-    def neighbors(self) -> dict[str, Position]:
-        return self._position.neighbors()
+    def neighbors(self) -> tuple[Position, ...]:
+        """The neighbors of this Tile that are on its Board (the Board's own cached tuple, see Board.neighbors_of),
+            or all four neighboring Positions if the Tile isn't on a Board."""
+        board: Board|None = self._board() if (self._board is not None) else None
+        if (board is not None):
+            return board.neighbors_of(self._position)
+        return tuple(self._position.neighbors().values())
     
     @property
     def color(self) -> Color:
+        if (self._blob is not None):
+            return self._blob.filled_color
         return self._color
     
     @color.setter
     def color(self, new_color: Color) -> None:
+        if (self._blob is not None and new_color != self._blob.filled_color):
+            raise ValueError(
+                f"Tile.color: {self} is part of a Blob, so it can't be recolored on its own; set the Blob's filled_color"
+            )
         self._color = new_color
     
     @property
@@ -203,9 +327,24 @@ class Tile:
         return self._position
     
     def __eq__(self: Self, other: Self) -> bool:
-        color_match: bool = self._color == other._color
+        color_match: bool = self.color == other.color
         position_match: bool = self._position == other._position
         return (color_match and position_match)
+
+    def __hash__(self) -> int:
+        # a Tile's color changes as the game goes on, so only its position is hashed
+        return hash(self._position)
+
+    def __deepcopy__(self, memo: dict) -> Self:
+        # the Board isn't copied along with a Tile (or a Blob), but a copy of the Board gets the Tile copies
+        tile_copy: Tile = Tile.__new__(Tile)
+        memo[id(self)] = tile_copy
+        tile_copy._color = self._color
+        tile_copy._position = self._position
+        board_copy: Board|None = memo.get(id(self._board())) if (self._board is not None) else None
+        tile_copy._board = weakref.ref(board_copy) if (board_copy is not None) else self._board
+        tile_copy._blob = copy.deepcopy(self._blob, memo)
+        return tile_copy
     
     def __str__(self) -> str:
         """
@@ -223,13 +362,19 @@ class Blob:
     The collection of Tiles that have been filled so far.
 
     Not the 1958 movie, but highly similar.
+
+    Tiles are kept in order (oldest first) in a list, and in a set for O(1) `tile in blob`.
     """
+    __slots__ = ("_filled_color", "_filled_tiles", "_tile_set")
+
     # constants
 
     # methods
     def __init__(self, first_tile: Tile) -> Self:
-        self._filled_tiles: list[Tile] = [first_tile]
         self._filled_color: Color = first_tile.color
+        self._filled_tiles: list[Tile] = [first_tile]
+        self._tile_set: set[Tile] = {first_tile}
+        first_tile._blob = self
 
     @property
     def filled_tiles(self) -> list[Tile]:
@@ -241,8 +386,8 @@ class Blob:
     
     @filled_color.setter
     def filled_color(self, new_color: Color) -> None:
+        # Tiles in the Blob read their color from it, so this is O(1) however big the Blob is
         self._filled_color = new_color
-        self._update_color()    # updates the color of all Tiles in Blob
 
     @property
     def n_tiles(self) -> int:   # for better readability when determining size of Blob / Steve McQueen's chances
@@ -250,10 +395,33 @@ class Blob:
     
     def append(self, new_tile: Tile) -> None:
         self._filled_tiles.append(new_tile)
+        self._tile_set.add(new_tile)
+        new_tile._blob = self
 
     def remove(self, tile_to_remove: Tile) -> None:
-        if (tile_to_remove in self._filled_tiles):
+        if (tile_to_remove in self._tile_set):
             self._filled_tiles.remove(tile_to_remove)
+            self._tile_set.discard(tile_to_remove)
+            self._detach(tile_to_remove)
+
+    def truncate(self, n_tiles: int) -> list[Tile]:
+        """Keeps only the first `n_tiles` Tiles (i.e., the oldest ones). Returns the Tiles removed."""
+        removed: list[Tile] = self._filled_tiles[n_tiles:]
+        del self._filled_tiles[n_tiles:]
+        self._tile_set.difference_update(removed)
+        for tile in removed:
+            self._detach(tile)
+        return removed
+
+    def claim(self) -> None:
+        """Points every Tile in this Blob back at it, e.g. after they were part of another Blob."""
+        for tile in self._filled_tiles:
+            tile._blob = self
+
+    def release(self) -> None:
+        """Lets go of every Tile (they keep the Blob's current color), e.g. before the Blob is replaced."""
+        for tile in self._filled_tiles:
+            self._detach(tile)
 
     def deepcopy(self) -> Self:
         """
@@ -267,16 +435,28 @@ class Blob:
         """
         return copy.deepcopy(self)
 
-    def _update_color(self) -> None:
+    def __deepcopy__(self, memo: dict) -> Self:
+        # the Blob is filled in before its Tile set is built, since Tiles in it compare by its color
+        blob_copy: Blob = Blob.__new__(Blob)
+        memo[id(self)] = blob_copy
+        blob_copy._filled_color = self._filled_color
+        blob_copy._filled_tiles = copy.deepcopy(self._filled_tiles, memo)
+        blob_copy._tile_set = set(blob_copy._filled_tiles)
+        return blob_copy
+
+    def _detach(self, tile: Tile) -> None:
         """
-        Private method called when self.filled_color property is updated.
-        Updates the Color of all Tiles in Blob.
+        Private method for Tiles leaving the Blob: they keep its current color as their own.
         """
-        for this_tile in self._filled_tiles:
-            this_tile.color = self._filled_color
+        if (tile._blob is self):
+            tile._color = self._filled_color
+            tile._blob = None
 
     def __iter__(self) -> list[Tile]:
         return iter(self._filled_tiles)
+
+    def __contains__(self, tile: Tile) -> bool:
+        return tile in self._tile_set
     
     def __len__(self) -> int:
         return len(self._filled_tiles)
@@ -291,9 +471,326 @@ class Blob:
         return self._filled_tiles[index]
     
 
+class Zobrist:
+    """
+    Random 64-bit keys for Zobrist hashing of a game state, i.e. (Blob mask, Blob color).
+
+    A state's hash is the XOR of the key of every tile in the Blob and the key of the Blob's color,
+    so a move can update it by XOR-ing in only the newly absorbed tiles and the color change.
+
+    Keys are drawn from a fixed seed, so hashes are the same across processes, machines and
+    Board backends.
+    """
+    # constants
+    SEED: int = 0x5EED_C0DE
+
+    # key tables are kept for this many of the most recently used (rows, cols, n_colors)
+    TABLE_SHAPES: int = 4
+
+    # methods
+    @staticmethod
+    @functools.lru_cache(maxsize=TABLE_SHAPES)
+    def keys(rows: int, cols: int, n_colors: int = Color.N_COLORS) -> tuple[list[int], list[int]]:
+        """Returns (tile keys by flat index row * cols + col, color keys by color index) for this board shape."""
+        rng = np.random.default_rng([Zobrist.SEED, rows, cols, n_colors])
+        tile_keys = rng.integers(0, 2**64, size=rows * cols, dtype=np.uint64).tolist()
+        color_keys = rng.integers(0, 2**64, size=n_colors, dtype=np.uint64).tolist()
+        return tile_keys, color_keys
+
+    @classmethod
+    def hash_state(cls, blob_mask: np.ndarray, blob_color_index: int, n_colors: int = Color.N_COLORS) -> int:
+        """Computes a state's hash from scratch (O(tiles)). Boards keep theirs up to date incrementally."""
+        tile_keys, color_keys = cls.keys(blob_mask.shape[0], blob_mask.shape[1], n_colors)
+        state_hash: int = color_keys[blob_color_index]
+        for index in np.flatnonzero(blob_mask).tolist():
+            state_hash ^= tile_keys[index]
+        return state_hash
+
+
+class RegionGraph:
+    """
+    A board's same-colored connected regions (components), and which regions touch each other.
+
+    Flood-it is really played on this graph: a move absorbs every region of the chosen color
+    that touches the Blob. The regions are labeled once, when the graph is built, and moves
+    are then region merges whose cost depends on the number of regions touched, not tiles.
+
+    Topology (fixed once built):
+        - `colors`: (rows, cols) array of the color indices the graph was built from
+        - `labels`: (rows, cols) array of region ids, one per tile (numbered in row-major order)
+        - `region_colors`, `region_sizes`, `region_cells`: per region id
+        - `adjacency`: per region id, the set of neighboring region ids
+        - `region_border`: per region id, the flat indices (row * cols + col) of the tiles outside it that touch it
+          (built on first use)
+
+    Game state:
+        - `blob_regions`: the region ids merged into the Blob
+        - `frontier`: per color index, the ids of regions touching the Blob but not part of it
+        - `frontier_tile_counts`: per color index, the number of tiles touching the Blob but not part of it
+          (counted on first use, then kept up to date by absorb)
+        - blob_mask(): (rows, cols) bool array of the Blob's tiles, read off a per-region flag
+
+    absorb(..., record_undo=True) / undo_absorb() give make/unmake for lookahead.
+    """
+    # constants
+
+    # methods
+    def __init__(self,
+                 board_matrix: np.ndarray,
+                 n_colors: int = Color.N_COLORS) -> Self:
+        self.rows: int = board_matrix.shape[0]
+        self.cols: int = board_matrix.shape[1]
+        self.n_colors: int = n_colors
+
+        self._label_regions(np.asarray(board_matrix))
+
+        # start the blob as the region containing (0,0)
+        first_region: int = int(self.labels[0, 0])
+        self.blob_regions: set[int]
+        self.blob_color: int
+        self.n_blob_tiles: int
+        self.frontier: list[set[int]]
+        self._region_border: list[list[int]]|None = None
+        self._tile_counts: list[int]|None = None
+        self._tile_counted: bytearray|None = None
+        self._undo_log: list[tuple[int, list[int], list[int], int, int, list[int]|None, list[int]]]
+        self.set_blob({first_region}, self.region_colors[first_region])
+
+    @property
+    def n_regions(self) -> int:
+        return len(self.region_colors)
+
+    @property
+    def n_regions_remaining(self) -> int:
+        """Number of regions not yet merged into the Blob."""
+        return self.n_regions - len(self.blob_regions)
+
+    @property
+    def region_border(self) -> list[list[int]]:
+        if (self._region_border is None):
+            self._label_borders()
+        return self._region_border
+
+    @property
+    def frontier_tile_counts(self) -> list[int]:
+        if (self._tile_counts is None):
+            # counted from scratch once; from here on absorb(...) updates the counts
+            self._tile_counts = [0] * self.n_colors
+            self._tile_counted = bytearray(self.rows * self.cols)
+            for region in self.blob_regions:
+                self._count_border_tiles(region)
+        return self._tile_counts
+
+    def blob_mask(self) -> np.ndarray:
+        """(rows, cols) bool array, True where the tile is part of the Blob."""
+        return self._region_in_blob[self.labels]
+
+    def absorb(self, color_index: int, record_undo: bool = False) -> list[int]:
+        """
+            Merges every frontier region of `color_index` into the Blob, and adds their
+            neighbors to the frontier. Returns the ids of the newly absorbed regions.
+
+            Frontier tile counts (once counted) are updated from the absorbed regions' borders only: every
+            frontier tile of `color_index` is absorbed, and the other colors gain the border tiles not yet counted.
+
+            With `record_undo`, also logs what changed so undo_absorb() can revert it.
+        """
+        absorbed: list[int] = list(self.frontier[color_index])
+        added_to_frontier: list[int] = []
+        counted_tiles: list[int] = []
+        self.frontier[color_index] = set()
+        self.blob_regions.update(absorbed)
+        self._region_in_blob[absorbed] = True
+
+        counting_tiles: bool = (self._tile_counts is not None)
+        if (record_undo):
+            self._undo_log.append((color_index, absorbed, added_to_frontier, self.blob_color, self.n_blob_tiles,
+                                   self._tile_counts.copy() if (counting_tiles) else None, counted_tiles))
+
+        if (counting_tiles):
+            self._tile_counts[color_index] = 0
+        for region in absorbed:
+            self.n_blob_tiles += self.region_sizes[region]
+            for neighbor in self.adjacency[region]:
+                if (neighbor not in self.blob_regions):
+                    # neighboring regions never share a color, so this can't be `color_index`
+                    neighbor_frontier: set[int] = self.frontier[self.region_colors[neighbor]]
+                    if (record_undo and neighbor not in neighbor_frontier):
+                        added_to_frontier.append(neighbor)
+                    neighbor_frontier.add(neighbor)
+            if (counting_tiles):
+                self._count_border_tiles(region, counted_tiles if (record_undo) else None)
+
+        self.blob_color = color_index
+        return absorbed
+
+    def undo_absorb(self) -> list[int]:
+        """Reverts the last absorb(..., record_undo=True). Returns the ids of the regions given back."""
+        (color_index, absorbed, added_to_frontier, self.blob_color, self.n_blob_tiles,
+         tile_counts, counted_tiles) = self._undo_log.pop()
+
+        if (tile_counts is None):
+            # the move was made before the tiles were counted, so count them again on next use
+            self._tile_counts = self._tile_counted = None
+        else:
+            self._tile_counts = tile_counts
+            for tile in counted_tiles:
+                self._tile_counted[tile] = False
+        for region in added_to_frontier:
+            self.frontier[self.region_colors[region]].discard(region)
+        self.blob_regions.difference_update(absorbed)
+        self._region_in_blob[absorbed] = False
+        self.frontier[color_index] = set(absorbed)
+
+        return absorbed
+
+    def gain(self, color_index: int) -> int:
+        """Number of tiles absorb(color_index) would add to the Blob, without changing anything."""
+        return sum(self.region_sizes[region] for region in self.frontier[color_index])
+
+    def set_blob(self, blob_regions: set[int], blob_color: int) -> None:
+        """Replaces the game state with the given Blob regions, and rebuilds the frontier from them."""
+        self.blob_regions = set(blob_regions)
+        self._region_in_blob = np.zeros(self.n_regions, dtype=bool)
+        self._region_in_blob[list(self.blob_regions)] = True
+        self.blob_color = blob_color
+        self.n_blob_tiles = sum(self.region_sizes[region] for region in self.blob_regions)
+        self.frontier = [set() for _ in range(self.n_colors)]
+        self._tile_counts = self._tile_counted = None
+        self._undo_log = []
+
+        for region in self.blob_regions:
+            for neighbor in self.adjacency[region]:
+                if (neighbor not in self.blob_regions):
+                    self.frontier[self.region_colors[neighbor]].add(neighbor)
+
+    def possible_moves(self) -> list[int]:
+        """Color indices with at least one region on the Blob's frontier."""
+        return [color_index for color_index, regions in enumerate(self.frontier) if regions]
+
+    def distances_from_blob(self) -> dict[int, int]:
+        """Breadth-first distance (in moves) from the Blob to every region not yet in it."""
+        distances: dict[int, int] = {}
+        layer: set[int] = set().union(*self.frontier)
+        distance: int = 1
+        while layer:
+            next_layer: set[int] = set()
+            for region in layer:
+                distances[region] = distance
+            for region in layer:
+                for neighbor in self.adjacency[region]:
+                    if (neighbor not in distances and neighbor not in self.blob_regions):
+                        next_layer.add(neighbor)
+            layer = next_layer
+            distance += 1
+        return distances
+
+    def eccentricity(self) -> int:
+        """
+            Graph distance from the Blob to the farthest region not yet in it.
+            Every move absorbs at most one more layer, so this is a lower bound on the moves left.
+        """
+        return max(self.distances_from_blob().values(), default=0)
+
+    def _count_border_tiles(self, region: int, counted_tiles: list[int]|None = None) -> None:
+        """
+            Private method that adds the tiles touching Blob region `region` to the frontier tile counts,
+            unless they are in the Blob or already counted. Tiles stay flagged as counted once absorbed
+            (the Blob check comes first), so only undo_absorb() clears the flags, of the tiles in `counted_tiles`.
+        """
+        region_border: list[int] = self.region_border[region]
+        tile_counted: bytearray = self._tile_counted
+        tile_regions: list[int] = self._tile_regions
+        tile_colors: bytes = self._tile_colors
+        for tile in region_border:
+            if (not tile_counted[tile] and tile_regions[tile] not in self.blob_regions):
+                tile_counted[tile] = True
+                self._tile_counts[tile_colors[tile]] += 1
+                if (counted_tiles is not None):
+                    counted_tiles.append(tile)
+
+    def _label_regions(self, board_matrix: np.ndarray) -> None:
+        """
+        Private method that labels the connected regions and records the region adjacency graph.
+
+        Vectorized, so building the graph stays cheap on large boards:
+            (1) label_regions(...) gives every tile the smallest flat index in its region;
+                numbering those indices in order gives region ids in row-major order
+            (2) region colors, sizes and cells are read off the labels
+            (3) regions are adjacent wherever two neighboring tiles have different labels
+        """
+        rows, cols = self.rows, self.cols
+        self.colors: np.ndarray = np.array(board_matrix, dtype=np.uint8)
+
+        # step (1)
+        root_indices, labels = np.unique(label_regions(self.colors), return_inverse=True)
+        self.labels: np.ndarray = labels.reshape(rows, cols).astype(np.int32)
+        n_regions: int = root_indices.size
+
+        # step (2)
+        self.region_colors: list[int] = self.colors.reshape(-1)[root_indices].tolist()
+        self.region_sizes: list[int] = np.bincount(self.labels.reshape(-1), minlength=n_regions).tolist()
+
+        tiles_by_region: np.ndarray = np.argsort(self.labels, axis=None, kind="stable")
+        cell_rows, cell_cols = np.divmod(tiles_by_region, cols)
+        cells: list[tuple[int, int]] = list(zip(cell_rows.tolist(), cell_cols.tolist()))
+        offsets: list[int] = [0] + np.cumsum(self.region_sizes).tolist()
+        self.region_cells: list[list[tuple[int, int]]] = [
+            cells[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])
+        ]
+
+        # step (3)
+        differ_down: np.ndarray = (self.labels[1:, :] != self.labels[:-1, :])
+        differ_right: np.ndarray = (self.labels[:, 1:] != self.labels[:, :-1])
+        first: np.ndarray = np.concatenate([self.labels[:-1, :][differ_down], self.labels[:, :-1][differ_right]]).astype(np.int64)
+        second: np.ndarray = np.concatenate([self.labels[1:, :][differ_down], self.labels[:, 1:][differ_right]]).astype(np.int64)
+        pairs: np.ndarray = np.sort(np.concatenate([first * n_regions + second, second * n_regions + first]))
+        if (pairs.size > 0):    # a single-region board (e.g. uniform, 1x1, or filled) has no adjacent pairs
+            pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])]    # drop duplicates
+        pair_regions, pair_neighbors = np.divmod(pairs, n_regions)
+
+        neighbors: list[int] = pair_neighbors.tolist()
+        neighbor_offsets: list[int] = np.searchsorted(pair_regions, np.arange(n_regions + 1)).tolist()
+        self.adjacency: list[set[int]] = [
+            set(neighbors[start:stop]) for start, stop in zip(neighbor_offsets[:-1], neighbor_offsets[1:])
+        ]
+
+    def _label_borders(self) -> None:
+        """
+            Private method that builds `region_border` (and the flat per-tile lookups the frontier tile
+            counts use), the same way _label_regions(...) finds the adjacent regions: wherever two
+            neighboring tiles have different labels, each tile is on the other one's region border.
+        """
+        rows, cols, n_tiles = self.rows, self.cols, self.rows * self.cols
+        labels: np.ndarray = self.labels.astype(np.int64)
+        tile_indices: np.ndarray = np.arange(n_tiles, dtype=np.int64).reshape(rows, cols)
+        differ_down: np.ndarray = (labels[1:, :] != labels[:-1, :])
+        differ_right: np.ndarray = (labels[:, 1:] != labels[:, :-1])
+        first: np.ndarray = np.concatenate([labels[:-1, :][differ_down], labels[:, :-1][differ_right]])
+        second: np.ndarray = np.concatenate([labels[1:, :][differ_down], labels[:, 1:][differ_right]])
+        first_tiles: np.ndarray = np.concatenate([tile_indices[:-1, :][differ_down], tile_indices[:, :-1][differ_right]])
+        second_tiles: np.ndarray = np.concatenate([tile_indices[1:, :][differ_down], tile_indices[:, 1:][differ_right]])
+
+        border_keys: np.ndarray = np.sort(np.concatenate([first * n_tiles + second_tiles, second * n_tiles + first_tiles]))
+        if (border_keys.size > 0):
+            border_keys = border_keys[np.concatenate([[True], border_keys[1:] != border_keys[:-1]])]    # drop duplicates
+        border_regions, border_tiles = np.divmod(border_keys, n_tiles)
+
+        border_list: list[int] = border_tiles.tolist()
+        border_offsets: list[int] = np.searchsorted(border_regions, np.arange(self.n_regions + 1)).tolist()
+        self._region_border = [border_list[start:stop] for start, stop in zip(border_offsets[:-1], border_offsets[1:])]
+
+        # plain ints, much faster than numpy scalars in _count_border_tiles(...)
+        self._tile_regions: list[int] = self.labels.reshape(-1).tolist()
+        self._tile_colors: bytes = self.colors.tobytes()
+    
+
 class Board:
     """
     A representation of the game board. Contains Tiles and one Blob.
+
+    Boards can be any shape (`rows` x `cols`, 14x14 by default) and use the first `n_colors`
+    colors of the palette (Color.N_COLORS by default, up to Color.MAX_COLORS).
     """
     # constants
     N_ROWS: int = 14
@@ -306,15 +803,35 @@ class Board:
                  rows: int = N_ROWS,
                  cols: int = N_COLS, 
                  seed: int = SEED,
-                 rand_generator: np.random.Generator|None = None) -> Self:
+                 rand_generator: np.random.Generator|None = None,
+                 n_colors: int = Color.N_COLORS,
+                 profiler: Profiler|None = None) -> Self:
+        assert 1 <= n_colors <= Color.MAX_COLORS
         self.tiles: list[list[Tile]] = tiles  # BYO tiles
-        self.rows: int = rows
-        self.cols: int = cols
+        self.n_colors: int = n_colors
         
-        if (tiles is None and rand_generator is None):
-            self.tiles = Board.make_random_board(rows, cols, seed)  # if you left your tiles at home
-        elif (tiles is None and rand_generator is not None):
-            self.tiles = Board.make_random_board(rand_generator=rand_generator)
+        if (tiles is None):
+            # if you left your tiles at home (an RNG, if provided, is assumed to be seeded already)
+            self.tiles = Board.make_random_board(rows, cols, seed, rand_generator, n_colors)
+        self.rows: int = len(self.tiles)
+        self.cols: int = len(self.tiles[0])
+        # so Tile.neighbors() can hand out this Board's neighbor tuples (weakly, so Boards and Tiles don't form cycles)
+        board_ref: weakref.ref = weakref.ref(self)
+        for row in self.tiles:
+            for tile in row:
+                tile._board = board_ref
+
+        # label the Board's same-colored regions once; moves are then region merges
+        self.regions: RegionGraph = RegionGraph(self._tile_color_matrix(), n_colors)
+
+        # Zobrist keys for `state_hash`
+        self._tile_keys, self._color_keys = Zobrist.keys(self.rows, self.cols, n_colors)
+        self._state_hash: int = 0
+
+        # lookahead support: push_move(...) undo log, and one shared Color per index for restoring Tiles
+        self._undo_log: list[tuple[int, Color]] = []
+        self._grid_neighbors: tuple|None = None         # built by neighbors_of(...) on first use
+        self._palette: list[Color] = [Color(color_index) for color_index in range(n_colors)]
 
         # start the blob (in Chester County, PA)
         self.blob: Blob = Blob(self.tiles[0][0])
@@ -322,6 +839,11 @@ class Board:
         # make the zeroth move to check for adjacent Tiles of the same color as the first
         self.init_blob()
 
+        # optional timers and counters, see colorfill_profile.Profiler
+        self.profiler: Profiler|None = profiler
+        if (profiler is not None):
+            profiler.instrument(self, ("make_move", "possible_moves"))
+
     def __getitem__(self, key: tuple[int, int]) -> Tile | None:
         """Allows subscripting to grab Tile objects.
             Ex: a_board[0,1] --> provides the Tile in row zero, column one."""
@@ -331,194 +853,378 @@ class Board:
         except:
             raise TypeError(
                 f"""Board.__getitem__: couldn't process provided key: {key}
-                    Note key must be a 2-tuple of integers within range [0,13].
+                    Note key must be a 2-tuple of integers within the Board's range.
                     Example: board[5,5] --> this would provide key=(5,5)."""
                 )
         return this_tile
 
+    @property
+    def n_blob_tiles(self) -> int:
+        return self.blob.n_tiles
+
+    @property
+    def state_hash(self) -> int:
+        """64-bit Zobrist hash of (Blob mask, Blob color), kept up to date by every move. See Zobrist."""
+        return self._state_hash
+
     def init_blob(self) -> None:
         # if the first tile is already touching other tiles of the same color,
-        #   expand the initial Blob to include those tiles.
-        first_tile_color: Color = self.blob[0].color
-        self.make_move(first_tile_color)
+        #   expand the initial Blob to include those tiles (i.e., the rest of its region).
+        first_tile: Tile = self.blob[0]
+        for row, col in self.regions.region_cells[self.regions.labels[0, 0]]:
+            if (self.tiles[row][col] is not first_tile):
+                self.blob.append(self.tiles[row][col])
+
+        self._state_hash = Zobrist.hash_state(self.blob_as_numpy_matrix(), first_tile.color.color_index, self.n_colors)
 
-    def test_move(self) -> Any:
+    def peek_move(self, move_color: Color) -> int:
+        """Returns the number of Tiles `move_color` would add to the Blob, without changing the Board."""
+        return self.regions.gain(move_color.color_index)
+
+    def push_move(self, move_color: Color) -> int:
+        """
+            Applies a move that can be undone with pop_move(). Returns the number of Tiles gained.
+
+            The undo log only keeps what the move changed (the absorbed regions, and the previous
+            Blob size and color), so this is as cheap as make_move(...).
+        """
+        n_tiles_before: int = self.blob.n_tiles
+        self._undo_log.append((n_tiles_before, self.blob.filled_color))
+        self._absorb(move_color, record_undo=True)
+        return self.blob.n_tiles - n_tiles_before
+
+    def pop_move(self) -> None:
+        """Undoes the last move applied with push_move()."""
+        n_tiles_before, previous_color = self._undo_log.pop()
+        self.regions.undo_absorb()
+
+        # absorbed Tiles go back to the color of their region, the rest of the Blob to its previous color
+        state_hash: int = self._state_hash ^ self._color_keys[self.blob.filled_color.color_index] ^ self._color_keys[previous_color.color_index]
+        tile: Tile
+        for tile in self.blob.truncate(n_tiles_before):
+            region: int = self.regions.labels[tile.position.row, tile.position.col]
+            tile.color = self._palette[self.regions.region_colors[region]]
+            state_hash ^= self._tile_keys[tile.position.row * self.cols + tile.position.col]
+        self.blob.filled_color = previous_color
+        self._state_hash = state_hash
+
+    def snapshot(self) -> tuple[np.ndarray, int]:
         """
-            Returns a new Board object as if a move was made, but doesn't actually apply the move to this Board.
-            Might be useful, not sure yet.
+            Returns a copy of the game state, as (Blob mask, Blob color index), for restore(...).
+            Tiles outside the Blob never change color, so that's the whole state.
         """
-        pass # TODO
+        return (self.blob_as_numpy_matrix().astype(bool), self.blob.filled_color.color_index)
+
+    def restore(self, snapshot: tuple[np.ndarray, int]) -> None:
+        """Puts the Board back in the state returned by snapshot(). Clears the push_move() undo log."""
+        blob_mask, blob_color_index = snapshot
+        self.regions.set_blob(set(np.unique(self.regions.labels[blob_mask]).tolist()), blob_color_index)
+        self._undo_log = []
+        self.blob.release()
+
+        # rebuild the Blob in row-major order, starting from (0,0) like a fresh Board
+        blob_tiles: list[Tile] = [self.tiles[0][0]]
+        for row, col in zip(*np.nonzero(blob_mask)):
+            if (row != 0 or col != 0):
+                blob_tiles.append(self.tiles[row][col])
+
+        row_regions: list[int]
+        for row, row_regions in enumerate(self.regions.labels.tolist()):
+            for col, region in enumerate(row_regions):
+                self.tiles[row][col].color = self._palette[self.regions.region_colors[region]]
+
+        self.blob = Blob(blob_tiles[0])
+        for tile in blob_tiles[1:]:
+            self.blob.append(tile)
+        self.blob.filled_color = self._palette[blob_color_index]
+        self._state_hash = Zobrist.hash_state(blob_mask, blob_color_index, self.n_colors)
 
     def make_move(self, move_color: Color) -> None:
         """
             Applies a move to the Board, using the given `move_color`.
 
+            The Board's RegionGraph tracks which same-colored regions touch the Blob (its frontier),
+            so a move only has to merge the frontier regions of `move_color` into the Blob.
+            Its cost is proportional to the regions and Tiles newly absorbed, not to the size of the Blob
+            (or of the Board): Tiles in the Blob read their color from it, so step (3) is O(1).
+
             Approach / Steps:
-                (1) make a duplicate current Blob as the "new" Blob so we can make modifications to it
-                (2) make a second duplicate Blob but treat it as a queue of "Tiles yet to check"
-                (3) iterate over "Tiles yet to check" queue
-                    (a) for each Tile in queue, get a list of its neighbors
-                    (b) iterate over neighbors, checking conditions:
-                        (1) if neighbor is not a valid position, skip it and stop checking
-                        (2) if neighbor is not `move_color`, skip it and stop checking
-                        (3) if neighbor is already in "new" blob, skip it and stop checking
-                        (4) if neighbor passed the prior 3 checks, add it to the "new" blob, 
-                            and also check if this neighbor is in the queue (add to queue if not already there).
-                            This step is how we continue exploring for adjacent tiles.
-                    (c) having checked all of a Tile's neighbors, deque the Tile
-                (4) when queue is empty, we've checked all Blob neighbors (and their neighbors)
-                (5) change the color of all Tiles in the "new" Blob to `move_color`
-                (6) overwrite the old Blob with "new" Blob
-            
-            Notes:
-                - Step (1) might be avoidable, to be explored someday.
-                - I'd love to explore better path-finding algos here, this one is homegrown and likely inefficient.
+                (1) merge the frontier regions of `move_color` into the Blob's regions
+                    (the RegionGraph also adds their neighbors to the frontier)
+                (2) append the Tiles of the absorbed regions to the Blob
+                (3) change the color of all Tiles in the Blob to `move_color`
         """
-        # steps (1) and (2)
-        new_blob: Blob = self.blob.deepcopy()
-        tiles_to_check: Blob = self.blob.deepcopy()
+        self._absorb(move_color)
+
+    def _absorb(self, move_color: Color, record_undo: bool = False) -> None:
+        """Private method behind make_move(...) and push_move(...), see make_move(...) for the steps."""
+        # step (1)
+        absorbed_regions: list[int] = self.regions.absorb(move_color.color_index, record_undo)
+        if (self.profiler is not None):
+            self.profiler.count("bfs_nodes", len(absorbed_regions))
+
+        # step (2)
+        state_hash: int = self._state_hash
+        region: int
+        for region in absorbed_regions:
+            for row, col in self.regions.region_cells[region]:
+                self.blob.append(self.tiles[row][col])
+                state_hash ^= self._tile_keys[row * self.cols + col]
 
         # step (3)
-        while tiles_to_check.n_tiles > 0:
-            this_tile_to_check: Tile = tiles_to_check[0]
-
-            # step (3)(a)
-            neighbors: list[Position] = this_tile_to_check.neighbors().values()
-
-            # step (3)(b)
-            this_neighbor_position: Position
-            for this_neighbor_position in neighbors:
-                # step (3)(b)(1)
-                if self.is_valid_position(this_neighbor_position):
-                    this_neighbor_tile: Tile = self.tile_at_position(this_neighbor_position)
-
-                    # step (3)(b)(2)
-                    if (this_neighbor_tile.color == move_color):
-                        # step (3)(b)(3)
-                        if (this_neighbor_tile in new_blob):
-                            pass
-                        else:
-                            # step (3)(b)(4)
-                            new_blob.append(this_neighbor_tile)
-
-                            if (this_neighbor_tile in tiles_to_check):
-                                pass
-                            else:
-                                tiles_to_check.append(this_neighbor_tile)
-            
-            # step (3)(b)(c)
-            tiles_to_check.remove(this_tile_to_check)
-
-        # step (5), and step (4) that we've exited the `while` loop
-        new_blob.filled_color = move_color
-        
-        # step (6)
-        self.update_blob(new_blob)
+        self._state_hash = state_hash ^ self._color_keys[self.blob.filled_color.color_index] ^ self._color_keys[move_color.color_index]
+        self.blob.filled_color = move_color
 
     def is_valid_position(self, position: Position) -> bool:
-        row_is_valid: bool = (position.row >= 0 and position.row < self.N_ROWS)
-        col_is_valid: bool = (position.col >= 0 and position.col < self.N_COLS)
+        row_is_valid: bool = (position.row >= 0 and position.row < self.rows)
+        col_is_valid: bool = (position.col >= 0 and position.col < self.cols)
         return (row_is_valid and col_is_valid)
 
     def tile_at_position(self, position: Position) -> Tile:
         return self.tiles[position.row][position.col]
+
+    def neighbors_of(self, position: Position) -> tuple[Position, ...]:
+        """The neighbors of `position` that are on the Board, as the Tiles' own Positions
+            (precomputed on first use, see Position.grid_neighbors)."""
+        if (self._grid_neighbors is None):
+            self._grid_neighbors = Position.grid_neighbors([[tile.position for tile in row] for row in self.tiles])
+        return self._grid_neighbors[position.row][position.col]
     
     def update_blob(self, new_blob: Blob) -> None:
-        # overwrite the old blob
+        # overwrite the old blob (the Tiles it lets go of keep its color)
+        self.blob.release()
         self.blob = new_blob
+        new_blob.claim()
 
         # update the Color of the Board's Tile objects
         this_tile: Tile
         for this_tile in new_blob:
             self.update_tile_color(position=this_tile.position, new_color=new_blob.filled_color)
 
+        # the region graph belongs to the old blob, so rebuild it from the recolored Tiles
+        self.regions = RegionGraph(self._tile_color_matrix(), self.n_colors)
+        self._undo_log = []
+        self._state_hash = Zobrist.hash_state(self.blob_as_numpy_matrix(), new_blob.filled_color.color_index, self.n_colors)
+
     def update_tile_color(self, position: Position, new_color: Color) -> None:
         self.tile_at_position(position).color = new_color
 
     def possible_moves(self) -> list[Color]:
-        """Returns a list of possible moves (as a list of Colors) on the Board with respect to its current Blob."""
-        possible_moves: list[Color] = []
-        blob_color: Color = self.blob.filled_color
-
-        tile: Tile
-        for tile in self.blob:
-            neighbors: dict[str, Position] = tile.neighbors()
-
-            neighbor_position: Position
-            for neighbor_position in neighbors.values():
-                if (self.is_valid_position(neighbor_position)):
-                    neighbor_tile: Tile = self.tile_at_position(neighbor_position)
-                    neighbor_color: Color = neighbor_tile.color
-
-                    if (neighbor_color != blob_color):
-                        if (neighbor_color not in possible_moves):
-                            possible_moves.append(neighbor_color)
-                
-                if (len(possible_moves) == 5):
-                    break
-            if (len(possible_moves) == 5):
-                break
-        
-        return possible_moves
+        """Returns a list of possible moves (as a list of Colors) on the Board with respect to its current Blob.
+            Any color with a region on the Blob's frontier is a possible move."""
+        return [Color(color_index) for color_index in self.regions.possible_moves()]
 
+    @property
+    def frontier_counts(self) -> list[int]:
+        """Number of frontier tiles (touching the Blob but not part of it) of each color index, like the
+            other backends. Kept up to date by the RegionGraph on every move. Nonzero exactly for the possible moves."""
+        return self.regions.frontier_tile_counts
+
+    def stats(self) -> dict[str, int]:
+        """The profiler's timers and counters (see Profiler.stats), or {} when there's no profiler."""
+        return self.profiler.stats() if (self.profiler is not None) else {}
+
+    def action_mask(self, out: np.ndarray|None = None) -> np.ndarray:
+        """Bool array over color indices, True for the possible moves. Read off the RegionGraph's frontier, no board scan.
+            If `out` is given, it's filled in place (and returned) instead of allocating a new array."""
+        if (out is None):
+            out = np.empty(self.n_colors, dtype=bool)
+        out[:] = [len(regions) for regions in self.regions.frontier]
+        return out
 
     @staticmethod
     def make_random_board(rows: int = N_ROWS, 
                           cols: int = N_COLS, 
                           seed: int = SEED,
-                          rand_generator: np.random.Generator|None = None
+                          rand_generator: np.random.Generator|None = None,
+                          n_colors: int = Color.N_COLORS
                           ) -> list[list[Tile]]:
         # generate board as numpy ndarray
+        board_matrix: np.ndarray = Board.make_random_matrix(rows, cols, seed, rand_generator, n_colors)
+
+        # convert type and return
+        return Board.from_numpy_matrix(board_matrix)
+
+    @staticmethod
+    def make_random_matrix(rows: int = N_ROWS,
+                           cols: int = N_COLS,
+                           seed: int = SEED,
+                           rand_generator: np.random.Generator|None = None,
+                           n_colors: int = Color.N_COLORS
+                           ) -> np.ndarray:
+        """Generates a random matrix of color indices in [0, n_colors). Shared by every Board backend,
+            so the same seed / RNG state gives the same board regardless of backend."""
         if (rand_generator is None):
             np.random.seed(seed=seed)
-            board_matrix: np.ndarray = np.random.randint(low=0, high=Color.N_COLORS, size=(rows, cols))
+            board_matrix: np.ndarray = np.random.randint(low=0, high=n_colors, size=(rows, cols))
         else:
             # if RNG provided, assume already seeded
-            board_matrix: np.ndarray = rand_generator.integers(low=0, high=Color.N_COLORS, size=(rows, cols))
+            board_matrix: np.ndarray = rand_generator.integers(low=0, high=n_colors, size=(rows, cols))
 
-        # convert type and return
-        return Board.from_numpy_matrix(board_matrix)
+        return board_matrix
     
     @staticmethod
     def from_numpy_matrix(board_matrix: np.ndarray) -> list[list[Tile]]:
         # quick error checks
-        assert board_matrix.shape[0] == Board.N_ROWS
-        assert board_matrix.shape[1] == Board.N_COLS
-
-        # make an empty board as python 2D list
-        board_tile_list: list[list[Tile|None]] = [[None for _ in range(Board.N_COLS)] for _ in range(Board.N_ROWS)]
-
-        # convert numpy elements (integers at a position) to Tiles
-        for i in range(board_matrix.shape[0]):
-            for j in range(board_matrix.shape[1]):
-                # make the Tile
-                new_position = Position(row=i, col=j)
-                new_color = Color(color_index=board_matrix[i, j])
-                new_tile = Tile(color=new_color, position=new_position)
-
-                # place the Tile
-                board_tile_list[i][j] = new_tile
+        assert board_matrix.ndim == 2
+        assert board_matrix.size > 0
+
+        # convert numpy elements (integers at a position) to Tiles, as a python 2D list
+        #   (Colors are shared flyweights)
+        positions = Position.grid(*board_matrix.shape)
+        board_tile_list: list[list[Tile]] = [
+            [Tile(color=Color(color_index), position=positions[i][j]) for j, color_index in enumerate(row)]
+            for i, row in enumerate(board_matrix.tolist())
+        ]
         
         return board_tile_list
 
-    def to_numpy_matrix(self) -> np.ndarray:
+    def to_numpy_matrix(self, out: np.ndarray|None = None) -> np.ndarray:
         """Convert this Board into a numpy matrix of color indices.
             Used as a lightweight means of transferring this Board's state.
-            Useful for plotting / generating image of the Board."""
-        board_matrix = np.full(shape=(self.N_ROWS, self.N_COLS), fill_value=-1)
+            Useful for plotting / generating image of the Board.
+            If `out` is given, it's filled in place (and returned) instead of allocating a new matrix.
+
+            Read off the RegionGraph (the Blob's color where it is, the original colors elsewhere)
+            rather than the Tiles, so it's a couple of array operations on any size of Board."""
+        if (out is None):
+            out = np.empty(shape=(self.rows, self.cols), dtype=int)
 
-        for i in range(self.N_ROWS):
-            for j in range(self.N_COLS):
-                board_matrix[i,j] = self.tiles[i][j].color.color_index
+        np.copyto(out, self.regions.colors)
+        out[self.regions.blob_mask()] = self.blob.filled_color.color_index
         
-        return board_matrix
+        return out
     
-    def blob_as_numpy_matrix(self) -> np.ndarray:
-        blob_matrix = np.full(shape=(self.rows, self.cols), fill_value=0)
+    def blob_as_numpy_matrix(self, out: np.ndarray|None = None) -> np.ndarray:
+        if (out is None):
+            return self.regions.blob_mask().astype(int)
 
-        tile: Tile
-        for tile in self.blob:
-            x, y = tile.position.row, tile.position.col
-            blob_matrix[x,y] = 1
+        np.copyto(out, self.regions.blob_mask())
+        return out
+
+    def _tile_color_matrix(self) -> np.ndarray:
+        """
+        Private method that reads the color indices straight off the Tiles, to (re)build the RegionGraph.
+        """
+        return np.array([[tile.color.color_index for tile in row] for row in self.tiles])
+
+
+class GridBoardMixin:
+    """
+    Helpers shared by the Board backends that don't hold Tile objects (ArrayBoard, BitBoard).
+
+    A subclass sets `rows`, `cols` and `n_colors`, and provides `make_move`, `blob_color` and:
+        - `_color_index_at(row, col)`: the color index of a tile, raising if (row, col) isn't on the Board
+        - `frontier_counts`: the number of frontier tiles of each color index
+    """
+    _grid_neighbors: tuple|None = None      # built by neighbors_of(...) on first use
+
+    # methods
+    def init_blob(self) -> None:
+        """The zeroth move, same as Board.init_blob: grows the one-tile Blob over its same-colored neighbors."""
+        self.make_move(self.blob_color)
+
+    def __getitem__(self, key: tuple[int, int]) -> Tile | None:
+        """Allows subscripting to grab (freshly built) Tile objects.
+            Ex: a_board[0,1] --> provides the Tile in row zero, column one."""
+        try:
+            row, col = key
+            color_index = self._color_index_at(row, col)
+        except:
+            raise TypeError(
+                f"""{type(self).__name__}.__getitem__: couldn't process provided key: {key}
+                    Note key must be a 2-tuple of integers within the Board's range.
+                    Example: board[5,5] --> this would provide key=(5,5)."""
+                )
+        return Tile(color=Color(color_index), position=Position(row, col))
+
+    def is_valid_position(self, position: Position) -> bool:
+        row_is_valid: bool = (position.row >= 0 and position.row < self.rows)
+        col_is_valid: bool = (position.col >= 0 and position.col < self.cols)
+        return (row_is_valid and col_is_valid)
 
-        return blob_matrix
+    def tile_at_position(self, position: Position) -> Tile:
+        return self[position.row, position.col]
+
+    def neighbors_of(self, position: Position) -> tuple[Position, ...]:
+        """The neighbors of `position` that are on the Board (precomputed on first use, see Position.grid_neighbors)."""
+        if (self._grid_neighbors is None):
+            self._grid_neighbors = Position.grid_neighbors(Position.grid(self.rows, self.cols))
+        return self._grid_neighbors[position.row][position.col]
+
+    def action_mask(self, out: np.ndarray|None = None) -> np.ndarray:
+        """Bool array over color indices, True for the possible moves. Read off frontier_counts.
+            If `out` is given, it's filled in place (and returned) instead of allocating a new array."""
+        if (out is None):
+            out = np.empty(self.n_colors, dtype=bool)
+        out[:] = self.frontier_counts
+        return out
+
+    def stats(self) -> dict[str, int]:
+        """The profiler's timers and counters (see Profiler.stats), or {} when there's no profiler."""
+        return self.profiler.stats() if (self.profiler is not None) else {}
+
+    def _attach_profiler(self, profiler: Profiler|None) -> None:
+        """Optional timers and counters, see colorfill_profile.Profiler. Called at the end of __init__,
+            after the zeroth move, so that move isn't counted."""
+        self.profiler = profiler
+        if (profiler is not None):
+            profiler.instrument(self, ("make_move", "possible_moves"))
+
+    @staticmethod
+    def _color_index(move_color: Color|int) -> int:
+        if (isinstance(move_color, Color)):
+            return move_color.color_index
+        return int(move_color)
+
+
+### FUNCTION DEFINITIONS ###
+def border_mask(blob_mask: np.ndarray) -> np.ndarray:
+    """(rows, cols) bool array of the tiles next to (4-neighbor) the Blob in `blob_mask`, but not part of it."""
+    border: np.ndarray = np.zeros_like(blob_mask, dtype=bool)
+    border[1:, :] |= blob_mask[:-1, :]
+    border[:-1, :] |= blob_mask[1:, :]
+    border[:, 1:] |= blob_mask[:, :-1]
+    border[:, :-1] |= blob_mask[:, 1:]
+    border &= ~blob_mask
+    return border
+
+
+def label_regions(boards: np.ndarray) -> np.ndarray:
+    """
+        Labels the same-colored connected regions (4-neighbor) of a (rows, cols) board, or of every
+        board in a (N, rows, cols) stack at once: each tile gets the smallest flat index
+        (row * cols + col) of its region.
+
+        Approach (min-label propagation):
+            (1) label every tile with its own flat index
+            (2) give every tile the smallest label among itself and its same-colored neighbors
+            (3) repeat (2), with pointer jumping, until no label changes; each region then
+                carries its smallest index
+    """
+    boards = np.asarray(boards)
+    stack: np.ndarray = boards[None] if (boards.ndim == 2) else boards
+    n, rows, cols = stack.shape
+    same_down = (stack[:, 1:, :] == stack[:, :-1, :])
+    same_right = (stack[:, :, 1:] == stack[:, :, :-1])
+
+    # step (1)
+    label_dtype = np.int16 if rows * cols < 2**15 else np.int32
+    own_labels = np.arange(rows * cols, dtype=label_dtype).reshape(rows, cols)
+    no_label = label_dtype(rows * cols)     # bigger than any label, where tiles aren't connected
+    labels = np.broadcast_to(own_labels, stack.shape).copy()
+
+    # steps (2) and (3)
+    while True:
+        new_labels = labels.copy()
+        np.minimum(new_labels[:, 1:, :], np.where(same_down, labels[:, :-1, :], no_label), out=new_labels[:, 1:, :])
+        np.minimum(new_labels[:, :-1, :], np.where(same_down, labels[:, 1:, :], no_label), out=new_labels[:, :-1, :])
+        np.minimum(new_labels[:, :, 1:], np.where(same_right, labels[:, :, :-1], no_label), out=new_labels[:, :, 1:])
+        np.minimum(new_labels[:, :, :-1], np.where(same_right, labels[:, :, 1:], no_label), out=new_labels[:, :, :-1])
+        if (np.array_equal(new_labels, labels)):
+            break
+        # pointer jumping: a label is the index of a tile in the same region, so take that tile's label
+        flat_labels = new_labels.reshape(n, -1)
+        labels = np.take_along_axis(flat_labels, flat_labels, axis=1).reshape(stack.shape)
+
+    return labels[0] if (boards.ndim == 2) else labels
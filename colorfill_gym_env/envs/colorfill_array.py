@@ -0,0 +1,302 @@
+#   colorfill_array.py
+#   An array-backed alternative to colorfill.Board
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Self
+import functools
+
+# imports from external libraries
+import numpy as np
+
+# import from within package
+import colorfill_gym_env.envs.colorfill as cf
+from colorfill_gym_env.envs.colorfill_profile import Profiler
+
+
+### CLASS DEFINITIONS ###
+class ArrayBoard(cf.GridBoardMixin):
+    """
+    A representation of the game board backed by two numpy arrays instead of Tile objects.
+
+    State:
+        - `colors`: a contiguous (rows, cols) np.uint8 grid of color indices
+        - `blob_mask`: a (rows, cols) bool grid, True where the tile is part of the Blob
+
+    Exposes the same public methods as colorfill.Board (make_move, possible_moves,
+    to_numpy_matrix, blob_as_numpy_matrix, __getitem__), so ColorfillWorldEnv can use
+    either one. Tile / Color objects are only created on demand when asked for.
+
+    Like Board, moves are applied with an incremental frontier flood fill. Tiles are addressed
+    by flat index (row * cols + col) internally. Boards can be any shape, with `n_colors` colors.
+    """
+    # constants
+    N_ROWS: int = cf.Board.N_ROWS
+    N_COLS: int = cf.Board.N_COLS
+    SEED: int = cf.Board.SEED
+
+    # flat-index neighbor tables are shared by every ArrayBoard of the same shape,
+    #   for this many of the most recently used shapes (so big boards don't pin their tables forever)
+    NEIGHBOR_TABLE_SHAPES: int = 4
+
+    # methods
+    def __init__(self,
+                 colors: np.ndarray|None = None,
+                 rows: int = N_ROWS,
+                 cols: int = N_COLS,
+                 seed: int = SEED,
+                 rand_generator: np.random.Generator|None = None,
+                 n_colors: int = cf.Color.N_COLORS,
+                 profiler: Profiler|None = None) -> Self:
+        assert 1 <= n_colors <= cf.Color.MAX_COLORS
+        self.n_colors: int = n_colors
+        if (colors is None):
+            colors = ArrayBoard.make_random_board(rows, cols, seed, rand_generator, n_colors)
+
+        # BYO colors are copied, so the caller's matrix is never modified by moves
+        self._colors: np.ndarray = np.array(colors, dtype=np.uint8, order="C")
+        self.rows: int = self._colors.shape[0]
+        self.cols: int = self._colors.shape[1]
+
+        # only the Blob is ever recolored, so the flood fill reads the colors of the tiles
+        #   around it from this immutable copy (plain ints, much faster than numpy scalars)
+        self._base_colors: bytes = self._colors.tobytes()
+        self._neighbors: list[tuple[int, ...]] = ArrayBoard._neighbor_table(self.rows, self.cols)
+
+        # start the blob in the top-left corner
+        self._blob_mask: np.ndarray = np.zeros((self.rows, self.cols), dtype=bool)
+        self._blob_flat: np.ndarray = self._blob_mask.reshape(-1)   # view, not a copy
+        self._blob_flat[0] = True
+        self._blob_color: int = self._base_colors[0]
+        self._n_blob_tiles: int = 1
+        self._recolor_pending: bool = False
+        self._tile_keys, self._color_keys = cf.Zobrist.keys(self.rows, self.cols, n_colors)
+        self._state_hash: int = self._tile_keys[0] ^ self._color_keys[self._blob_color]
+        self._undo_log: list[tuple[int, tuple[int, ...], list[int], list[int], int]] = []
+        self.profiler: Profiler|None = None
+
+        # frontier: flat indices of tiles touching the Blob but not part of it, grouped by color index
+        self._frontier: list[set[int]] = [set() for _ in range(n_colors)]
+        for neighbor in self._neighbors[0]:
+            self._frontier[self._base_colors[neighbor]].add(neighbor)
+
+        self.init_blob()
+        self._attach_profiler(profiler)
+
+    @property
+    def colors(self) -> np.ndarray:
+        """The (rows, cols) np.uint8 grid of color indices, with the Blob in its current color."""
+        if (self._recolor_pending):
+            # moves don't touch Tiles already in the Blob, so they are recolored here, on demand
+            self._colors[self._blob_mask] = self._blob_color
+            self._recolor_pending = False
+        return self._colors
+
+    @property
+    def blob_mask(self) -> np.ndarray:
+        return self._blob_mask
+
+    @property
+    def blob_color(self) -> cf.Color:
+        return cf.Color(self._blob_color)
+
+    @property
+    def n_blob_tiles(self) -> int:
+        return self._n_blob_tiles
+
+    @property
+    def state_hash(self) -> int:
+        """64-bit Zobrist hash of (Blob mask, Blob color), kept up to date by every move. See colorfill.Zobrist."""
+        return self._state_hash
+
+    def make_move(self, move_color: cf.Color|int) -> None:
+        """
+            Applies a move to the Board, using the given `move_color`.
+
+            Approach (same as Board.make_move):
+                (1) take the frontier tiles of `move_color` as the starting queue, and add them to the Blob
+                (2) pop tiles off the queue, checking each neighbor that isn't already in the Blob:
+                    (a) if neighbor is `move_color`, add it to the Blob and queue it
+                    (b) otherwise, add it to the frontier
+                (3) when the queue is empty, the Blob takes `move_color`.
+                    Only the newly absorbed tiles were touched; the rest of the Blob is
+                    recolored lazily the next time `colors` is read.
+        """
+        self._fill(ArrayBoard._color_index(move_color))
+
+    def peek_move(self, move_color: cf.Color|int) -> int:
+        """Returns the number of tiles `move_color` would add to the Blob, without changing the Board."""
+        color_index: int = ArrayBoard._color_index(move_color)
+        blob: np.ndarray = self._blob_flat
+        base_colors: bytes = self._base_colors
+        neighbors: list[tuple[int, ...]] = self._neighbors
+
+        # same flood fill as make_move, but marking tiles in a local set instead of the Blob
+        seen: set[int] = set(self._frontier[color_index])
+        tiles_to_check: list[int] = list(seen)
+        while tiles_to_check:
+            for neighbor in neighbors[tiles_to_check.pop()]:
+                if (not blob[neighbor] and neighbor not in seen and base_colors[neighbor] == color_index):
+                    seen.add(neighbor)
+                    tiles_to_check.append(neighbor)
+
+        return len(seen)
+
+    def push_move(self, move_color: cf.Color|int) -> int:
+        """
+            Applies a move that can be undone with pop_move(). Returns the number of tiles gained.
+            The undo log only keeps the tiles the move changed (absorbed, or added to the frontier).
+        """
+        n_tiles_before: int = self._n_blob_tiles
+        self._fill(ArrayBoard._color_index(move_color), record_undo=True)
+        return self._n_blob_tiles - n_tiles_before
+
+    def pop_move(self) -> None:
+        """Undoes the last move applied with push_move()."""
+        color_index, seeds, absorbed, added_to_frontier, previous_color = self._undo_log.pop()
+
+        for index in added_to_frontier:
+            self._frontier[self._base_colors[index]].discard(index)
+        self._frontier[color_index] = set(seeds)
+
+        # absorbed tiles get their own color (== color_index) back in the grid, since reading
+        #   `colors` after a later move may have recolored them; the rest of the Blob is recolored lazily
+        self._colors.reshape(-1)[absorbed] = color_index
+        self._blob_flat[absorbed] = False
+        self._n_blob_tiles -= len(absorbed)
+        self._recolor_pending = True
+
+        state_hash: int = self._state_hash ^ self._color_keys[self._blob_color] ^ self._color_keys[previous_color]
+        for index in absorbed:
+            state_hash ^= self._tile_keys[index]
+        self._state_hash = state_hash
+        self._blob_color = previous_color
+
+    def snapshot(self) -> tuple[np.ndarray, int]:
+        """
+            Returns a copy of the game state, as (Blob mask, Blob color index), for restore(...).
+            Same state as Board.snapshot(), so snapshots can be restored on either backend.
+        """
+        return (self._blob_mask.copy(), self._blob_color)
+
+    def restore(self, snapshot: tuple[np.ndarray, int]) -> None:
+        """Puts the Board back in the state returned by snapshot(). Clears the push_move() undo log."""
+        blob_mask, blob_color_index = snapshot
+        np.copyto(self._blob_mask, blob_mask)
+        np.copyto(self._colors.reshape(-1), np.frombuffer(self._base_colors, dtype=np.uint8))
+        self._blob_color = int(blob_color_index)
+        self._n_blob_tiles = int(np.count_nonzero(blob_mask))
+        self._recolor_pending = True
+        self._undo_log = []
+        self._state_hash = cf.Zobrist.hash_state(self._blob_mask, self._blob_color, self.n_colors)
+
+        # frontier: every tile next to the Blob that isn't part of it
+        self._frontier = [set() for _ in range(self.n_colors)]
+        for index in np.flatnonzero(cf.border_mask(self._blob_mask)).tolist():
+            self._frontier[self._base_colors[index]].add(index)
+
+    def _fill(self, color_index: int, record_undo: bool = False) -> None:
+        """Private method behind make_move(...) and push_move(...), see make_move(...) for the steps."""
+        blob: np.ndarray = self._blob_flat
+        base_colors: bytes = self._base_colors
+        neighbors: list[tuple[int, ...]] = self._neighbors
+        frontier: list[set[int]] = self._frontier
+        tile_keys: list[int] = self._tile_keys
+        state_hash: int = self._state_hash
+
+        # step (1)
+        tiles_to_check: list[int] = list(frontier[color_index])
+        frontier[color_index] = set()
+        blob[tiles_to_check] = True
+        n_absorbed: int = 0
+
+        if (record_undo):
+            absorbed: list[int] = list(tiles_to_check)
+            added_to_frontier: list[int] = []
+            self._undo_log.append((color_index, tuple(tiles_to_check), absorbed, added_to_frontier, self._blob_color))
+
+        # step (2)
+        while tiles_to_check:
+            index: int = tiles_to_check.pop()
+            n_absorbed += 1
+            state_hash ^= tile_keys[index]
+
+            for neighbor in neighbors[index]:
+                if (blob[neighbor]):
+                    continue
+
+                neighbor_color_index: int = base_colors[neighbor]
+                if (neighbor_color_index == color_index):
+                    # step (2)(a)
+                    blob[neighbor] = True
+                    tiles_to_check.append(neighbor)
+                    if (record_undo):
+                        absorbed.append(neighbor)
+                else:
+                    # step (2)(b)
+                    if (record_undo and neighbor not in frontier[neighbor_color_index]):
+                        added_to_frontier.append(neighbor)
+                    frontier[neighbor_color_index].add(neighbor)
+
+        # step (3)
+        self._n_blob_tiles += n_absorbed
+        if (self.profiler is not None):
+            self.profiler.count("bfs_nodes", n_absorbed)
+        self._state_hash = state_hash ^ self._color_keys[self._blob_color] ^ self._color_keys[color_index]
+        self._recolor_pending = self._recolor_pending or (color_index != self._blob_color)
+        self._blob_color = color_index
+
+    def possible_moves(self) -> list[cf.Color]:
+        """Returns a list of possible moves (as a list of Colors) on the Board with respect to its current Blob.
+            Any color with a tile on the Blob's frontier is a possible move."""
+        return [cf.Color(color_index) for color_index, indices in enumerate(self._frontier) if indices]
+
+    @property
+    def frontier_counts(self) -> list[int]:
+        """Number of frontier tiles of each color index, kept up to date by every move.
+            Nonzero exactly for the possible moves."""
+        return [len(indices) for indices in self._frontier]
+
+    @staticmethod
+    def make_random_board(rows: int = N_ROWS,
+                          cols: int = N_COLS,
+                          seed: int = SEED,
+                          rand_generator: np.random.Generator|None = None,
+                          n_colors: int = cf.Color.N_COLORS
+                          ) -> np.ndarray:
+        # same draws as Board.make_random_board, so a seed gives the same board on both backends
+        board_matrix: np.ndarray = cf.Board.make_random_matrix(rows, cols, seed, rand_generator, n_colors)
+        return board_matrix.astype(np.uint8)
+
+    def to_numpy_matrix(self, out: np.ndarray|None = None) -> np.ndarray:
+        """Convert this Board into a numpy matrix of color indices.
+            Same dtype as Board.to_numpy_matrix, so the two backends are interchangeable.
+            If `out` is given, it's filled in place (and returned) instead of allocating a new matrix."""
+        if (out is None):
+            return self.colors.astype(int)
+        np.copyto(out, self.colors)
+        return out
+
+    def blob_as_numpy_matrix(self, out: np.ndarray|None = None) -> np.ndarray:
+        if (out is None):
+            return self._blob_mask.astype(int)
+        np.copyto(out, self._blob_mask)
+        return out
+
+    def _color_index_at(self, row: int, col: int) -> int:
+        return int(self.colors[row, col])
+
+    @staticmethod
+    @functools.lru_cache(maxsize=NEIGHBOR_TABLE_SHAPES)
+    def _neighbor_table(rows: int, cols: int) -> list[tuple[int, ...]]:
+        """Returns (building it on first use) the flat indices of each tile's in-board neighbors."""
+        table: list[tuple[int, ...]] = []
+        for row in range(rows):
+            for col in range(cols):
+                table.append(tuple(
+                    n_row * cols + n_col
+                    for n_row, n_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                    if (0 <= n_row < rows and 0 <= n_col < cols)
+                ))
+        return table
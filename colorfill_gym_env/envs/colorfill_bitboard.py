@@ -0,0 +1,303 @@
+#   colorfill_bitboard.py
+#   A bitboard alternative to colorfill.Board, for search-heavy workloads
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Self
+import hashlib
+import sys
+
+# imports from external libraries
+import numpy as np
+
+# import from within package
+import colorfill_gym_env.envs.colorfill as cf
+from colorfill_gym_env.envs.colorfill_cache import MoveCache
+from colorfill_gym_env.envs.colorfill_profile import Profiler
+
+
+### CLASS DEFINITIONS ###
+class BitBoard(cf.GridBoardMixin):
+    """
+    A representation of the game board as a handful of Python ints used as bitmasks.
+
+    Tile (row, col) is bit (row * cols + col). The Board is stored as:
+        - `color_masks`: one mask per color, set where the tile started out that color
+        - `blob`: one mask, set where the tile is part of the Blob
+        - `blob_color`: the color index of the Blob
+
+    Boards can be any shape, with `n_colors` colors (one mask each); a move costs a handful of
+    big-int operations per step of growth, each over rows * cols / 64 machine words.
+
+    Moves only recolor the Blob, so the color masks never change and (blob, blob_color) is the whole game state.
+    It's available as the hashable `state` tuple, which is also what push_move / pop_move save.
+
+    Exposes the same public methods as colorfill.Board, so ColorfillWorldEnv can use it too.
+
+    With a `move_cache` (a MoveCache, which may be shared with other BitBoards), move results
+    (blob, color) -> (next blob, tiles gained) and legal moves blob -> colors are memoized,
+    keyed by a digest of the board too, so replaying the same boards skips the flood fills.
+    """
+    # constants
+    N_ROWS: int = cf.Board.N_ROWS
+    N_COLS: int = cf.Board.N_COLS
+    SEED: int = cf.Board.SEED
+
+    # methods
+    def __init__(self,
+                 colors: np.ndarray|None = None,
+                 rows: int = N_ROWS,
+                 cols: int = N_COLS,
+                 seed: int = SEED,
+                 rand_generator: np.random.Generator|None = None,
+                 move_cache: MoveCache|None = None,
+                 n_colors: int = cf.Color.N_COLORS,
+                 profiler: Profiler|None = None) -> Self:
+        assert 1 <= n_colors <= cf.Color.MAX_COLORS
+        self.n_colors: int = n_colors
+        if (colors is None):
+            colors = cf.Board.make_random_matrix(rows, cols, seed, rand_generator, n_colors)
+
+        colors = np.asarray(colors, dtype=np.uint8)
+        self.rows: int = colors.shape[0]
+        self.cols: int = colors.shape[1]
+        self._n_tiles: int = self.rows * self.cols
+
+        # edge masks, so shifting left/right doesn't wrap a tile onto the neighboring row
+        self._full_mask: int = (1 << self._n_tiles) - 1
+        first_col: int = BitBoard._mask_from_bools(np.arange(self._n_tiles) % self.cols == 0)
+        last_col: int = BitBoard._mask_from_bools(np.arange(self._n_tiles) % self.cols == self.cols - 1)
+        self._not_first_col: int = self._full_mask & ~first_col
+        self._not_last_col: int = self._full_mask & ~last_col
+
+        self.color_masks: tuple[int, ...] = tuple(
+            BitBoard._mask_from_bools(colors.reshape(-1) == color_index) for color_index in range(n_colors)
+        )
+
+        # optional memoization, see the class docstring. Cache keys identify the board by a 128-bit
+        #   digest of its shape and colors, rather than the board-sized color masks, so every entry
+        #   holds the digest and two masks of up to n_tiles bits (the key's blob and the value's).
+        self.move_cache: MoveCache|None = move_cache
+        self._cache_board_key: bytes = hashlib.blake2b(
+            np.asarray(colors.shape, dtype=np.int64).tobytes() + colors.tobytes(), digest_size=16
+        ).digest()
+        self._cache_entry_bytes: int = (
+            MoveCache.ENTRY_OVERHEAD + sys.getsizeof(self._cache_board_key) + 2 * sys.getsizeof(self._full_mask)
+        )
+
+        # the Blob starts out as the top-left tile
+        self.blob: int = 1
+        self.blob_color_index: int = int(colors[0, 0])
+        self._history: list[tuple[int, int, int, int, list[int]]] = []
+
+        # the frontier (tiles touching the Blob but not part of it) and its tiles of each color,
+        #   updated by every move from the tiles it gained
+        self._frontier: int = self.frontier(self.blob)
+        self._frontier_counts: list[int] = self._count_by_color(self._frontier)
+        self.profiler: Profiler|None = None
+
+        self._tile_keys, self._color_keys = cf.Zobrist.keys(self.rows, self.cols, n_colors)
+        self._state_hash: int = self._tile_keys[0] ^ self._color_keys[self.blob_color_index]
+
+        self.init_blob()
+        self._attach_profiler(profiler)
+
+    @property
+    def state(self) -> tuple[int, int]:
+        """The full game state as a hashable (blob mask, blob color index) tuple."""
+        return (self.blob, self.blob_color_index)
+
+    @state.setter
+    def state(self, new_state: tuple[int, int]) -> None:
+        self.blob, self.blob_color_index = new_state
+        self._frontier = self.frontier(self.blob)
+        self._frontier_counts = self._count_by_color(self._frontier)
+        self._frontier_counts[self.blob_color_index] = 0
+        blob_mask: np.ndarray = self._bools_from_mask(self.blob).reshape(self.rows, self.cols)
+        self._state_hash = cf.Zobrist.hash_state(blob_mask, self.blob_color_index, self.n_colors)
+
+    @property
+    def state_hash(self) -> int:
+        """64-bit Zobrist hash of (Blob mask, Blob color), kept up to date by every move. See colorfill.Zobrist.
+            Matches the other Board backends for the same state; `state` itself is also hashable."""
+        return self._state_hash
+
+    @property
+    def blob_color(self) -> cf.Color:
+        return cf.Color(self.blob_color_index)
+
+    @property
+    def n_blob_tiles(self) -> int:
+        return self.blob.bit_count()
+
+    def dilate(self, mask: int) -> int:
+        """Grows `mask` by one tile in each of the four directions."""
+        return (
+            mask
+            | ((mask << 1) & self._not_first_col)
+            | ((mask >> 1) & self._not_last_col)
+            | ((mask << self.cols) & self._full_mask)
+            | (mask >> self.cols)
+        )
+
+    def next_blob(self, blob: int, color_index: int) -> int:
+        """
+            Returns the Blob mask that playing `color_index` would give, starting from `blob`.
+            Pure function of its arguments, so it doesn't need (or touch) this Board's current state.
+
+            Approach: repeatedly dilate the Blob and AND it with the tiles it may grow into
+            (`color_index` tiles, plus itself), until it stops changing.
+        """
+        allowed: int = self.color_masks[color_index] | blob
+        n_steps: int = 1
+        while True:
+            grown: int = self.dilate(blob) & allowed
+            if (grown == blob):
+                if (self.profiler is not None):
+                    self.profiler.count("bfs_nodes", n_steps)
+                return blob
+            blob = grown
+            n_steps += 1
+
+    def make_move(self, move_color: cf.Color|int) -> None:
+        """Applies a move to the Board, using the given `move_color`."""
+        color_index: int = BitBoard._color_index(move_color)
+        new_blob, _, absorbed_hash = self._move_result(self.blob, color_index)
+        self._state_hash ^= absorbed_hash
+        self._state_hash ^= self._color_keys[self.blob_color_index] ^ self._color_keys[color_index]
+
+        # every frontier tile of `color_index` was absorbed, and only tiles next to the
+        #   absorbed ones can have joined the frontier
+        new_frontier_tiles: int = self.dilate(new_blob & ~self.blob) & ~(new_blob | self._frontier)
+        self._frontier = (self._frontier | new_frontier_tiles) & ~new_blob
+        self._frontier_counts[color_index] = 0
+        if (new_frontier_tiles):
+            for counted_color, count in enumerate(self._count_by_color(new_frontier_tiles)):
+                self._frontier_counts[counted_color] += count
+
+        self.blob = new_blob
+        self.blob_color_index = color_index
+
+    def push_move(self, move_color: cf.Color|int) -> int:
+        """Applies a move that can be undone with pop_move(). Returns the number of tiles gained."""
+        n_before: int = self.n_blob_tiles
+        self._history.append((self.blob, self.blob_color_index, self._state_hash, self._frontier, self._frontier_counts.copy()))
+        self.make_move(move_color)
+        return self.n_blob_tiles - n_before
+
+    def pop_move(self) -> None:
+        """Undoes the last move applied with push_move()."""
+        self.blob, self.blob_color_index, self._state_hash, self._frontier, self._frontier_counts = self._history.pop()
+
+    def peek_move(self, move_color: cf.Color|int) -> int:
+        """Returns the number of tiles `move_color` would add to the Blob, without changing the Board."""
+        return self._move_result(self.blob, BitBoard._color_index(move_color))[1]
+
+    def snapshot(self) -> tuple[int, int]:
+        """Returns the game state for restore(...). For a BitBoard that's just `state`."""
+        return self.state
+
+    def restore(self, snapshot: tuple[int, int]) -> None:
+        """Puts the Board back in the state returned by snapshot(). Clears the push_move() undo log."""
+        self.state = snapshot
+        self._history = []
+
+    def frontier(self, blob: int|None = None) -> int:
+        """Tiles touching the Blob (or the given `blob`) but not part of it."""
+        if (blob is None):
+            return self._frontier
+        return self.dilate(blob) & ~blob
+
+    def possible_moves(self) -> list[cf.Color]:
+        """Returns a list of possible moves (as a list of Colors) on the Board with respect to its current Blob."""
+        frontier_colors: tuple[int, ...]|None = None
+        if (self.move_cache is not None):
+            frontier_colors = self.move_cache.get((self._cache_board_key, self.blob))
+
+        if (frontier_colors is None):
+            frontier: int = self.frontier()
+            frontier_colors = tuple(
+                color_index for color_index, color_mask in enumerate(self.color_masks) if (frontier & color_mask)
+            )
+            if (self.move_cache is not None):
+                self.move_cache.put((self._cache_board_key, self.blob), frontier_colors, self._cache_entry_bytes)
+
+        return [cf.Color(color_index) for color_index in frontier_colors if (color_index != self.blob_color_index)]
+
+    @property
+    def frontier_counts(self) -> list[int]:
+        """Number of frontier tiles of each color index (the Blob's own color counts as 0).
+            Nonzero exactly for the possible moves. Kept up to date by every move."""
+        return self._frontier_counts
+
+    def to_numpy_matrix(self, out: np.ndarray|None = None) -> np.ndarray:
+        """Convert this Board into a numpy matrix of color indices.
+            Same dtype as Board.to_numpy_matrix, so the backends are interchangeable.
+            If `out` is given, it's filled in place (and returned) instead of allocating a new matrix."""
+        board_matrix = np.zeros(self._n_tiles, dtype=int if out is None else out.dtype)
+        for color_index, color_mask in enumerate(self.color_masks):
+            board_matrix[self._bools_from_mask(color_mask)] = color_index
+        board_matrix[self._bools_from_mask(self.blob)] = self.blob_color_index
+        board_matrix = board_matrix.reshape(self.rows, self.cols)
+
+        if (out is None):
+            return board_matrix
+        np.copyto(out, board_matrix)
+        return out
+
+    def blob_as_numpy_matrix(self, out: np.ndarray|None = None) -> np.ndarray:
+        blob_matrix = self._bools_from_mask(self.blob).reshape(self.rows, self.cols)
+
+        if (out is None):
+            return blob_matrix.astype(int)
+        np.copyto(out, blob_matrix)
+        return out
+
+    def _move_result(self, blob: int, color_index: int) -> tuple[int, int, int]:
+        """(next blob, tiles gained, Zobrist hash of the gained tiles) for playing `color_index` from `blob`.
+            Looked up in (and added to) the move cache, if there is one."""
+        if (self.move_cache is not None):
+            key: tuple[bytes, int, int] = (self._cache_board_key, blob, color_index)
+            result: tuple[int, int, int]|None = self.move_cache.get(key)
+            if (result is not None):
+                return result
+
+        new_blob: int = self.next_blob(blob, color_index)
+        gained: int = new_blob & ~blob
+        result = (new_blob, gained.bit_count(), self._tiles_hash(gained))
+
+        if (self.move_cache is not None):
+            self.move_cache.put(key, result, self._cache_entry_bytes)
+        return result
+
+    def _tiles_hash(self, mask: int) -> int:
+        """XOR of the Zobrist keys of the tiles in `mask`."""
+        tiles_hash: int = 0
+        while mask:
+            low_bit: int = mask & -mask
+            tiles_hash ^= self._tile_keys[low_bit.bit_length() - 1]
+            mask ^= low_bit
+        return tiles_hash
+
+    def _count_by_color(self, mask: int) -> list[int]:
+        """Number of tiles of each color index in `mask` (by their starting color)."""
+        return [(mask & color_mask).bit_count() for color_mask in self.color_masks]
+
+    def _color_index_at(self, row: int, col: int) -> int:
+        assert (0 <= row < self.rows) and (0 <= col < self.cols)
+        bit: int = row * self.cols + col
+        if ((self.blob >> bit) & 1):
+            return self.blob_color_index
+        for color_index, color_mask in enumerate(self.color_masks):
+            if ((color_mask >> bit) & 1):
+                return color_index
+
+    def _bools_from_mask(self, mask: int) -> np.ndarray:
+        mask_bytes: bytes = mask.to_bytes((self._n_tiles + 7) // 8, "little")
+        bits: np.ndarray = np.unpackbits(np.frombuffer(mask_bytes, dtype=np.uint8), bitorder="little")
+        return bits[:self._n_tiles].astype(bool)
+
+    @staticmethod
+    def _mask_from_bools(bools: np.ndarray) -> int:
+        return int.from_bytes(np.packbits(bools, bitorder="little").tobytes(), "little")
@@ -0,0 +1,96 @@
+#   colorfill_cache.py
+#   A bounded LRU cache for memoizing move results across episodes
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from collections import OrderedDict
+from typing import Any, Hashable, Self
+
+
+### CLASS DEFINITIONS ###
+class MoveCache:
+    """
+    A least-recently-used cache with a memory bound, for memoizing move results.
+
+    Evaluation suites, curriculum resets and tree search replay the same boards over and over,
+    so the same (board, state, move) keeps getting recomputed. A MoveCache can be shared by any
+    number of Boards (and envs) in one process; keys include a digest of the board, so Boards
+    never see each other's results.
+
+    Every entry is stored with its (estimated) size in bytes, key and value both. Once the total
+    goes over `max_bytes`, the least recently used entries are evicted.
+
+    Counters (`hits`, `misses`, `evictions`) are kept so you can tell whether caching pays off
+    for a given workload; see stats().
+    """
+    # constants
+    MAX_BYTES: int = 64 * 2**20     # 64 MiB
+    ENTRY_OVERHEAD: int = 256       # rough bytes of dict node, key tuple and value tuple per entry
+
+    # methods
+    def __init__(self, max_bytes: int = MAX_BYTES) -> Self:
+        assert max_bytes >= 0
+        self.max_bytes: int = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._n_bytes: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def n_bytes(self) -> int:
+        """Estimated memory used by the cached entries."""
+        return self._n_bytes
+
+    def get(self, key: Hashable) -> Any|None:
+        """Returns the value cached for `key` (marking it as recently used), or None on a miss."""
+        entry = self._entries.get(key)
+        if (entry is None):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, n_bytes: int) -> None:
+        """Caches `value` for `key`, counting the entry (key and value) as `n_bytes`, then evicts down to `max_bytes`."""
+        previous = self._entries.pop(key, None)
+        if (previous is not None):
+            self._n_bytes -= previous[1]
+
+        self._entries[key] = (value, n_bytes)
+        self._n_bytes += n_bytes
+
+        while (self._n_bytes > self.max_bytes and self._entries):
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self._n_bytes -= evicted_bytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drops every entry. The counters are kept; see reset_stats()."""
+        self._entries.clear()
+        self._n_bytes = 0
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """The counters and current size, under the names ColorfillWorldEnv reports them in `info`."""
+        return {
+            "move_cache_hits": self.hits,
+            "move_cache_misses": self.misses,
+            "move_cache_evictions": self.evictions,
+            "move_cache_entries": len(self._entries),
+            "move_cache_bytes": self._n_bytes,
+        }
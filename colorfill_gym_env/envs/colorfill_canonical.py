@@ -0,0 +1,121 @@
+#   colorfill_canonical.py
+#   Canonical forms of board states, invariant to relabeling the colors (and optionally to the transpose)
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Self
+
+# imports from external libraries
+import numpy as np
+
+# import from within package
+import colorfill_gym_env.envs.colorfill as cf
+
+
+### CLASS DEFINITIONS ###
+class CanonicalState:
+    """
+    The canonical form of a board state, as returned by canonicalize(...).
+
+    The six colors are interchangeable as far as play goes, so every state is relabeled so that
+    colors are numbered in order of first appearance in the grid, row by row (the Blob, which
+    covers (0,0), is always color 0). Two states get the same `key` exactly when one is a
+    relabeling (and, if asked for, a transpose) of the other.
+
+        - `key`: hashable bytes, for transposition tables, value caches and deduplicating boards
+        - `colors`, `blob_mask`: the canonical color grid and Blob mask
+        - `permutation`: permutation[original color index] = canonical color index
+        - `transposed`: True if the canonical form is the transpose of the original state
+
+    Moves are colors, so transposing doesn't change them; only the permutation has to be undone
+    (see to_canonical_move / from_canonical_move).
+    """
+    # methods
+    def __init__(self,
+                 key: bytes,
+                 colors: np.ndarray,
+                 blob_mask: np.ndarray,
+                 permutation: list[int],
+                 transposed: bool) -> Self:
+        self.key: bytes = key
+        self.colors: np.ndarray = colors
+        self.blob_mask: np.ndarray = blob_mask
+        self.permutation: list[int] = permutation
+        self.transposed: bool = transposed
+
+        self._inverse_permutation: list[int] = [0 for _ in permutation]
+        for original, canonical in enumerate(permutation):
+            self._inverse_permutation[canonical] = original
+
+    def to_canonical_move(self, color_index: int) -> int:
+        """Maps a move (color index) on the original board to the same move on the canonical board."""
+        return self.permutation[color_index]
+
+    def from_canonical_move(self, color_index: int) -> int:
+        """Maps a move (color index) on the canonical board back to the original board."""
+        return self._inverse_permutation[color_index]
+
+    def __eq__(self: Self, other: Self) -> bool:
+        return self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"CanonicalState(permutation={self.permutation}, transposed={self.transposed})"
+
+
+### FUNCTION DEFINITIONS ###
+def canonicalize(colors: np.ndarray,
+                 blob_mask: np.ndarray,
+                 transpose: bool = False,
+                 n_colors: int = cf.Color.N_COLORS) -> CanonicalState:
+    """
+        Returns the canonical form of the state (`colors`, `blob_mask`) under color relabeling.
+
+        Args:
+            colors: (rows, cols) color indices, with the Blob in its current color (like to_numpy_matrix())
+            blob_mask: (rows, cols) Blob mask (like blob_as_numpy_matrix())
+            transpose: also treat the state and its transpose as the same. The transpose is the only
+                board symmetry that keeps the (0,0) start corner in place (it needs a square board).
+            n_colors: number of colors in play
+    """
+    colors = np.asarray(colors)
+    blob_mask = np.asarray(blob_mask, dtype=bool)
+
+    canonical = _relabel(colors, blob_mask, n_colors, transposed=False)
+    if (transpose and colors.shape[0] == colors.shape[1]):
+        canonical_transposed = _relabel(colors.T, blob_mask.T, n_colors, transposed=True)
+        if (canonical_transposed.key < canonical.key):
+            canonical = canonical_transposed
+
+    return canonical
+
+
+def canonicalize_board(board: cf.Board, transpose: bool = False) -> CanonicalState:
+    """canonicalize(...) for the current state of any Board backend."""
+    return canonicalize(board.to_numpy_matrix(), board.blob_as_numpy_matrix(), transpose=transpose, n_colors=board.n_colors)
+
+
+def _relabel(colors: np.ndarray, blob_mask: np.ndarray, n_colors: int, transposed: bool) -> CanonicalState:
+    """Numbers the colors by first appearance (row-major), colors that don't appear come last in index order."""
+    flat_colors: np.ndarray = colors.reshape(-1)
+    present, first_index = np.unique(flat_colors, return_index=True)
+    order: list[int] = present[np.argsort(first_index)].tolist()
+    order += [color_index for color_index in range(n_colors) if (color_index not in order)]
+
+    permutation: list[int] = [0 for _ in range(n_colors)]
+    for canonical, original in enumerate(order):
+        permutation[original] = canonical
+
+    canonical_colors: np.ndarray = np.asarray(permutation, dtype=np.uint8)[colors]
+    canonical_blob: np.ndarray = np.ascontiguousarray(blob_mask)
+
+    # the shape goes into the key too, so a 7x28 and a 14x14 board can't collide
+    key: bytes = (
+        np.asarray(colors.shape, dtype=np.uint16).tobytes()
+        + canonical_colors.tobytes()
+        + np.packbits(canonical_blob).tobytes()
+    )
+    return CanonicalState(key, canonical_colors, canonical_blob, permutation, transposed)
@@ -0,0 +1,122 @@
+#   colorfill_pool.py
+#   Pre-generated pools of boards: bulk generation, difficulty filtering and memory-mapped persistence
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Self
+import json
+import os
+
+# imports from external libraries
+import numpy as np
+
+# import from within package
+import colorfill_gym_env.envs.colorfill as cf
+import colorfill_gym_env.envs.colorfill_array as cfa
+from colorfill_gym_env.envs.colorfill_solver import solve
+
+
+### CLASS DEFINITIONS ###
+class BoardPool:
+    """
+    A fixed set of boards, as one (N, rows, cols) uint8 array of color indices in [0, n_colors).
+
+    Generate one with BoardPool.generate(...), narrow it down by difficulty with select(...),
+    then save(...) it. BoardPool.load(...) memory-maps the file, so opening a pool of millions
+    of boards is instant and boards are only read when used.
+
+    ColorfillWorldEnv(board_pool=...) draws its boards from a pool: reset(options={"board_index": k})
+    plays board k (an O(1) lookup), and a plain reset() plays a random one.
+    """
+    # constants
+    # boards are generated in chunks of this many, each from its own seeded RNG,
+    #   so board i only depends on (seed, i) and not on how many boards are generated
+    GENERATION_CHUNK: int = 2**16
+
+    # methods
+    def __init__(self, boards: np.ndarray, n_colors: int = cf.Color.N_COLORS) -> Self:
+        assert boards.ndim == 3
+        assert 1 <= n_colors <= cf.Color.MAX_COLORS
+        self.boards: np.ndarray = boards
+        self.n_colors: int = n_colors
+
+    def __len__(self) -> int:
+        return self.boards.shape[0]
+
+    def __getitem__(self, k: int) -> np.ndarray:
+        """Board k, as a (rows, cols) uint8 array (read-only if the pool is memory-mapped)."""
+        return self.boards[k]
+
+    @property
+    def board_shape(self) -> tuple[int, int]:
+        return self.boards.shape[1:]
+
+    @classmethod
+    def generate(cls,
+                 n: int,
+                 rows: int = cf.Board.N_ROWS,
+                 cols: int = cf.Board.N_COLS,
+                 seed: int = cf.Board.SEED,
+                 n_colors: int = cf.Color.N_COLORS) -> Self:
+        """Generates `n` random boards in bulk. The same arguments give the same boards on any machine."""
+        boards: np.ndarray = np.empty((n, rows, cols), dtype=np.uint8)
+        for chunk, start in enumerate(range(0, n, cls.GENERATION_CHUNK)):
+            stop: int = min(start + cls.GENERATION_CHUNK, n)
+            rng = np.random.default_rng([seed, chunk])
+            boards[start:stop] = rng.integers(0, n_colors, size=(stop - start, rows, cols), dtype=np.uint8)
+        return cls(boards, n_colors)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> Self:
+        """Opens a pool written by save(...), memory-mapped (read-only) unless `mmap` is False."""
+        meta_path: str = BoardPool._meta_path(path)
+        n_colors: int = cf.Color.N_COLORS
+        if (os.path.exists(meta_path)):
+            with open(meta_path) as meta_file:
+                n_colors = json.load(meta_file)["n_colors"]
+        return cls(np.load(path, mmap_mode="r" if mmap else None), n_colors)
+
+    def save(self, path: str) -> None:
+        """Writes the pool as a .npy file, plus its number of colors in a small JSON file next to it
+            (the .npy stays a plain array, so load(...) can memory-map it)."""
+        np.save(path, np.ascontiguousarray(self.boards))
+        with open(BoardPool._meta_path(path), "w") as meta_file:
+            json.dump({"n_colors": self.n_colors}, meta_file)
+
+    def select(self, mask: np.ndarray) -> Self:
+        """A new (in-memory) pool of the boards where `mask` is True, in the same order."""
+        return BoardPool(np.ascontiguousarray(self.boards[np.asarray(mask, dtype=bool)]), self.n_colors)
+
+    def region_counts(self, batch_size: int = 2**14) -> np.ndarray:
+        """Number of same-colored regions on each board (see count_regions_batch)."""
+        return np.concatenate([
+            count_regions_batch(self.boards[start:start + batch_size])
+            for start in range(0, len(self), batch_size)
+        ]) if len(self) > 0 else np.zeros(0, dtype=np.int64)
+
+    def solver_move_counts(self, **solve_kwargs) -> np.ndarray:
+        """
+            Moves the solver needs to fill each board. One solve(...) per board, so this is much
+            slower than region_counts(); pass a budget (e.g. max_nodes, weight) for big pools.
+        """
+        return np.array([
+            solve(cfa.ArrayBoard(colors=board, n_colors=self.n_colors), **solve_kwargs).n_moves for board in self.boards
+        ])
+
+    @staticmethod
+    def _meta_path(path: str) -> str:
+        """`pool.npy` -> `pool.meta.json` (np.save adds the .npy suffix if `path` doesn't have it)."""
+        return os.path.splitext(path)[0] + ".meta.json" if path.endswith(".npy") else path + ".meta.json"
+
+
+### FUNCTION DEFINITIONS ###
+def count_regions_batch(boards: np.ndarray) -> np.ndarray:
+    """
+        Returns the number of same-colored connected regions of each board in a (N, rows, cols) stack.
+        colorfill.label_regions(...) labels each tile with its region's smallest flat index,
+        so a region is counted at the one tile that kept its own index.
+    """
+    rows, cols = boards.shape[1:]
+    labels = cf.label_regions(boards)
+    return np.count_nonzero(labels == np.arange(rows * cols).reshape(rows, cols), axis=(1, 2))
@@ -0,0 +1,82 @@
+#   colorfill_profile.py
+#   Opt-in, low-overhead timers and counters for the phases of a ColorfillWorldEnv step
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Any, Callable, Self
+import functools
+import time
+
+
+### CLASS DEFINITIONS ###
+class Profiler:
+    """
+    Cumulative nanosecond timers and call counters per phase, plus plain event counters.
+
+    Pass one to ColorfillWorldEnv(profiler=...) (or to a Board backend directly). The env times
+    its own `_get_obs`, `_get_info`, `_render_frame` and scoring functions, and every Board it
+    makes times its `make_move` and `possible_moves`. Counters:
+        - `tiles_absorbed`: tiles added to the Blob by moves
+        - `bfs_nodes`: nodes the move's fill visited: regions for Board, tiles for ArrayBoard,
+            dilation steps for BitBoard
+
+    Methods are timed by wrapping them on the instance only (see instrument(...)), so objects
+    made without a Profiler run the plain class methods and pay nothing. Timers are inclusive:
+    a phase's time includes any timed phase it calls.
+
+    Like a MoveCache, a Profiler can be shared by any number of envs and Boards in one process.
+    With `in_info`, the env also reports stats() in every `info`.
+    """
+    # constants
+    COUNTERS: tuple[str, ...] = ("tiles_absorbed", "bfs_nodes")
+
+    # methods
+    def __init__(self, in_info: bool = False) -> Self:
+        self.in_info: bool = in_info
+        self._ns: dict[str, int] = {}
+        self._calls: dict[str, int] = {}
+        self.counters: dict[str, int] = {counter: 0 for counter in self.COUNTERS}
+
+    def instrument(self, obj: Any, method_names: tuple[str, ...]) -> None:
+        """Replaces each of `obj`'s methods with a timed wrapper, on `obj` only (not its class)."""
+        for name in method_names:
+            setattr(obj, name, self._timed(name.lstrip("_"), getattr(obj, name)))
+
+    def count(self, counter: str, n: int = 1) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def reset_stats(self) -> None:
+        """Zeroes every timer and counter (instrumented objects keep reporting here)."""
+        for timers in (self._ns, self._calls, self.counters):
+            for name in timers:
+                timers[name] = 0
+
+    def stats(self) -> dict[str, int]:
+        """Timers, call counts and counters, under the names ColorfillWorldEnv reports them in `info`."""
+        stats: dict[str, int] = {}
+        for phase in self._ns:
+            stats[f"profile_{phase}_ns"] = self._ns[phase]
+            stats[f"profile_{phase}_calls"] = self._calls[phase]
+        for counter, n in self.counters.items():
+            stats[f"profile_{counter}"] = n
+        return stats
+
+    def _timed(self, phase: str, method: Callable) -> Callable:
+        """Private method that wraps `method` to add its run time and one call to `phase`."""
+        ns: dict[str, int] = self._ns
+        calls: dict[str, int] = self._calls
+        ns.setdefault(phase, 0)
+        calls.setdefault(phase, 0)
+        perf_counter_ns = time.perf_counter_ns
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start: int = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                ns[phase] += perf_counter_ns() - start
+                calls[phase] += 1
+
+        return timed
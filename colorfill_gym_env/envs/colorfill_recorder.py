@@ -0,0 +1,269 @@
+#   colorfill_recorder.py
+#   Records ColorfillWorldEnv episodes to compact, append-only, memory-mappable trajectory files
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Any, Self
+import json
+import os
+
+# imports from external libraries
+import gymnasium as gym
+import numpy as np
+
+# import from within package
+import colorfill_gym_env.envs.colorfill as cf
+
+
+### CLASS DEFINITIONS ###
+class EpisodeRecorder(gym.Wrapper):
+    """
+    A wrapper around ColorfillWorldEnv that streams every episode to disk, one raw binary file per column.
+
+    Layout of `directory` (every file is append-only; see EpisodeReader):
+        - `meta.json`: board shape, number of colors, frame shape and column dtypes
+        - `boards.bin`: each episode's initial color grid (rows * cols uint8 per episode)
+        - `actions.bin`: color index played at each step (uint8)
+        - `tiles_gained.bin`: tiles each step added to the Blob (int32)
+        - `scores.bin`: the env's score after each step (int64)
+        - `frames.bin`: with `record_frames`, rgb frames (uint8), one at reset plus one per step
+        - `index.bin`: per episode, (first step, number of steps, first frame) as int64
+
+    Steps are buffered in memory and written in bulk every `buffer_steps` steps (and on flush() /
+    close()), through files opened once. An episode only appears in `index.bin` once all of its
+    columns are written, so a reader never sees a partial episode. Recording into a directory that
+    already holds episodes appends to it.
+
+    A trajectory is its initial board plus one byte per move, which is all it takes to replay it.
+    """
+    # constants
+    COLUMN_DTYPES: dict[str, type] = {
+        "boards": np.uint8,
+        "actions": np.uint8,
+        "tiles_gained": np.int32,
+        "scores": np.int64,
+        "frames": np.uint8,
+        "index": np.int64,
+    }
+    BUFFER_STEPS: int = 4096
+
+    # methods
+    def __init__(self,
+                 env: gym.Env,
+                 directory: str,
+                 record_frames: bool = False,
+                 buffer_steps: int = BUFFER_STEPS) -> Self:
+        super().__init__(env)
+        assert not record_frames or env.render_mode == "rgb_array", "recording frames needs render_mode='rgb_array'"
+
+        self.directory: str = directory
+        self.record_frames: bool = record_frames
+        self.buffer_steps: int = buffer_steps
+
+        size: int = env.unwrapped.size
+        meta: dict[str, Any] = {
+            "board_shape": [size, size],
+            "n_colors": env.unwrapped.n_colors,
+            "frame_shape": [env.unwrapped.window_size_height, env.unwrapped.window_size_width, 3] if record_frames else None,
+            "dtypes": {column: np.dtype(dtype).str for column, dtype in self.COLUMN_DTYPES.items()},
+        }
+
+        os.makedirs(directory, exist_ok=True)
+        meta_path: str = os.path.join(directory, "meta.json")
+        if (os.path.exists(meta_path)):
+            with open(meta_path) as meta_file:
+                existing_meta = json.load(meta_file)
+            assert existing_meta == meta, f"EpisodeRecorder: {directory} holds episodes in a different layout"
+        else:
+            with open(meta_path, "w") as meta_file:
+                json.dump(meta, meta_file)
+
+        # next episode's offsets, from the episodes already in the index
+        self._n_steps_written: int = 0
+        self._n_frames_written: int = 0
+        index_path: str = os.path.join(directory, "index.bin")
+        n_episodes: int = os.path.getsize(index_path) // (3 * 8) if os.path.exists(index_path) else 0
+        if (n_episodes > 0):
+            step_start, n_steps, frame_start = np.fromfile(index_path, dtype=np.int64)[-3:].tolist()
+            self._n_steps_written = step_start + n_steps
+            self._n_frames_written = frame_start + n_steps + 1 if record_frames else 0
+
+        # drop anything past the last indexed episode (left by a recorder that didn't get to flush its index)
+        column_items: dict[str, tuple[int, tuple[int, ...]]] = {
+            "boards": (n_episodes, tuple(meta["board_shape"])),
+            "actions": (self._n_steps_written, ()),
+            "tiles_gained": (self._n_steps_written, ()),
+            "scores": (self._n_steps_written, ()),
+            "index": (n_episodes, (3,)),
+        }
+        if (record_frames):
+            column_items["frames"] = (self._n_frames_written, tuple(meta["frame_shape"]))
+
+        # one file handle per column, opened once
+        self._files = {}
+        for column, (n_items, item_shape) in column_items.items():
+            path: str = os.path.join(directory, f"{column}.bin")
+            self._files[column] = open(path, "ab")
+            self._files[column].truncate(n_items * int(np.prod(item_shape)) * np.dtype(self.COLUMN_DTYPES[column]).itemsize)
+
+        # finished episodes waiting to be written, and the episode in progress
+        self._pending: list[dict[str, Any]] = []
+        self._n_pending_steps: int = 0
+        self._episode: dict[str, Any]|None = None
+
+    def reset(self, **kwargs) -> tuple:
+        self._end_episode()
+
+        obs, info = self.env.reset(**kwargs)
+        self._episode = {
+            "board": np.asarray(obs["board"], dtype=np.uint8).copy(),
+            "actions": [],
+            "tiles_gained": [],
+            "scores": [],
+            "frames": [self.env.render()] if self.record_frames else [],
+            "n_tiles_filled": info["num_tiles_filled"],
+        }
+        return obs, info
+
+    def step(self, action) -> tuple:
+        obs, reward, terminated, truncated, info = self.env.step(action)
+
+        episode = self._episode
+        episode["actions"].append(int(action))
+        episode["tiles_gained"].append(info["num_tiles_filled"] - episode["n_tiles_filled"])
+        episode["scores"].append(self.env.unwrapped._score)
+        episode["n_tiles_filled"] = info["num_tiles_filled"]
+        if (self.record_frames):
+            episode["frames"].append(self.env.render())
+
+        if (terminated or truncated):
+            self._end_episode()
+        return obs, reward, terminated, truncated, info
+
+    def flush(self) -> None:
+        """Writes every finished episode to disk."""
+        if (not self._pending):
+            return
+
+        index_rows: list[tuple[int, int, int]] = []
+        for episode in self._pending:
+            n_steps: int = len(episode["actions"])
+            index_rows.append((self._n_steps_written, n_steps, self._n_frames_written))
+            self._n_steps_written += n_steps
+            self._n_frames_written += len(episode["frames"])
+
+        # one bulk write per column; the index goes last so readers only see complete episodes
+        self._write("boards", np.stack([episode["board"] for episode in self._pending]))
+        for column in ("actions", "tiles_gained", "scores"):
+            self._write(column, np.concatenate([np.asarray(episode[column]) for episode in self._pending]))
+        if (self.record_frames):
+            self._write("frames", np.stack([frame for episode in self._pending for frame in episode["frames"]]))
+        self._write("index", np.asarray(index_rows))
+
+        self._pending = []
+        self._n_pending_steps = 0
+
+    def close(self) -> None:
+        self._end_episode()
+        self.flush()
+        for file in self._files.values():
+            file.close()
+        super().close()
+
+    def _end_episode(self) -> None:
+        """Queues the episode in progress (if it made any moves) to be written."""
+        if (self._episode is not None and self._episode["actions"]):
+            self._pending.append(self._episode)
+            self._n_pending_steps += len(self._episode["actions"])
+        self._episode = None
+
+        if (self._n_pending_steps >= self.buffer_steps):
+            self.flush()
+
+    def _write(self, column: str, values: np.ndarray) -> None:
+        file = self._files[column]
+        np.ascontiguousarray(values, dtype=self.COLUMN_DTYPES[column]).tofile(file)
+        file.flush()
+
+
+class Episode:
+    """One recorded episode, as returned by EpisodeReader[k]. Arrays are memmap views, read lazily."""
+    # methods
+    def __init__(self,
+                 initial_board: np.ndarray,
+                 actions: np.ndarray,
+                 tiles_gained: np.ndarray,
+                 scores: np.ndarray,
+                 frames: np.ndarray|None) -> Self:
+        self.initial_board: np.ndarray = initial_board
+        self.actions: np.ndarray = actions
+        self.tiles_gained: np.ndarray = tiles_gained
+        self.scores: np.ndarray = scores
+        self.frames: np.ndarray|None = frames
+
+    @property
+    def n_steps(self) -> int:
+        return self.actions.size
+
+    @property
+    def final_score(self) -> int:
+        return int(self.scores[-1])
+
+    def __repr__(self) -> str:
+        return f"Episode(n_steps={self.n_steps}, final_score={self.final_score:,})"
+
+
+class EpisodeReader:
+    """
+    Random access to the episodes an EpisodeRecorder wrote to `directory`, through memory maps.
+
+    Opening the reader maps the files without reading them; reader[k] slices episode k out of each
+    column. Episodes written after the reader was opened show up after refresh().
+    """
+    # methods
+    def __init__(self, directory: str) -> Self:
+        self.directory: str = directory
+        with open(os.path.join(directory, "meta.json")) as meta_file:
+            meta = json.load(meta_file)
+        self.board_shape: tuple[int, int] = tuple(meta["board_shape"])
+        self.n_colors: int = meta.get("n_colors", cf.Color.N_COLORS)
+        self.frame_shape: tuple[int, int, int]|None = tuple(meta["frame_shape"]) if meta["frame_shape"] else None
+        self._dtypes: dict[str, np.dtype] = {column: np.dtype(dtype) for column, dtype in meta["dtypes"].items()}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Re-maps the files, to pick up episodes written since."""
+        self._index: np.ndarray = self._map("index", (3,))
+        self._boards: np.ndarray = self._map("boards", self.board_shape)
+        self._actions: np.ndarray = self._map("actions", ())
+        self._tiles_gained: np.ndarray = self._map("tiles_gained", ())
+        self._scores: np.ndarray = self._map("scores", ())
+        self._frames: np.ndarray|None = self._map("frames", self.frame_shape) if self.frame_shape else None
+
+    def __len__(self) -> int:
+        return self._index.shape[0]
+
+    def __getitem__(self, k: int) -> Episode:
+        if (k < 0):
+            k += len(self)
+        if (not 0 <= k < len(self)):
+            raise IndexError(f"EpisodeReader: episode {k} out of range, {len(self)} episodes recorded")
+
+        step_start, n_steps, frame_start = self._index[k].tolist()
+        steps = slice(step_start, step_start + n_steps)
+        frames = self._frames[frame_start:frame_start + n_steps + 1] if (self._frames is not None) else None
+        return Episode(self._boards[k], self._actions[steps], self._tiles_gained[steps], self._scores[steps], frames)
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield self[k]
+
+    def _map(self, column: str, item_shape: tuple[int, ...]) -> np.ndarray:
+        path: str = os.path.join(self.directory, f"{column}.bin")
+        dtype: np.dtype = self._dtypes[column]
+        item_bytes: int = dtype.itemsize * int(np.prod(item_shape))
+        n_items: int = os.path.getsize(path) // item_bytes if os.path.exists(path) else 0
+        if (n_items == 0):
+            return np.empty((0, *item_shape), dtype=dtype)  # np.memmap can't map an empty file
+        return np.memmap(path, dtype=dtype, mode="r", shape=(n_items, *item_shape))
@@ -0,0 +1,202 @@
+#   colorfill_render.py
+#   Draws ColorfillWorldEnv games with pygame, to a window ("human") or to frames ("rgb_array").
+#
+#   Only imported once an env needs to render (see ColorfillWorldEnv._render_frame), so headless
+#   envs never import pygame.
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Any, Self
+import os
+
+# imports from external libraries
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")    # no banner in every worker that renders
+import pygame
+
+# import from within package
+import colorfill_gym_env.envs.colorfill as cf
+
+
+### CLASS DEFINITIONS ###
+class Renderer:
+    """
+    The pygame side of a ColorfillWorldEnv: its window (human mode) or frame buffer (rgb_array mode),
+    and the caches that keep redrawing cheap. Reads the game state and the layout (tile size,
+    window size, colors) from the env.
+    """
+    # methods
+    def __init__(self, env: Any) -> Self:
+        self.env = env
+
+        self.window = None
+        self.clock = None
+
+        # rendering caches, see render_rgb
+        self._frame: np.ndarray|None = None
+        self._background: np.ndarray|None = None
+        self._render_colors: np.ndarray|None = None
+        self._hud_key: tuple|None = None
+        self._font = None
+        self._window_colors: np.ndarray|None = None     # human mode: the colors currently drawn in the window
+        self._window_hud_key: tuple|None = None
+
+    def render(self) -> np.ndarray|None:
+        """Draws the current state: updates the window in human mode, returns a new frame in rgb_array mode."""
+        env = self.env
+
+        # setup objects if human mode
+        if (self.window is None and env.render_mode == "human"):
+            pygame.init()
+            pygame.display.init()
+            self.window = pygame.display.set_mode(
+                (env.window_size_width, env.window_size_height)
+            )
+            self._window_colors = None     # nothing drawn yet, so the first frame is a full redraw
+
+        if (self.clock is None and env.render_mode == "human"):
+            self.clock = pygame.time.Clock()
+
+        # now pick where the frame goes
+        if (env.render_mode == "human"):
+            dirty_rects: list[pygame.Rect] = self.render_window()
+            pygame.event.pump()
+            pygame.display.update(dirty_rects)
+            self.clock.tick(env.metadata["render_fps"])    # render_fps=0 doesn't wait at all
+        else:   # i.e., "rgb_array"
+            return self.render_rgb().copy()
+
+    def board_origin(self) -> tuple[int, int]:
+        """(top, left) pixel position of the board on the canvas."""
+        env = self.env
+        return env.RENDER_MARGIN_TOP, (env.window_size_width - env.render_tile_px * env.size) // 2
+
+    def render_window(self) -> list[pygame.Rect]:
+        """
+            Updates the human-mode window in place, and returns the rectangles that changed.
+
+            The window surface persists between frames, along with the colors last drawn on it
+            (`_window_colors`), so only tiles whose color changed are redrawn: each run of
+            changed, same-colored tiles in a row is one fill. The HUD is redrawn only when it changes.
+        """
+        env = self.env
+        tile_px: int = env.render_tile_px
+        board_top, board_left = self.board_origin()
+        dirty_rects: list[pygame.Rect] = []
+
+        colors: np.ndarray = env._board.to_numpy_matrix(out=np.empty((env.size, env.size), dtype=np.intp))
+        if (self._window_colors is None):
+            self.window.fill(env.RENDER_RGB_GRAY)
+            changed: np.ndarray = np.ones(colors.shape, dtype=bool)
+            self._window_hud_key = None
+            dirty_rects.append(self.window.get_rect())
+        else:
+            changed: np.ndarray = (colors != self._window_colors)
+        self._window_colors = colors
+
+        for row in np.flatnonzero(changed.any(axis=1)).tolist():
+            row_colors: list[int] = colors[row].tolist()
+            row_changed: list[bool] = changed[row].tolist()
+            col: int = 0
+            while col < env.size:
+                if (not row_changed[col]):
+                    col += 1
+                    continue
+                run_start: int = col
+                while (col < env.size and row_changed[col] and row_colors[col] == row_colors[run_start]):
+                    col += 1
+                rect = pygame.Rect(board_left + run_start * tile_px, board_top + row * tile_px, (col - run_start) * tile_px, tile_px)
+                self.window.fill(env.RENDER_PALETTE[row_colors[run_start]].tolist(), rect)
+                dirty_rects.append(rect)
+
+        hud_key = self._hud_key_now()
+        if (hud_key != self._window_hud_key):
+            hud_top: int = board_top * 2 + tile_px * env.size
+            hud_rect = pygame.Rect(0, hud_top, env.window_size_width, env.window_size_height - hud_top)
+            self.window.fill(env.RENDER_RGB_GRAY, hud_rect)
+            for text_surface in self._hud_surfaces():
+                self.window.blit(text_surface, (board_left, hud_top))
+                hud_top += text_surface.get_height()
+            self._window_hud_key = hud_key
+            dirty_rects.append(hud_rect)
+
+        return dirty_rects
+
+    def render_rgb(self) -> np.ndarray:
+        """
+            Draws the current state into the (height, width, 3) uint8 frame buffer, and returns it.
+
+            The board is drawn with NumPy alone: the color grid indexes into RENDER_PALETTE, and is
+            upscaled into (tile_px, tile_px) blocks of the frame. The gray background is only
+            filled once, and the stats text (HUD) is only re-rasterized when it changes.
+        """
+        env = self.env
+        tile_px: int = env.render_tile_px
+        board_px: int = tile_px * env.size
+
+        if (self._frame is None):
+            self._background = np.empty((env.window_size_height, env.window_size_width, 3), dtype=np.uint8)
+            self._background[...] = env.RENDER_RGB_GRAY
+            self._frame = self._background.copy()
+            self._render_colors = np.empty((env.size, env.size), dtype=np.intp)
+            self._hud_key = None
+
+        # board: palette lookup, widen each tile to tile_px columns, then broadcast each row of
+        #   tiles down tile_px pixel rows through a (rows, tile_px, width, rgb) view of the frame
+        board_top, board_left = self.board_origin()
+        board_area = self._frame[board_top:board_top + board_px, board_left:board_left + board_px]
+        board_rgb = env.RENDER_PALETTE[env._board.to_numpy_matrix(out=self._render_colors)]
+        board_area.reshape(env.size, tile_px, board_px, 3)[...] = np.repeat(board_rgb, tile_px, axis=1)[:, None]
+
+        # game stats, below the board
+        hud_key = self._hud_key_now()
+        if (hud_key != self._hud_key):
+            top: int = board_top * 2 + board_px
+            self._frame[top:] = self._background[top:]
+            for text_surface in self._hud_surfaces():
+                text_pixels = pygame.surfarray.array3d(text_surface).swapaxes(0, 1)
+                height = min(text_pixels.shape[0], self._frame.shape[0] - top)
+                width = min(text_pixels.shape[1], self._frame.shape[1] - board_left)
+                self._frame[top:top + height, board_left:board_left + width] = text_pixels[:height, :width]
+                top += text_surface.get_height()
+            self._hud_key = hud_key
+
+        return self._frame
+
+    def close(self) -> None:
+        if (self.window is not None):
+            pygame.display.quit()
+            pygame.quit()
+            self.window = None
+        self._font = None
+        self._frame = None
+
+    def _hud_key_now(self) -> tuple:
+        """Everything the HUD shows, to tell when it needs redrawing."""
+        env = self.env
+        return (env._score, len(env._moves), env._moves[-1] if env._moves else None)
+
+    def _hud_surfaces(self) -> list[pygame.Surface]:
+        """Rasterizes the game stats text, one Surface per line, on the background color."""
+        env = self.env
+        if (self._font is None):
+            if (not pygame.font.get_init()):
+                pygame.font.init()
+            self._font = pygame.font.SysFont('DM Mono Regular', 18, bold=True, italic=False)
+
+        if (len(env._moves) > 0):
+            last_move_color_name: str = cf.Color(env._moves[-1]).color_name.upper()
+            last_move_color_rgb: tuple[int,int,int] = cf.Color(env._moves[-1]).color_rgb
+        else:
+            last_move_color_name: str = "N/A"
+            last_move_color_rgb: tuple[int,int,int] = env.RENDER_RGB_BLACK
+
+        lines = [
+            (f"> SCORE: {env._score:,}", env.RENDER_RGB_BLACK),
+            (f"> N MOVES: {len(env._moves)} / {env.max_moves}", env.RENDER_RGB_BLACK),
+            (f"> LAST MOVE: {last_move_color_name}", last_move_color_rgb),
+        ]
+        # rendered onto the background color, so the surfaces can be copied over as-is
+        return [self._font.render(text, True, text_rgb, env.RENDER_RGB_GRAY) for text, text_rgb in lines]
@@ -0,0 +1,176 @@
+#   colorfill_replay.py
+#   Random access to any (episode, move) state of recorded games, through periodic keyframes
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Self
+
+# imports from external libraries
+import numpy as np
+
+from gymnasium.utils import seeding
+
+# import from within package
+import colorfill_gym_env.envs.colorfill as cf
+import colorfill_gym_env.envs.colorfill_array as cfa
+from colorfill_gym_env.envs.colorfill_pool import BoardPool
+from colorfill_gym_env.envs.colorfill_recorder import EpisodeReader
+
+
+### CLASS DEFINITIONS ###
+class ReplayIndex:
+    """
+    Reconstructs the state at move t of episode e, without replaying the episode from the start.
+
+    Each episode is stored as its initial color grid and its actions, plus a keyframe every
+    `keyframe_interval` moves. Away from the Blob the board is still the initial grid, so a keyframe
+    only needs the Blob: its mask (bit-packed) and its color. board_at(e, t) restores the nearest keyframe at
+    or before t, then plays the (fewer than `keyframe_interval`) moves left.
+
+    Episodes can be added from a reset seed, a BoardPool index, or an explicit initial board;
+    see add_episode(...). The seed or board index is kept alongside, for reference.
+    """
+    # constants
+    KEYFRAME_INTERVAL: int = 8
+
+    # methods
+    def __init__(self,
+                 board_shape: tuple[int, int] = (cf.Board.N_ROWS, cf.Board.N_COLS),
+                 keyframe_interval: int = KEYFRAME_INTERVAL,
+                 board_pool: BoardPool|None = None,
+                 n_colors: int = cf.Color.N_COLORS) -> Self:
+        self.board_shape: tuple[int, int] = tuple(board_shape)
+        self.n_colors: int = n_colors
+        self.keyframe_interval: int = keyframe_interval
+        assert board_pool is None or board_pool.n_colors == n_colors
+        self.board_pool: BoardPool|None = board_pool
+
+        # per episode
+        self._initial_boards: list[np.ndarray] = []
+        self._actions: list[np.ndarray] = []
+        self._seeds: list[int] = []             # -1 if not added from a seed
+        self._board_indices: list[int] = []     # -1 if not added from a board pool
+
+        # per episode, one row per keyframe (move 0, keyframe_interval, 2 * keyframe_interval, ...)
+        self._keyframe_blobs: list[np.ndarray] = []     # (n_keyframes, packed mask bytes) uint8
+        self._keyframe_colors: list[np.ndarray] = []    # (n_keyframes,) uint8
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def n_moves(self, episode: int) -> int:
+        return self._actions[episode].size
+
+    def add_episode(self,
+                    actions: list[int]|np.ndarray,
+                    seed: int|None = None,
+                    board_index: int|None = None,
+                    initial_board: np.ndarray|None = None) -> int:
+        """
+            Adds an episode and computes its keyframes. Returns the episode's index.
+
+            Give exactly one of:
+                seed: the seed passed to ColorfillWorldEnv.reset(seed=...) for this episode
+                board_index: the board_index of a ColorfillWorldEnv reset from this index's `board_pool`
+                initial_board: the color grid the episode started from
+        """
+        assert sum(source is not None for source in (seed, board_index, initial_board)) == 1
+        if (seed is not None):
+            rng, _ = seeding.np_random(seed)
+            initial_board = cf.Board.make_random_matrix(*self.board_shape, rand_generator=rng, n_colors=self.n_colors)
+        elif (board_index is not None):
+            initial_board = self.board_pool[board_index]
+
+        initial_board = np.asarray(initial_board, dtype=np.uint8).copy()
+        actions = np.asarray(actions, dtype=np.uint8).copy()
+
+        # play the episode once, keeping a snapshot every keyframe_interval moves
+        board = cfa.ArrayBoard(colors=initial_board, n_colors=self.n_colors)
+        blobs: list[np.ndarray] = []
+        colors: list[int] = []
+        for t in range(0, actions.size + 1):
+            if (t % self.keyframe_interval == 0):
+                blob_mask, blob_color_index = board.snapshot()
+                blobs.append(np.packbits(blob_mask))
+                colors.append(blob_color_index)
+            if (t < actions.size):
+                board.make_move(int(actions[t]))
+
+        self._initial_boards.append(initial_board)
+        self._actions.append(actions)
+        self._seeds.append(-1 if seed is None else seed)
+        self._board_indices.append(-1 if board_index is None else board_index)
+        self._keyframe_blobs.append(np.stack(blobs))
+        self._keyframe_colors.append(np.asarray(colors, dtype=np.uint8))
+        return len(self) - 1
+
+    def board_at(self, episode: int, t: int) -> cfa.ArrayBoard:
+        """
+            Returns a new ArrayBoard in the state after the first `t` moves of `episode`
+            (t=0 is the state right after reset). Costs one keyframe restore plus fewer than
+            `keyframe_interval` moves.
+        """
+        actions: np.ndarray = self._actions[episode]
+        assert 0 <= t <= actions.size, f"ReplayIndex.board_at: episode {episode} has {actions.size} moves, asked for {t}"
+
+        keyframe: int = t // self.keyframe_interval
+        n_tiles: int = self.board_shape[0] * self.board_shape[1]
+        blob_mask = np.unpackbits(self._keyframe_blobs[episode][keyframe], count=n_tiles).astype(bool)
+
+        board = cfa.ArrayBoard(colors=self._initial_boards[episode], n_colors=self.n_colors)
+        board.restore((blob_mask.reshape(self.board_shape), int(self._keyframe_colors[episode][keyframe])))
+        for action in actions[keyframe * self.keyframe_interval:t].tolist():
+            board.make_move(action)
+        return board
+
+    def actions(self, episode: int) -> np.ndarray:
+        return self._actions[episode]
+
+    def initial_board(self, episode: int) -> np.ndarray:
+        return self._initial_boards[episode]
+
+    @classmethod
+    def from_reader(cls, reader: EpisodeReader, keyframe_interval: int = KEYFRAME_INTERVAL) -> Self:
+        """Builds an index over every episode an EpisodeRecorder wrote (see colorfill_recorder)."""
+        index = cls(reader.board_shape, keyframe_interval, n_colors=reader.n_colors)
+        for episode in reader:
+            index.add_episode(np.asarray(episode.actions), initial_board=np.asarray(episode.initial_board))
+        return index
+
+    def save(self, path: str) -> None:
+        """Writes the index as one .npz file (ragged columns are stored flat, with offsets)."""
+        n_moves = np.array([actions.size for actions in self._actions], dtype=np.int64)
+        n_keyframes = np.array([colors.size for colors in self._keyframe_colors], dtype=np.int64)
+        np.savez(
+            path,
+            board_shape=np.asarray(self.board_shape),
+            keyframe_interval=np.asarray(self.keyframe_interval),
+            n_colors=np.asarray(self.n_colors),
+            initial_boards=np.stack(self._initial_boards) if self._initial_boards else np.zeros((0, *self.board_shape), dtype=np.uint8),
+            actions=np.concatenate(self._actions) if self._actions else np.zeros(0, dtype=np.uint8),
+            n_moves=n_moves,
+            seeds=np.asarray(self._seeds, dtype=np.int64),
+            board_indices=np.asarray(self._board_indices, dtype=np.int64),
+            keyframe_blobs=np.concatenate(self._keyframe_blobs) if self._keyframe_blobs else np.zeros((0, 0), dtype=np.uint8),
+            keyframe_colors=np.concatenate(self._keyframe_colors) if self._keyframe_colors else np.zeros(0, dtype=np.uint8),
+            n_keyframes=n_keyframes,
+        )
+
+    @classmethod
+    def load(cls, path: str, board_pool: BoardPool|None = None) -> Self:
+        with np.load(path) as data:
+            n_colors: int = int(data["n_colors"]) if ("n_colors" in data) else cf.Color.N_COLORS
+            index = cls(tuple(data["board_shape"].tolist()), int(data["keyframe_interval"]), board_pool, n_colors)
+            if (data["n_moves"].size == 0):
+                return index    # no episodes (np.split would still give back one empty piece)
+            move_offsets = np.cumsum(data["n_moves"])[:-1]
+            keyframe_offsets = np.cumsum(data["n_keyframes"])[:-1]
+
+            index._initial_boards = list(data["initial_boards"])
+            index._actions = np.split(data["actions"], move_offsets)
+            index._seeds = data["seeds"].tolist()
+            index._board_indices = data["board_indices"].tolist()
+            index._keyframe_blobs = np.split(data["keyframe_blobs"], keyframe_offsets)
+            index._keyframe_colors = np.split(data["keyframe_colors"], keyframe_offsets)
+        return index
@@ -0,0 +1,275 @@
+#   colorfill_shared_vector.py
+#   A multiprocess vector environment that shares observations with its workers through shared memory.
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from multiprocessing import shared_memory
+from typing import Any, Sequence
+import multiprocessing as mp
+import os
+import traceback
+
+# imports from external libraries
+import gymnasium as gym
+import numpy as np
+
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+# import from within package
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+
+### FUNCTION DEFINITIONS ###
+def _array_specs(num_envs: int,
+                 obs_shape: tuple[int, int],
+                 obs_dtype: type,
+                 n_actions: int) -> dict[str, tuple[tuple[int, ...], type]]:
+    """(shape, dtype) of every array shared between the parent and its workers."""
+    return {
+        "actions": ((num_envs,), np.int64),
+        "board": ((num_envs, *obs_shape), obs_dtype),
+        "blob": ((num_envs, *obs_shape), obs_dtype),
+        "action_mask": ((num_envs, n_actions), np.bool_),
+        "rewards": ((num_envs,), np.float64),
+        "terminations": ((num_envs,), np.bool_),
+        "truncations": ((num_envs,), np.bool_),
+        "info": ((num_envs, len(ColorfillSharedVectorEnv.INFO_KEYS)), np.int64),
+    }
+
+
+def _attach_arrays(names: dict[str, str],
+                   specs: dict[str, tuple[tuple[int, ...], type]]
+                   ) -> tuple[list[shared_memory.SharedMemory], dict[str, np.ndarray]]:
+    """Opens existing shared memory blocks by name and wraps them as numpy arrays."""
+    blocks: list[shared_memory.SharedMemory] = []
+    arrays: dict[str, np.ndarray] = {}
+    for key, (shape, dtype) in specs.items():
+        # workers share the parent's resource tracker, and the parent unlinks the blocks on close
+        block = shared_memory.SharedMemory(name=names[key])
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return blocks, arrays
+
+
+def _worker(pipe: mp.connection.Connection,
+            parent_pipe: mp.connection.Connection,
+            start: int,
+            stop: int,
+            env_kwargs: dict[str, Any],
+            names: dict[str, str],
+            specs: dict[str, tuple[tuple[int, ...], type]]) -> None:
+    """
+        Runs the ColorfillWorldEnv instances for indices [start, stop) of the vector env.
+
+        Every command is one (command, data) message for the whole shard. Actions are read from,
+        and results are written to, the shared arrays; the reply is only an acknowledgement.
+    """
+    parent_pipe.close()
+    blocks, arrays = _attach_arrays(names, specs)
+    envs = [ColorfillWorldEnv(**env_kwargs) for _ in range(start, stop)]
+    autoreset_envs = [False for _ in envs]
+
+    def write_results(i: int, obs: dict[str, np.ndarray], info: dict[str, Any]) -> None:
+        arrays["board"][i] = obs["board"]
+        arrays["blob"][i] = obs["blob"]
+        arrays["action_mask"][i] = obs["action_mask"]
+        arrays["info"][i] = [info[key] for key in ColorfillSharedVectorEnv.INFO_KEYS]
+
+    try:
+        while True:
+            command, data = pipe.recv()
+
+            if (command == "reset"):
+                seeds, options = data
+                for k, env in enumerate(envs):
+                    obs, info = env.reset(seed=seeds[k], options=options)
+                    write_results(start + k, obs, info)
+                    autoreset_envs[k] = False
+
+            elif (command == "step"):
+                for k, env in enumerate(envs):
+                    i = start + k
+                    if (autoreset_envs[k]):
+                        obs, info = env.reset()
+                        reward, terminated, truncated = 0.0, False, False
+                    else:
+                        obs, reward, terminated, truncated, info = env.step(int(arrays["actions"][i]))
+
+                    write_results(i, obs, info)
+                    arrays["rewards"][i] = reward
+                    arrays["terminations"][i] = terminated
+                    arrays["truncations"][i] = truncated
+                    autoreset_envs[k] = terminated or truncated
+
+            elif (command == "close"):
+                pipe.send(("ok", None))
+                break
+
+            pipe.send(("ok", None))
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        pipe.send(("error", traceback.format_exc()))
+    finally:
+        for env in envs:
+            env.close()
+        for block in blocks:
+            block.close()
+        pipe.close()
+
+
+### CLASS DEFINITIONS ###
+class ColorfillSharedVectorEnv(gym.vector.VectorEnv):
+    """
+    Runs shards of ColorfillWorldEnv instances in worker processes, for when a single process can't keep up.
+
+    Unlike gymnasium's AsyncVectorEnv, workers write observations, rewards and infos straight
+    into shared memory instead of pickling them back through pipes, and each worker gets one
+    message per step for its whole shard instead of one per env.
+
+    Follows the same observation layout, seeding, reset options (passed to every env) and
+    next-step autoreset as SyncVectorEnv over ColorfillWorldEnv.
+    """
+    metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    # ColorfillWorldEnv info entries, in the column order of the shared "info" array
+    INFO_KEYS = ("num_tiles_total", "num_tiles_filled", "is_board_filled", "num_moves_made")
+
+    def __init__(self,
+                 num_envs: int,
+                 num_workers: int|None = None,
+                 env_kwargs: dict[str, Any]|None = None,
+                 context: str|None = None,
+                 copy: bool = True):
+        self.num_envs = num_envs
+        self.num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+        self.copy = copy
+
+        env_kwargs = dict(env_kwargs or {})
+        assert env_kwargs.get("render_mode") is None, "workers can't render"
+        # workers copy each observation into shared memory, so let them reuse their own buffers too
+        env_kwargs.setdefault("obs_mode", "buffer")
+
+        # spaces: taken from a throwaway ColorfillWorldEnv built here in the parent, as in ColorfillVectorEnv
+        single_env = ColorfillWorldEnv(**env_kwargs)
+        self.single_observation_space = single_env.observation_space
+        self.single_action_space = single_env.action_space
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        # shared memory, one block per array
+        board_space = self.single_observation_space["board"]
+        self._specs = _array_specs(num_envs, board_space.shape, board_space.dtype.type, self.single_action_space.n)
+        self._blocks: list[shared_memory.SharedMemory] = []
+        self._arrays: dict[str, np.ndarray] = {}
+        for key, (shape, dtype) in self._specs.items():
+            block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+            self._blocks.append(block)
+            self._arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        names = {key: block.name for key, block in zip(self._specs, self._blocks)}
+
+        # split the envs into contiguous shards, one per worker
+        bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+        self._shards: list[tuple[int, int]] = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+        ctx = mp.get_context(context)
+        self._pipes: list[mp.connection.Connection] = []
+        self._processes: list[mp.Process] = []
+        for start, stop in self._shards:
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                name=f"ColorfillSharedVectorEnv-{start}",
+                args=(child_pipe, parent_pipe, start, stop, env_kwargs, names, self._specs),
+                daemon=True,
+            )
+            process.start()
+            child_pipe.close()
+            self._pipes.append(parent_pipe)
+            self._processes.append(process)
+
+        self.closed = False
+
+    def reset(self,
+              *,
+              seed: int|Sequence[int|None]|None = None,
+              options: dict[str, Any]|None = None
+              ) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+        if (seed is None):
+            seed = [None for _ in range(self.num_envs)]
+        elif (isinstance(seed, int)):
+            seed = [seed + i for i in range(self.num_envs)]
+        assert len(seed) == self.num_envs
+
+        for pipe, (start, stop) in zip(self._pipes, self._shards):
+            pipe.send(("reset", (list(seed[start:stop]), options)))
+        self._wait()
+
+        return self._get_obs(), self._get_info()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """Sends the actions to the workers without waiting for the results (see step_wait)."""
+        self._arrays["actions"][:] = actions
+        for pipe in self._pipes:
+            pipe.send(("step", None))
+
+    def step_wait(self) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+        self._wait()
+        return (
+            self._get_obs(),
+            self._arrays["rewards"].copy(),
+            self._arrays["terminations"].copy(),
+            self._arrays["truncations"].copy(),
+            self._get_info(),
+        )
+
+    def step(self,
+             actions: np.ndarray
+             ) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close_extras(self, **kwargs: Any) -> None:
+        for pipe in self._pipes:
+            try:
+                pipe.send(("close", None))
+                pipe.recv()
+            except (BrokenPipeError, EOFError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if (process.is_alive()):
+                process.terminate()
+        for pipe in self._pipes:
+            pipe.close()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._arrays = {}
+
+    def _wait(self) -> None:
+        errors: list[str] = []
+        for pipe in self._pipes:
+            status, message = pipe.recv()
+            if (status == "error"):
+                errors.append(message)
+        if (errors):
+            raise RuntimeError("ColorfillSharedVectorEnv worker failed:\n" + "\n".join(errors))
+
+    def _get_obs(self) -> dict[str, np.ndarray]:
+        obs = {
+            "board": self._arrays["board"],
+            "blob": self._arrays["blob"],
+            "action_mask": self._arrays["action_mask"],
+        }
+        if (self.copy):
+            obs = {key: value.copy() for key, value in obs.items()}
+        return obs
+
+    def _get_info(self) -> dict[str, np.ndarray]:
+        info = {key: self._arrays["info"][:, i].copy() for i, key in enumerate(self.INFO_KEYS)}
+        info["is_board_filled"] = info["is_board_filled"].astype(bool)
+        info["action_mask"] = self._arrays["action_mask"].copy()
+        return info
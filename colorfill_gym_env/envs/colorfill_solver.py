@@ -0,0 +1,244 @@
+#   colorfill_solver.py
+#   An A* solver that finds the fewest moves needed to fill a board
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Self
+import heapq
+import itertools
+import time
+
+# imports from external libraries
+import numpy as np
+
+# import from within package
+import colorfill_gym_env.envs.colorfill as cf
+
+
+### CLASS DEFINITIONS ###
+class SolveResult:
+    """
+    What solve(...) found for a board.
+
+        - `moves`: color indices to play, in order, to fill the board (the same as env actions)
+        - `optimal`: True if `moves` is proven minimal (weight=1 and the search finished in budget)
+        - `lower_bound`: no solution can use fewer moves than this
+        - `nodes_expanded`, `elapsed`: search effort, for budgeting big labeling runs
+    """
+    # methods
+    def __init__(self,
+                 moves: list[int],
+                 optimal: bool,
+                 lower_bound: int,
+                 nodes_expanded: int,
+                 elapsed: float) -> Self:
+        self.moves: list[int] = moves
+        self.optimal: bool = optimal
+        self.lower_bound: int = lower_bound
+        self.nodes_expanded: int = nodes_expanded
+        self.elapsed: float = elapsed
+
+    @property
+    def n_moves(self) -> int:
+        return len(self.moves)
+
+    def __repr__(self) -> str:
+        return (f"SolveResult(n_moves={self.n_moves}, optimal={self.optimal}, lower_bound={self.lower_bound}, "
+                f"nodes_expanded={self.nodes_expanded}, elapsed={self.elapsed:.3f})")
+
+
+class _RegionSearch:
+    """
+    The board's RegionGraph as int bitmasks over region ids, which is what the search runs on.
+
+    A search state is the set of regions in the Blob (`blob`, also the transposition table key)
+    plus the regions touching it (`frontier`, which `blob` determines).
+    """
+    # methods
+    def __init__(self, regions: cf.RegionGraph) -> Self:
+        self.n_colors: int = regions.n_colors
+        self.region_sizes: list[int] = regions.region_sizes
+        self.adjacency_masks: list[int] = [sum(1 << neighbor for neighbor in neighbors) for neighbors in regions.adjacency]
+        self.color_masks: list[int] = [0 for _ in range(regions.n_colors)]
+        for region, color_index in enumerate(regions.region_colors):
+            self.color_masks[color_index] |= 1 << region
+        self.full_mask: int = (1 << regions.n_regions) - 1
+
+        self.start_blob: int = sum(1 << region for region in regions.blob_regions)
+        self.start_frontier: int = self.neighbors_of(self.start_blob) & ~self.start_blob
+
+    def neighbors_of(self, mask: int) -> int:
+        neighbors: int = 0
+        while mask:
+            low_bit: int = mask & -mask
+            neighbors |= self.adjacency_masks[low_bit.bit_length() - 1]
+            mask ^= low_bit
+        return neighbors
+
+    def move(self, blob: int, frontier: int, color_index: int) -> tuple[int, int]:
+        """Returns the (blob, frontier) after playing `color_index`."""
+        absorbed: int = frontier & self.color_masks[color_index]
+        blob |= absorbed
+        frontier = (frontier | self.neighbors_of(absorbed)) & ~blob
+        return blob, frontier
+
+    def successors(self, blob: int, frontier: int) -> list[int]:
+        """
+            Colors worth playing from this state.
+
+            If playing a color would absorb every remaining region of that color, playing it now
+            can never make a solution longer, so it's the only successor (a standard Flood-It pruning).
+        """
+        playable: list[int] = []
+        for color_index, color_mask in enumerate(self.color_masks):
+            if (frontier & color_mask):
+                if (color_mask & ~blob & ~frontier == 0):
+                    return [color_index]
+                playable.append(color_index)
+        return playable
+
+    def heuristic(self, blob: int, frontier: int) -> int:
+        """
+            Admissible (and consistent) lower bound on the moves left.
+
+            Group the remaining regions in layers by their distance from the Blob. After t more
+            moves, nothing farther than t can have been absorbed yet, and clearing what's left
+            takes at least one move per color still out there. So for every t:
+                moves left >= t + (number of colors among the regions farther than t)
+            t=0 is "colors remaining", and the last layer gives the eccentricity of the Blob.
+        """
+        layer_colors: list[int] = []    # bitmask of the colors present in each layer
+        visited: int = blob | frontier
+        layer: int = frontier
+        while layer:
+            colors_in_layer: int = 0
+            for color_index, color_mask in enumerate(self.color_masks):
+                if (layer & color_mask):
+                    colors_in_layer |= 1 << color_index
+            layer_colors.append(colors_in_layer)
+
+            layer = self.neighbors_of(layer) & ~visited
+            visited |= layer
+
+        bound: int = 0
+        colors_beyond: int = 0
+        for t in range(len(layer_colors) - 1, -1, -1):
+            colors_beyond |= layer_colors[t]
+            bound = max(bound, t + colors_beyond.bit_count())
+        return bound
+
+    def greedy_completion(self, blob: int, frontier: int) -> list[int]:
+        """Fills the rest of the board by always playing the color that absorbs the most tiles."""
+        moves: list[int] = []
+        while blob != self.full_mask:
+            best_color: int = max(
+                self.successors(blob, frontier),
+                key=lambda color_index: self._tiles_in(frontier & self.color_masks[color_index])
+            )
+            blob, frontier = self.move(blob, frontier, best_color)
+            moves.append(best_color)
+        return moves
+
+    def _tiles_in(self, mask: int) -> int:
+        tiles: int = 0
+        while mask:
+            low_bit: int = mask & -mask
+            tiles += self.region_sizes[low_bit.bit_length() - 1]
+            mask ^= low_bit
+        return tiles
+
+
+### FUNCTION DEFINITIONS ###
+def solve(board: cf.Board,
+          weight: float = 1.0,
+          max_nodes: int|None = 1_000_000,
+          time_limit: float|None = None) -> SolveResult:
+    """
+        Finds a shortest sequence of moves that fills `board`, from its current state, with A* search.
+
+        Works with any Board backend (it only reads to_numpy_matrix()), and runs on the board's
+        region graph: since the Blob is always one same-colored region, the regions of the current
+        color grid (with the Blob as the region at (0,0)) are all the search needs.
+
+        Args:
+            board: the board to solve; it isn't modified
+            weight: heuristic weight. 1.0 gives optimal solutions; w > 1 (weighted A*) is faster and
+                returns solutions at most w times longer than optimal
+            max_nodes, time_limit: search budget (node expansions / seconds), None for unlimited.
+                If the budget runs out, the most promising state found so far is finished greedily
+                and the result is marked as not optimal.
+
+        States are deduplicated by a transposition table keyed by the Blob's region bitmask.
+    """
+    start_time: float = time.perf_counter()
+    search = _RegionSearch(cf.RegionGraph(np.asarray(board.to_numpy_matrix()), board.n_colors))
+
+    start: tuple[int, int] = (search.start_blob, search.start_frontier)
+    start_h: int = search.heuristic(*start)
+    if (search.start_blob == search.full_mask):
+        return SolveResult([], True, 0, 0, time.perf_counter() - start_time)
+
+    # transposition table: blob -> (moves so far, parent blob, color played)
+    best: dict[int, tuple[int, int|None, int|None]] = {search.start_blob: (0, None, None)}
+    counter = itertools.count()
+    open_heap: list[tuple[float, int, int, int, int, int]] = [(weight * start_h, start_h, next(counter), 0, *start)]
+
+    most_promising: tuple[int, int, int] = (start_h, *start)   # (h, blob, frontier) with the lowest h
+    nodes_expanded: int = 0
+    solution_blob: int|None = None
+    lower_bound: int = start_h
+
+    while open_heap:
+        f, h, _, g, blob, frontier = heapq.heappop(open_heap)
+        if (g > best[blob][0]):
+            continue    # stale entry, a shorter path to this state was found after it was queued
+        if (weight == 1.0):
+            lower_bound = max(lower_bound, int(f))
+
+        if (blob == search.full_mask):
+            solution_blob = blob
+            break
+
+        out_of_nodes: bool = (max_nodes is not None and nodes_expanded >= max_nodes)
+        out_of_time: bool = (time_limit is not None and time.perf_counter() - start_time > time_limit)
+        if (out_of_nodes or out_of_time):
+            break
+
+        nodes_expanded += 1
+        for color_index in search.successors(blob, frontier):
+            next_blob, next_frontier = search.move(blob, frontier, color_index)
+            next_g: int = g + 1
+
+            known = best.get(next_blob)
+            if (known is not None and known[0] <= next_g):
+                continue
+            best[next_blob] = (next_g, blob, color_index)
+
+            next_h: int = search.heuristic(next_blob, next_frontier)
+            if (next_h < most_promising[0]):
+                most_promising = (next_h, next_blob, next_frontier)
+            heapq.heappush(open_heap, (next_g + weight * next_h, next_h, next(counter), next_g, next_blob, next_frontier))
+
+    if (solution_blob is not None):
+        moves = _moves_to(best, solution_blob)
+        optimal = (weight == 1.0)
+        lower_bound = len(moves) if optimal else lower_bound
+    else:
+        # out of budget: finish the closest state greedily
+        _, blob, frontier = most_promising
+        moves = _moves_to(best, blob) + search.greedy_completion(blob, frontier)
+        optimal = False
+
+    return SolveResult(moves, optimal, lower_bound, nodes_expanded, time.perf_counter() - start_time)
+
+
+def _moves_to(best: dict[int, tuple[int, int|None, int|None]], blob: int) -> list[int]:
+    """Follows the transposition table's parent links back to the start, returning the moves played."""
+    moves: list[int] = []
+    _, parent, color_index = best[blob]
+    while parent is not None:
+        moves.append(color_index)
+        _, parent, color_index = best[parent]
+    moves.reverse()
+    return moves
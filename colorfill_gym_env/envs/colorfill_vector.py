@@ -0,0 +1,220 @@
+#   colorfill_vector.py
+#   A natively vectorized Gymnasium environment that steps many Colorfill boards at once.
+#
+#   Developed for Python 3.11
+
+# imports from standard library
+from typing import Any, Sequence
+
+# imports from external libraries
+import gymnasium as gym
+import numpy as np
+
+from gymnasium.utils import seeding
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+# import from within package
+import colorfill_gym_env.envs.colorfill as cf
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+
+### FUNCTION DEFINITIONS ###
+def dilate_batch(blobs: np.ndarray) -> np.ndarray:
+    """Grows every (H, W) mask in a (N, H, W) stack by one tile in each of the four directions."""
+    grown = blobs.copy()
+    grown[:, 1:, :] |= blobs[:, :-1, :]
+    grown[:, :-1, :] |= blobs[:, 1:, :]
+    grown[:, :, 1:] |= blobs[:, :, :-1]
+    grown[:, :, :-1] |= blobs[:, :, 1:]
+    return grown
+
+
+def fill_batch(colors: np.ndarray, blobs: np.ndarray, moves: np.ndarray) -> np.ndarray:
+    """
+        Applies one move to each board in a batch, in place. Returns the number of tiles gained per board.
+
+        Args:
+            colors: (N, H, W) uint8 color indices, with each Blob already in its current color
+            blobs: (N, H, W) bool Blob masks
+            moves: (N,) color indices to play
+
+        Approach (masked iterative dilation):
+            (1) every board may only grow into tiles of its move color (or its own Blob)
+            (2) dilate all the Blobs by one tile and mask them with step (1)
+            (3) keep going with only the boards that changed, until none of them do
+            (4) recolor each Blob to its move color
+    """
+    moves = np.asarray(moves, dtype=np.uint8)
+    tiles_before = np.count_nonzero(blobs, axis=(1, 2))
+
+    # step (1)
+    allowed = (colors == moves[:, None, None]) | blobs
+
+    # steps (2) and (3)
+    active = np.arange(blobs.shape[0])
+    while active.size > 0:
+        current = blobs[active]
+        grown = dilate_batch(current)
+        grown &= allowed[active]
+
+        changed = np.any(grown != current, axis=(1, 2))
+        blobs[active] = grown
+        active = active[changed]
+
+    # step (4)
+    np.copyto(colors, moves[:, None, None], where=blobs)
+
+    return np.count_nonzero(blobs, axis=(1, 2)) - tiles_before
+
+
+def possible_moves_batch(colors: np.ndarray, blobs: np.ndarray, n_colors: int = cf.Color.N_COLORS) -> np.ndarray:
+    """Returns a (N, n_colors) bool array, True where the color touches (but isn't part of) the board's Blob."""
+    border = dilate_batch(blobs)
+    border &= ~blobs
+
+    moves = np.empty((colors.shape[0], n_colors), dtype=bool)
+    for color_index in range(n_colors):
+        moves[:, color_index] = np.any(border & (colors == color_index), axis=(1, 2))
+    return moves
+
+
+### CLASS DEFINITIONS ###
+class ColorfillVectorEnv(gym.vector.VectorEnv):
+    """
+    N Colorfill games stepped together as one (N, H, W) color tensor and one (N, H, W) Blob tensor.
+
+    Follows the same rules, observation layout and seeding as N copies of ColorfillWorldEnv inside
+    gymnasium's SyncVectorEnv (including its default next-step autoreset), without a Python loop
+    over sub-environments for moves. Boards that finished on the previous step are reset on the
+    next call to `step`, and their action for that call is ignored.
+    """
+    metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(self,
+                 num_envs: int,
+                 size: int = ColorfillWorldEnv.DEFAULT_SIZE,
+                 obs_dtype: type = np.uint8,
+                 n_colors: int = cf.Color.N_COLORS,
+                 max_moves: int|None = None):
+        self.num_envs = num_envs
+        self.size = size
+        self.obs_dtype = obs_dtype
+        self.n_colors = n_colors
+        self._n_tiles_total: int = size**2
+
+        # spaces: the single-env spaces come straight from ColorfillWorldEnv so the layouts can't drift
+        single_env = ColorfillWorldEnv(size=size, obs_dtype=obs_dtype, n_colors=n_colors, max_moves=max_moves)
+        self.max_moves: int = single_env.max_moves
+        self.single_observation_space = single_env.observation_space
+        self.single_action_space = single_env.action_space
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        # game state
+        self._colors: np.ndarray = np.zeros((num_envs, size, size), dtype=np.uint8)
+        self._blobs: np.ndarray = np.zeros((num_envs, size, size), dtype=bool)
+        self._scores: np.ndarray = np.zeros(num_envs, dtype=np.int64)
+        self._moves_made: np.ndarray = np.zeros(num_envs, dtype=np.int64)
+        self._autoreset_envs: np.ndarray = np.zeros(num_envs, dtype=bool)
+        self._action_masks: np.ndarray = np.zeros((num_envs, n_colors), dtype=bool)
+
+        # one RNG per board, seeded like the sub-environments of SyncVectorEnv
+        self._rngs: list[np.random.Generator]|None = None
+
+    def reset(self,
+              *,
+              seed: int|Sequence[int|None]|None = None,
+              options: dict[str, Any]|None = None
+              ) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+        if (seed is None):
+            seed = [None for _ in range(self.num_envs)]
+        elif (isinstance(seed, int)):
+            seed = [seed + i for i in range(self.num_envs)]
+        assert len(seed) == self.num_envs
+
+        if (self._rngs is None):
+            self._rngs = [None for _ in range(self.num_envs)]
+        for i, single_seed in enumerate(seed):
+            if (single_seed is not None or self._rngs[i] is None):
+                self._rngs[i], _ = seeding.np_random(single_seed)
+
+        self._reset_boards(np.arange(self.num_envs))
+        self._autoreset_envs[:] = False
+        self._action_masks = possible_moves_batch(self._colors, self._blobs, self.n_colors)
+
+        return self._get_obs(), self._get_info()
+
+    def step(self,
+             actions: np.ndarray
+             ) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+        actions = np.asarray(actions)
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+        terminations = np.zeros(self.num_envs, dtype=bool)
+        truncations = np.zeros(self.num_envs, dtype=bool)
+
+        # boards that finished last step are reset instead of stepped
+        to_reset = np.flatnonzero(self._autoreset_envs)
+        to_step = np.flatnonzero(~self._autoreset_envs)
+
+        if (to_step.size > 0):
+            colors, blobs = self._colors[to_step], self._blobs[to_step]
+            delta_tiles = fill_batch(colors, blobs, actions[to_step])
+            self._colors[to_step], self._blobs[to_step] = colors, blobs
+            self._moves_made[to_step] += 1
+
+            # same scoring and termination rules as ColorfillWorldEnv.step
+            moves_made = self._moves_made[to_step]
+            is_board_filled = (np.count_nonzero(blobs, axis=(1, 2)) == self._n_tiles_total)
+            terminated = is_board_filled | (moves_made >= self.max_moves)
+
+            self._scores[to_step] += ColorfillWorldEnv._score_move(delta_tiles)
+            self._scores[to_step] += np.where(terminated, ColorfillWorldEnv._final_move_bonus(moves_made, self.max_moves), 0)
+
+            rewards[to_step] = 1    # same placeholder reward as ColorfillWorldEnv.step
+            terminations[to_step] = terminated
+
+        if (to_reset.size > 0):
+            self._reset_boards(to_reset)
+
+        self._autoreset_envs = terminations | truncations
+        self._action_masks = possible_moves_batch(self._colors, self._blobs, self.n_colors)
+
+        return self._get_obs(), rewards, terminations, truncations, self._get_info()
+
+    def _reset_boards(self, indices: np.ndarray) -> None:
+        for i in indices:
+            self._colors[i] = cf.Board.make_random_matrix(self.size, self.size, rand_generator=self._rngs[i], n_colors=self.n_colors)
+
+        # start each Blob in the top-left corner, then make the zeroth move like Board.init_blob
+        blobs = np.zeros((indices.size, self.size, self.size), dtype=bool)
+        blobs[:, 0, 0] = True
+        colors = self._colors[indices]
+        fill_batch(colors, blobs, colors[:, 0, 0])
+        self._colors[indices], self._blobs[indices] = colors, blobs
+
+        self._scores[indices] = 0
+        self._moves_made[indices] = 0
+
+    def _get_obs(self) -> dict[str, np.ndarray]:
+        return {
+            "board": self._colors.astype(self.obs_dtype),
+            "blob": self._blobs.astype(self.obs_dtype),
+            "action_mask": self._action_masks.copy(),
+        }
+
+    def _get_info(self) -> dict[str, np.ndarray]:
+        num_tiles_filled = np.count_nonzero(self._blobs, axis=(1, 2))
+
+        return {
+            "num_tiles_total": np.full(self.num_envs, self._n_tiles_total),
+            "num_tiles_filled": num_tiles_filled,
+            "is_board_filled": (num_tiles_filled == self._n_tiles_total),
+            "num_moves_made": self._moves_made.copy(),
+            "score": self._scores.copy(),
+            "action_mask": self._action_masks.copy(),
+        }
+
+    def possible_moves(self) -> np.ndarray:
+        """Returns a (num_envs, n_colors) bool array of the colors each board could play next."""
+        return self._action_masks.copy()
@@ -11,91 +11,246 @@ from typing import Any
 # imports from external libraries
 import gymnasium as gym
 import numpy as np
-import pygame
 
 from gymnasium import spaces
 
 # import from within package
 import colorfill_gym_env.envs.colorfill as cf
+import colorfill_gym_env.envs.colorfill_array as cfa
+import colorfill_gym_env.envs.colorfill_bitboard as cfb
+from colorfill_gym_env.envs.colorfill_cache import MoveCache
+from colorfill_gym_env.envs.colorfill_pool import BoardPool
+from colorfill_gym_env.envs.colorfill_profile import Profiler
 
 
 ### CLASS DEFINITIONS ###
 class ColorfillWorldEnv(gym.Env):
     metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 4}
 
+    # an episode on the default 14x14 board ends when the board is filled or after this many moves.
+    #   Other sizes get a limit scaled with the side of the board, see default_max_moves(...)
+    MAX_MOVES: int = 25
+    DEFAULT_SIZE: int = 14
+
+    # Board implementations the env can run on, selected with `board_backend`
+    #   - "object": colorfill.Board, a grid of Tile objects (original implementation)
+    #   - "array": colorfill_array.ArrayBoard, a uint8 color grid plus a bool Blob mask
+    #   - "bitboard": colorfill_bitboard.BitBoard, per-color bitmasks plus a Blob bitmask
+    board_backends = {
+        "object": cf.Board,
+        "array": cfa.ArrayBoard,
+        "bitboard": cfb.BitBoard,
+    }
+
+    # how _get_obs builds observations, selected with `obs_mode`
+    #   - "copy": fresh arrays every step (safe to keep around)
+    #   - "buffer": arrays owned by the env, updated in place every step (copy them to keep them)
+    #   - "view": read-only views of the Board's own arrays, no copying at all.
+    #       Requires board_backend="array" and obs_dtype=np.uint8.
+    obs_modes = ["copy", "buffer", "view"]
+
+    # rendering: tile size (at most; tiles shrink so the board fits in RENDER_BOARD_PX), margin
+    #   and space for the game stats in pixels, and colors. The drawing itself is done by
+    #   colorfill_render.Renderer, which (with pygame) is only imported once the env renders.
+    RENDER_TILE_PX: int = 40
+    RENDER_BOARD_PX: int = 560
+    RENDER_MARGIN_TOP: int = 20
+    RENDER_HUD_PX: int = 120
+    RENDER_RGB_BLACK: tuple[int, int, int] = (0, 0, 0)
+    RENDER_RGB_GRAY: tuple[int, int, int] = (128, 128, 128)
+    RENDER_PALETTE: np.ndarray = np.array(cf.Color.COLOR_RGB, dtype=np.uint8)    # color index -> RGB
+
     def __init__(self, 
                  render_mode: str|None = None, 
-                 size: int = 14):
+                 size: int = DEFAULT_SIZE,
+                 board_backend: str = "object",
+                 obs_mode: str = "copy",
+                 obs_dtype: type = np.uint8,
+                 move_cache: MoveCache|None = None,
+                 render_fps: int|None = None,
+                 board_pool: BoardPool|None = None,
+                 n_colors: int = cf.Color.N_COLORS,
+                 max_moves: int|None = None,
+                 profiler: Profiler|None = None):
+        assert size >= 1
+        assert 2 <= n_colors <= cf.Color.MAX_COLORS
         self.size = size
-        self.window_size_height = 700
-        self.window_size_width = 600
+        self.n_colors = n_colors
+
+        # move limit, scaled with the board unless given
+        self.max_moves: int = max_moves if (max_moves is not None) else self.default_max_moves(size)
+
+        # tiles shrink on big boards (down to 1 px), and the window grows only if even that doesn't fit
+        self.render_tile_px: int = max(1, min(self.RENDER_TILE_PX, self.RENDER_BOARD_PX // size))
+        board_px: int = self.render_tile_px * size
+        self.window_size_height = self.RENDER_MARGIN_TOP * 2 + board_px + self.RENDER_HUD_PX
+        self.window_size_width = max(600, board_px + self.RENDER_MARGIN_TOP * 2)
 
         # observation space
         """
           Need to explore this more but for now the observation space can be a Dict
           containing the Board (as a Box space) and the Board's Blob (as a Box space).
-            - The Board will be a 14x14 grid containing integers [0,5] representing the
-              six possible colors.
-            - The Blob will be a 14x14 grid containing integers [0,1] representing the
+            - The Board will be a size x size grid (14x14 by default) containing integers
+              [0, n_colors-1] representing the possible colors (six by default).
+            - The Blob will be a size x size grid containing integers [0,1] representing the
               flooded area of the Board (1=filled, 0=not yet filled)
           May want to revisit this later for MultiDiscrete or MultiBinary spaces, or even
-          splitting the Board into six MultiBinary spaces for each color?
+          splitting the Board into one MultiBinary space per color?
+            - The action mask is a bool vector over the colors, True for the colors that
+              touch the Blob (the Board's possible moves). Also given in `info`.
         """
         self._obs_shape = (self.size, self.size)
         self.observation_space = spaces.Dict(
             {
-                "board": spaces.Box(low=0, high=5, shape=self._obs_shape, dtype=int),
-                "blob": spaces.Box(low=0, high=1, shape=self._obs_shape, dtype=int),
+                "board": spaces.Box(low=0, high=n_colors - 1, shape=self._obs_shape, dtype=obs_dtype),
+                "blob": spaces.Box(low=0, high=1, shape=self._obs_shape, dtype=obs_dtype),
+                "action_mask": spaces.Box(low=0, high=1, shape=(n_colors,), dtype=bool),
             }
         )
 
+        assert obs_mode in self.obs_modes
+        assert obs_mode != "view" or (board_backend == "array" and np.dtype(obs_dtype) == np.uint8)
+        self.obs_mode = obs_mode
+        self.obs_dtype = obs_dtype
+        self._obs_board: np.ndarray|None = None
+        self._obs_blob: np.ndarray|None = None
+        self._obs_action_mask: np.ndarray = np.zeros(n_colors, dtype=bool)
+        self._last_action_mask: np.ndarray = self._obs_action_mask
+        if (obs_mode == "buffer"):
+            self._obs_board = np.zeros(self._obs_shape, dtype=obs_dtype)
+            self._obs_blob = np.zeros(self._obs_shape, dtype=obs_dtype)
+
         # action space
-        #   There are six colors available, though you realistically can choose from a max of
-        #   five colors at each turn (choosing the same color twice in a row is silly).
-        self.action_space = spaces.Discrete(n=6)
+        #   There are n_colors colors available (six by default), though you realistically can choose
+        #   from one fewer at each turn (choosing the same color twice in a row is silly).
+        self.action_space = spaces.Discrete(n=n_colors)
 
         assert render_mode is None or render_mode in self.metadata["render_modes"]
         self.render_mode = render_mode
 
-        self.window = None
-        self.clock = None
+        # frame rate cap for human mode, overriding metadata["render_fps"]; 0 for uncapped
+        if (render_fps is not None):
+            assert render_fps >= 0
+            self.metadata = {**self.metadata, "render_fps": render_fps}
+
+        assert board_backend in self.board_backends
+        self.board_backend = board_backend
+
+        # optional memoization of move results across episodes (and across envs sharing the MoveCache).
+        #   Only BitBoard states are cheap enough to jump to, so it requires board_backend="bitboard".
+        #   Its counters are reported in `info`, see MoveCache.stats().
+        assert move_cache is None or board_backend == "bitboard"
+        self.move_cache = move_cache
+
+        # optional pre-generated boards to play instead of fresh random ones, see reset(...) and BoardPool
+        assert board_pool is None or board_pool.board_shape == (size, size)
+        assert board_pool is None or board_pool.n_colors == n_colors, \
+            f"board_pool has {board_pool.n_colors} colors, but the env was given n_colors={n_colors}"
+        self.board_pool = board_pool
+        self._board_index: int|None = None
+
+        # optional timers and counters for each phase of a step (the Boards time their own moves),
+        #   read with profiler.stats() or, with profiler.in_info, in `info`. See Profiler.
+        self.profiler = profiler
+        if (profiler is not None):
+            profiler.instrument(self, ("_get_obs", "_get_info", "_render_frame", "_score_move", "_final_move_bonus"))
+
+        # made on the first frame, see _render_frame
+        self._renderer = None
 
         # make placeholder definitions for some more instance variables
-        self._board: cf.Board = None
+        self._board: cf.Board|cfa.ArrayBoard|cfb.BitBoard = None
         self._score: int = None
         self._moves: list[int] = None
 
     def _get_obs(self):
+        if (self.obs_mode == "view"):
+            # the Blob mask is bool, which has the same memory layout as uint8 (0/1)
+            board_obs = self._board.colors.view()
+            blob_obs = self._board.blob_mask.view(np.uint8)
+            board_obs.flags.writeable = False
+            blob_obs.flags.writeable = False
+            action_mask_obs = self._board.action_mask(out=self._obs_action_mask)
+        elif (self.obs_mode == "buffer"):
+            board_obs = self._board.to_numpy_matrix(out=self._obs_board)
+            blob_obs = self._board.blob_as_numpy_matrix(out=self._obs_blob)
+            action_mask_obs = self._board.action_mask(out=self._obs_action_mask)
+        else:
+            board_obs = self._board.to_numpy_matrix(out=np.empty(self._obs_shape, dtype=self.obs_dtype))
+            blob_obs = self._board.blob_as_numpy_matrix(out=np.empty(self._obs_shape, dtype=self.obs_dtype))
+            action_mask_obs = self._board.action_mask()
+
         obs = {
-            "board": self._board.to_numpy_matrix(),
-            "blob": self._board.blob_as_numpy_matrix(),
+            "board": board_obs,
+            "blob": blob_obs,
+            "action_mask": action_mask_obs,
         }
+        self._last_action_mask = action_mask_obs    # info's action_mask is a copy of this, see _get_info
         
         return obs
     
     def _get_info(self):
-        num_tiles_total: int = self.size**2     # =14*14=196
-        num_tiles_filled: int = self._board.blob.n_tiles
+        num_tiles_total: int = self.size**2     # =196 for the default 14x14
+        num_tiles_filled: int = self._board.n_blob_tiles
         is_board_filled: bool = (num_tiles_filled == num_tiles_total)
         num_moves_made: int = len(self._moves)
 
-        return {
+        info = {
             "num_tiles_total": num_tiles_total,
             "num_tiles_filled": num_tiles_filled,
             "is_board_filled": is_board_filled,
-            "num_moves_made": num_moves_made
+            "num_moves_made": num_moves_made,
+            # _get_obs() is always called first for the same state, so its mask is reused
+            "action_mask": self._last_action_mask.copy(),
         }
+        if (self.move_cache is not None):
+            info.update(self.move_cache.stats())
+        if (self.board_pool is not None):
+            info["board_index"] = self._board_index
+        if (self.profiler is not None and self.profiler.in_info):
+            info.update(self.profiler.stats())
+
+        return info
 
     def reset(self, 
               seed: int|None = None,
               options: dict[str, Any]|None = None
               ) -> tuple:    # TODO - define tuple element types
+        """
+            Starts a new episode, on a fresh random board or, with a `board_pool`, on a board from the pool:
+            options={"board_index": k} picks board k, otherwise one is drawn at random with self.np_random.
+        """
         # seeds self.np_random
         super().reset(seed=seed)
 
         # initiate a new episode
         #   make a new Board
-        self._board: cf.Board = cf.Board(rand_generator=self.np_random)
+        board_class = self.board_backends[self.board_backend]
+        board_kwargs: dict[str, Any] = {"n_colors": self.n_colors}
+        if (self.move_cache is not None):
+            board_kwargs["move_cache"] = self.move_cache
+        if (self.profiler is not None):
+            board_kwargs["profiler"] = self.profiler
+
+        if (self.board_pool is not None):
+            options = options or {}
+            if ("board_index" in options):
+                self._board_index = int(options["board_index"])
+                if (not 0 <= self._board_index < len(self.board_pool)):
+                    raise ValueError(f"ColorfillWorldEnv: board_index must be in [0, {len(self.board_pool)}), got {options['board_index']!r}")
+            else:
+                # only drawn when no index is given, so passing one doesn't advance self.np_random
+                self._board_index = int(self.np_random.integers(len(self.board_pool)))
+            board_matrix: np.ndarray = self.board_pool[self._board_index]
+            if (board_class is cf.Board):
+                self._board = cf.Board(tiles=cf.Board.from_numpy_matrix(board_matrix.astype(int)), **board_kwargs)
+            else:
+                self._board = board_class(colors=board_matrix, **board_kwargs)
+        else:
+            assert options is None or "board_index" not in options, "board_index needs a board_pool"
+            self._board: cf.Board|cfa.ArrayBoard|cfb.BitBoard = board_class(
+                rows=self.size, cols=self.size, rand_generator=self.np_random, **board_kwargs
+            )
         self._score: int = 0
         self._moves: list[int] = []
 
@@ -109,46 +264,132 @@ class ColorfillWorldEnv(gym.Env):
     
     def step(self, 
              action) -> tuple:    # TODO - define `action` type and tuple element types
+        reward, _, terminated = self._apply_action(action)
+
+        observation = self._get_obs()
+        info = self._get_info()
+
+        if (self.render_mode == "human"):
+            self._render_frame()
+        
+        return observation, reward, terminated, False, info
+
+    def step_many(self,
+                  actions,
+                  obs_stride: int|None = None) -> tuple:
+        """
+            Applies a sequence of actions in one call, e.g. to replay a logged trajectory,
+            evaluate an open-loop plan or fast-forward to a curriculum start state.
+
+            Same rules as calling step(...) once per action, but the observation and info are only
+            built for the final state (and a frame rendered once, at the end). Stops early if the
+            episode terminates; the remaining actions are ignored.
+
+            Args:
+                actions: the actions to apply, in order
+                obs_stride: if given, also collect (copies of) the observation after every
+                    `obs_stride`-th move, in info["observations"] (with their move numbers in
+                    info["observation_moves"])
+
+            Returns (observation, rewards, terminated, truncated, info), like step(...) except:
+                - `rewards` is an array with one reward per move applied
+                - info["tiles_gained"] is an array with the tiles each move added to the Blob
+                - info["terminated_at"] is the index into `actions` of the move that ended the
+                  episode, or -1 if it didn't end
+        """
+        actions = np.asarray(actions).reshape(-1)
+        # checked up front, so a bad action doesn't leave the episode part-way through the sequence
+        if (actions.size > 0 and (not np.issubdtype(actions.dtype, np.integer)
+                                  or actions.min() < 0 or actions.max() >= self.n_colors)):
+            raise ValueError(f"ColorfillWorldEnv: actions must be color indices in [0, {self.n_colors}), got {actions!r}")
+        rewards = np.zeros(actions.size, dtype=np.float64)
+        tiles_gained = np.zeros(actions.size, dtype=np.int64)
+        observations: list[dict[str, np.ndarray]] = []
+        observation_moves: list[int] = []
+
+        terminated: bool = False
+        terminated_at: int = -1
+        n_applied: int = 0
+        for i, action in enumerate(actions.tolist()):
+            rewards[i], tiles_gained[i], terminated = self._apply_action(action)
+            n_applied = i + 1
+
+            if (obs_stride is not None and n_applied % obs_stride == 0):
+                observations.append({key: np.array(value) for key, value in self._get_obs().items()})
+                observation_moves.append(len(self._moves))
+            if (terminated):
+                terminated_at = i
+                break
+
+        observation = self._get_obs()
+        info = self._get_info()
+        info["tiles_gained"] = tiles_gained[:n_applied]
+        info["terminated_at"] = terminated_at
+        if (obs_stride is not None):
+            info["observations"] = observations
+            info["observation_moves"] = observation_moves
+
+        if (self.render_mode == "human"):
+            self._render_frame()
+
+        return observation, rewards[:n_applied], terminated, False, info
+
+    def _apply_action(self, action) -> tuple[float, int, bool]:
+        """
+            The game logic of step(...) and step_many(...), without building observations or infos.
+            Returns (reward, tiles gained, terminated).
+        """
         # map action -> color
+        if (not self.action_space.contains(action)):
+            raise ValueError(f"ColorfillWorldEnv: action must be a color index in [0, {self.n_colors}), got {action!r}")
         action_color = cf.Color(color_index=action)
 
         # count tiles in the Blob before move
-        tile_count_before = self._board.blob.n_tiles
+        tile_count_before = self._board.n_blob_tiles
 
         # apply the move to the board
         self._board.make_move(move_color=action_color)
+        self._moves.append(int(action))
 
         # count tiles in the Blob after move
-        tile_count_after = self._board.blob.n_tiles
+        tile_count_after = self._board.n_blob_tiles
         delta_tiles = tile_count_after - tile_count_before
+        if (self.profiler is not None):
+            self.profiler.count("tiles_absorbed", delta_tiles)
 
-        # update score      
-        info = self._get_info()
-        terminated = info["is_board_filled"] or (info["num_moves_made"] > 24)
+        # update score
+        num_moves_made = len(self._moves)
+        is_board_filled = (tile_count_after == self.size**2)
+        terminated = is_board_filled or (num_moves_made >= self.max_moves)
 
         self._score += self._score_move(delta_tiles=delta_tiles)
         if (terminated):
-            self._score += self._final_move_bonus(turn_number=info["num_moves_made"])
+            self._score += int(self._final_move_bonus(turn_number=num_moves_made, max_moves=self.max_moves))
 
         reward = 1  # TODO - define reward function
-        observation = self._get_obs()
 
-        if (self.render_mode == "human"):
-            self._render_frame()
-        
-        return observation, reward, terminated, False, info
+        return reward, delta_tiles, terminated
 
-    def _score_move(self, delta_tiles: int) -> int:
-        if (delta_tiles == 0):
-            return 0
-        
+    @staticmethod
+    def _score_move(delta_tiles: int|np.ndarray) -> int|np.ndarray:
+        # no special case for delta_tiles == 0, the formula already scores it as 0.
+        #   Keeping it branch-free lets ColorfillVectorEnv score a whole array of moves at once.
         per_block_bonus = (delta_tiles - 1) * 100
         move_score = (1000 + per_block_bonus) * delta_tiles
 
         return move_score
     
-    def _final_move_bonus(self, turn_number: int) -> int:
+    @staticmethod
+    def _final_move_bonus(turn_number: int|np.ndarray, max_moves: int = MAX_MOVES) -> int|np.ndarray:
+        # the bonus curve is tuned for MAX_MOVES moves, so other move limits are mapped onto it
+        if (max_moves != ColorfillWorldEnv.MAX_MOVES):
+            turn_number = np.rint(np.asarray(turn_number) * (ColorfillWorldEnv.MAX_MOVES / max_moves)).astype(np.int64)
         return 2000 * (turn_number**2) - (100000 * turn_number) + 1300000
+
+    @classmethod
+    def default_max_moves(cls, size: int) -> int:
+        """Move limit for a size x size board: MAX_MOVES on the default 14x14, scaled with the side."""
+        return max(1, round(cls.MAX_MOVES * size / cls.DEFAULT_SIZE))
     
     def _reward(self, board_before, board_after, info):
         return self._score / 1e6
@@ -158,86 +399,23 @@ class ColorfillWorldEnv(gym.Env):
             return self._render_frame()
         
     def _render_frame(self):
-        # rendering constants
-        rgb_black: tuple[int, int, int] = (0, 0, 0)
-        rgb_gray: tuple[int, int, int] = (128, 128, 128)
-        rgb_white: tuple[int, int, int] = (255, 255, 255)
-        dim_tile_px: int = 40    # tile size (height and width) in pixels
-        dim_board_px: int = dim_tile_px * self.size
-
-        # setup objects if human mode
-        if (self.window is None and self.render_mode == "human"):
-            pygame.init()
-            pygame.display.init()
-            self.window = pygame.display.set_mode(
-                (self.window_size_width, self.window_size_height)
-            )
-        
-        if (self.clock is None and self.render_mode == "human"):
-            self.clock = pygame.time.Clock()
-
-        # render the board as a Surface
-        board_surface: pygame.Surface = pygame.Surface((dim_board_px, dim_board_px))
-
-        top, left = 0, 0
-        width, height = dim_tile_px, dim_tile_px
-        rows, cols = self._board.N_ROWS, self._board.N_COLS
-
-        for i in range(rows):
-            for j in range(cols):
-                top = i * dim_tile_px
-                left = j * dim_tile_px
-                tile_color_rgb: tuple[int, int, int] = self._board.tile_at_position(cf.Position(i,j)).color.color_rgb
-
-                pygame.draw.rect(board_surface, tile_color_rgb, pygame.Rect((left, top), (width, height)))
-
-        # render canvas
-        canvas = pygame.Surface((self.window_size_width, self.window_size_height))
-
-        margin_board_top: int = 20
-        margin_board_left: int = (canvas.get_width() - canvas.get_height()) // 2
-        margin_board_bottom: int = margin_board_top
-        text_area_top: int = margin_board_top + board_surface.get_height() + margin_board_bottom
-        text_area_left: int = margin_board_left
-        spacing_text: int = 0
+        # pygame is only imported here, the first time something is drawn (see colorfill_render)
+        if (self._renderer is None):
+            from colorfill_gym_env.envs.colorfill_render import Renderer
+            self._renderer = Renderer(self)
+        return self._renderer.render()
 
-        #   add board to canvas
-        canvas.fill(rgb_gray)
-        canvas.blit(board_surface, (margin_board_left, margin_board_top))
+    def stats(self) -> dict[str, int]:
+        """The profiler's timers and counters (see Profiler.stats), or {} when there's no profiler."""
+        return self.profiler.stats() if (self.profiler is not None) else {}
 
-        #   add game stats to canvas
-        font = pygame.font.SysFont('DM Mono Regular', 18, bold=True, italic=False)
-
-        if (len(self._moves) > 0):
-            last_move_color_name: str = cf.Color(self._moves[-1]).color_name.upper()
-            last_move_color_rgb: tuple[int,int,int] = cf.Color(self._moves[-1]).color_rgb
-        else:
-            last_move_color_name: str = "N/A"
-            last_move_color_rgb: tuple[int,int,int] = rgb_black
-        
-        text_score = font.render(f"> SCORE: {self._score:,}", True, rgb_black)
-        text_n_moves = font.render(f"> N MOVES: {len(self._moves)} / 25", True, rgb_black)
-        text_last_move = font.render(f"> LAST MOVE: {last_move_color_name}", True, last_move_color_rgb)
-
-        canvas.blit(text_score, (text_area_left, text_area_top))
-        text_area_top += text_score.get_height() + spacing_text
-        canvas.blit(text_n_moves, (text_area_left, text_area_top))
-        text_area_top += text_n_moves.get_height() + spacing_text
-        canvas.blit(text_last_move, (text_area_left, text_area_top))
-
-        # now pick where the canvas goes
-        if (self.render_mode == "human"):
-            self.window.blit(canvas, canvas.get_rect())
-            pygame.event.pump()
-            pygame.display.update()
-            self.clock.tick(self.metadata["render_fps"])
-        else:   # i.e., "rgb_array"
-            return np.transpose(
-                np.array(pygame.surfarray.pixels3d(canvas)), axes=(1, 0, 2)
-            )
+    @property
+    def window(self):
+        """The human-mode pygame window, once the first frame is drawn (None otherwise)."""
+        return self._renderer.window if (self._renderer is not None) else None
 
     def close(self):
-        if (self.window is not None):
-            pygame.display.quit()
-            pygame.quit()
+        if (self._renderer is not None):
+            self._renderer.close()
+            self._renderer = None
     
\ No newline at end of file
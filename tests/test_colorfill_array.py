@@ -0,0 +1,61 @@
+import numpy as np
+
+import colorfill_gym_env.envs.colorfill as cf
+import colorfill_gym_env.envs.colorfill_array as cfa
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+def play_both(seed, n_moves=25):
+    rng = np.random.default_rng(seed)
+    board = cf.Board(rand_generator=np.random.default_rng(seed))
+    array_board = cfa.ArrayBoard(rand_generator=np.random.default_rng(seed))
+
+    for _ in range(n_moves):
+        assert np.array_equal(board.to_numpy_matrix(), array_board.to_numpy_matrix())
+        assert np.array_equal(board.blob_as_numpy_matrix(), array_board.blob_as_numpy_matrix())
+        assert board.n_blob_tiles == array_board.n_blob_tiles
+
+        moves = board.possible_moves()
+        assert sorted(m.color_index for m in moves) == sorted(m.color_index for m in array_board.possible_moves())
+        if (len(moves) == 0):
+            break
+
+        move = moves[rng.integers(len(moves))]
+        board.make_move(move)
+        array_board.make_move(move)
+
+def test_ArrayBoard_matches_Board():
+    for seed in range(10):
+        play_both(seed)
+
+def test_ArrayBoard_default_seed_matches_Board():
+    assert np.array_equal(cf.Board().to_numpy_matrix(), cfa.ArrayBoard().to_numpy_matrix())
+
+def test_ArrayBoard_getitem():
+    array_board = cfa.ArrayBoard()
+    tile = array_board[3, 4]
+    assert tile.position == cf.Position(3, 4)
+    assert tile.color.color_index == array_board.colors[3, 4]
+
+def test_env_array_backend_matches_object_backend():
+    env_object = ColorfillWorldEnv(board_backend="object")
+    env_array = ColorfillWorldEnv(board_backend="array")
+    obs_object, _ = env_object.reset(seed=5)
+    obs_array, _ = env_array.reset(seed=5)
+
+    for action in [0, 1, 2, 3, 4, 5, 0, 1]:
+        for key in ("board", "blob"):
+            assert np.array_equal(obs_object[key], obs_array[key])
+        obs_object, _, _, _, info_object = env_object.step(action)
+        obs_array, _, _, _, info_array = env_array.step(action)
+        assert np.array_equal(info_object.pop("action_mask"), info_array.pop("action_mask"))
+        assert info_object == info_array
+
+
+def test_neighbor_table_cache_is_bounded():
+    cfa.ArrayBoard._neighbor_table.cache_clear()
+    for size in range(2, 2 + 3 * cfa.ArrayBoard.NEIGHBOR_TABLE_SHAPES):
+        cfa.ArrayBoard(rows=size, cols=size)
+    assert cfa.ArrayBoard._neighbor_table.cache_info().currsize <= cfa.ArrayBoard.NEIGHBOR_TABLE_SHAPES
+    board = cfa.ArrayBoard(rows=3, cols=4)
+    assert board._neighbors[0] == (4, 1)
+    assert board._neighbors[11] == (7, 10)
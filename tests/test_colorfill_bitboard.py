@@ -0,0 +1,49 @@
+import numpy as np
+
+import colorfill_gym_env.envs.colorfill_array as cfa
+import colorfill_gym_env.envs.colorfill_bitboard as cfb
+
+def test_BitBoard_matches_ArrayBoard():
+    rng = np.random.default_rng(0)
+    for seed in range(10):
+        array_board = cfa.ArrayBoard(rand_generator=np.random.default_rng(seed))
+        bit_board = cfb.BitBoard(rand_generator=np.random.default_rng(seed))
+
+        while True:
+            assert np.array_equal(array_board.to_numpy_matrix(), bit_board.to_numpy_matrix())
+            assert np.array_equal(array_board.blob_as_numpy_matrix(), bit_board.blob_as_numpy_matrix())
+            assert bit_board.n_blob_tiles == array_board.n_blob_tiles
+
+            moves = array_board.possible_moves()
+            assert [m.color_index for m in moves] == [m.color_index for m in bit_board.possible_moves()]
+            if (len(moves) == 0):
+                break
+
+            move = moves[rng.integers(len(moves))]
+            array_board.make_move(move)
+            bit_board.make_move(move)
+
+def test_BitBoard_non_square():
+    colors = np.array([[0, 0, 1],
+                       [1, 0, 1]])
+    bit_board = cfb.BitBoard(colors=colors)
+    assert bit_board.n_blob_tiles == 3
+    assert bit_board[1, 2].color.color_index == 1
+
+    bit_board.make_move(1)
+    assert bit_board.n_blob_tiles == 6
+    assert np.array_equal(bit_board.to_numpy_matrix(), np.ones((2, 3)))
+
+def test_BitBoard_push_pop_move():
+    bit_board = cfb.BitBoard()
+    state = bit_board.state
+    matrix = bit_board.to_numpy_matrix()
+
+    move = bit_board.possible_moves()[0]
+    gained = bit_board.push_move(move)
+    assert gained > 0
+    assert bit_board.state != state
+
+    bit_board.pop_move()
+    assert bit_board.state == state
+    assert np.array_equal(bit_board.to_numpy_matrix(), matrix)
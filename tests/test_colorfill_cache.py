@@ -0,0 +1,57 @@
+import numpy as np
+
+import colorfill_gym_env.envs.colorfill_bitboard as cfb
+from colorfill_gym_env.envs.colorfill_cache import MoveCache
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+def test_MoveCache_lru_eviction():
+    cache = MoveCache(max_bytes=30)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    cache.put("c", 3, 10)
+    assert cache.get("a") == 1      # "a" is now the most recently used
+
+    cache.put("d", 4, 10)
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == [1, 3, 4]
+    assert (cache.hits, cache.misses, cache.evictions) == (4, 1, 1)
+    assert cache.n_bytes == 30
+
+def test_BitBoard_with_cache_matches_without():
+    cache = MoveCache()
+    rng = np.random.default_rng(0)
+    for _ in range(2):  # the second pass replays the same board from the cache
+        plain_board = cfb.BitBoard(rand_generator=np.random.default_rng(4))
+        cached_board = cfb.BitBoard(rand_generator=np.random.default_rng(4), move_cache=cache)
+        for move in rng.integers(0, 6, size=30).tolist():
+            assert cached_board.peek_move(move) == plain_board.peek_move(move)
+            assert cached_board.possible_moves() == plain_board.possible_moves()
+            cached_board.make_move(move)
+            plain_board.make_move(move)
+            assert cached_board.state == plain_board.state
+            assert cached_board.state_hash == plain_board.state_hash
+    assert cache.hits > 0
+
+def test_env_reports_move_cache_stats():
+    env = ColorfillWorldEnv(board_backend="bitboard", move_cache=MoveCache())
+    for _ in range(2):
+        env.reset(seed=5)
+        _, _, _, _, info = env.step(2)
+    assert info["move_cache_hits"] >= 2
+    assert info["move_cache_evictions"] == 0
+
+def test_BitBoard_cache_keys_are_small_and_counted():
+    import sys
+    cache = MoveCache()
+    colors = np.random.default_rng(1).integers(0, 6, size=(64, 64))
+    board = cfb.BitBoard(colors=colors, move_cache=cache)
+    board.make_move(board.possible_moves()[0])
+    board_bytes = sum(sys.getsizeof(mask) for mask in board.color_masks)
+    key_bytes = [sum(sys.getsizeof(part) for part in key) for key in cache._entries]
+    assert max(key_bytes) < board_bytes
+    assert cache.n_bytes >= sum(key_bytes)
+
+    # same colors in another shape is another board, with its own entries
+    other = cfb.BitBoard(colors=colors.reshape(32, 128), move_cache=cache)
+    assert other._cache_board_key != board._cache_board_key
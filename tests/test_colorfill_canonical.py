@@ -0,0 +1,38 @@
+import numpy as np
+
+import colorfill_gym_env.envs.colorfill_array as cfa
+from colorfill_gym_env.envs.colorfill_canonical import canonicalize, canonicalize_board
+from colorfill_gym_env.envs.colorfill_solver import solve
+
+def test_canonicalize_relabeled_boards_match():
+    colors = cfa.ArrayBoard.make_random_board(rand_generator=np.random.default_rng(2))
+    relabel = np.array([3, 5, 0, 1, 4, 2])
+    board = cfa.ArrayBoard(colors=colors)
+    relabeled_board = cfa.ArrayBoard(colors=relabel[colors])
+
+    canonical = canonicalize_board(board)
+    relabeled_canonical = canonicalize_board(relabeled_board)
+    assert canonical == relabeled_canonical
+    assert canonical.colors[0, 0] == 0
+
+    # moves map back through each board's own permutation
+    for canonical_move in range(6):
+        move = canonical.from_canonical_move(canonical_move)
+        relabeled_move = relabeled_canonical.from_canonical_move(canonical_move)
+        assert relabel[move] == relabeled_move
+        assert canonical.to_canonical_move(move) == canonical_move
+
+def test_canonicalize_transpose():
+    colors = cfa.ArrayBoard.make_random_board(rand_generator=np.random.default_rng(3))
+    blob = cfa.ArrayBoard(colors=colors).blob_mask
+    assert canonicalize(colors, blob) != canonicalize(colors.T, blob.T)
+    assert canonicalize(colors, blob, transpose=True) == canonicalize(colors.T, blob.T, transpose=True)
+
+def test_canonical_solution_maps_back():
+    board = cfa.ArrayBoard(rand_generator=np.random.default_rng(5))
+    canonical = canonicalize_board(board, transpose=True)
+    result = solve(cfa.ArrayBoard(colors=canonical.colors))
+
+    for canonical_move in result.moves:
+        board.make_move(canonical.from_canonical_move(canonical_move))
+    assert board.n_blob_tiles == board.rows * board.cols
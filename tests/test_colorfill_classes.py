@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 import colorfill_gym_env.envs.colorfill as cf
@@ -11,3 +12,169 @@ def test_Color_class_getitem_failing():
         color_obj = cf.Color["Spam"]
 
 # TODO - write tests
+
+def component_of_origin(board_matrix):
+    """Reference flood fill: the same-colored region connected to (0,0)."""
+    rows, cols = board_matrix.shape
+    region = {(0, 0)}
+    to_check = [(0, 0)]
+    while to_check:
+        row, col = to_check.pop()
+        for n_row, n_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if (0 <= n_row < rows and 0 <= n_col < cols and (n_row, n_col) not in region
+                    and board_matrix[n_row, n_col] == board_matrix[0, 0]):
+                region.add((n_row, n_col))
+                to_check.append((n_row, n_col))
+    return region
+
+def test_Board_make_move_blob_is_origin_component():
+    rng = np.random.default_rng(0)
+    board = cf.Board(rand_generator=np.random.default_rng(1))
+
+    for _ in range(cf.Board.N_ROWS * cf.Board.N_COLS):
+        board_matrix = board.to_numpy_matrix()
+        blob_positions = {(tile.position.row, tile.position.col) for tile in board.blob}
+        assert blob_positions == component_of_origin(board_matrix)
+
+        moves = board.possible_moves()
+        if (len(moves) == 0):
+            break
+        board.make_move(moves[rng.integers(len(moves))])
+
+    assert board.blob.n_tiles == cf.Board.N_ROWS * cf.Board.N_COLS
+    assert board.possible_moves() == []
+
+def test_Board_make_move_same_color_is_noop():
+    board = cf.Board()
+    n_tiles = board.blob.n_tiles
+    board.make_move(board.blob.filled_color)
+    assert board.blob.n_tiles == n_tiles
+
+def test_RegionGraph_labels_and_adjacency():
+    board_matrix = np.array([[0, 0, 1],
+                             [2, 0, 1],
+                             [2, 2, 3]])
+    regions = cf.RegionGraph(board_matrix)
+    assert regions.n_regions == 4
+    assert sorted(regions.region_sizes) == [1, 2, 3, 3]
+    assert regions.blob_regions == {regions.labels[0, 0]}
+    assert regions.n_blob_tiles == 3
+    assert regions.adjacency[regions.labels[2, 2]] == {regions.labels[1, 2], regions.labels[2, 1]}
+    assert regions.possible_moves() == [1, 2]
+    assert regions.eccentricity() == 2
+
+    regions.absorb(2)
+    assert regions.n_blob_tiles == 6
+    assert regions.n_regions_remaining == 2
+    assert regions.possible_moves() == [1, 3]
+    assert regions.eccentricity() == 1
+
+def test_RegionGraph_matches_reference_on_non_square_board():
+    board_matrix = np.random.default_rng(3).integers(0, 3, size=(9, 23))
+    regions = cf.RegionGraph(board_matrix, n_colors=3)
+    assert {tuple(cell) for cell in zip(*np.nonzero(regions.blob_mask()))} == component_of_origin(board_matrix)
+    assert sum(regions.region_sizes) == board_matrix.size
+    for region, cells in enumerate(regions.region_cells):
+        assert all(regions.labels[row, col] == region for row, col in cells)
+
+def test_backends_agree_on_large_board_with_more_colors():
+    import colorfill_gym_env.envs.colorfill_array as cfa
+    import colorfill_gym_env.envs.colorfill_bitboard as cfb
+
+    colors = cf.Board.make_random_matrix(40, 60, rand_generator=np.random.default_rng(5), n_colors=9)
+    boards = [
+        cf.Board(tiles=cf.Board.from_numpy_matrix(colors), n_colors=9),
+        cfa.ArrayBoard(colors=colors, n_colors=9),
+        cfb.BitBoard(colors=colors, n_colors=9),
+    ]
+    rng = np.random.default_rng(6)
+    for _ in range(30):
+        moves = boards[0].possible_moves()
+        assert all(board.possible_moves() == moves for board in boards)
+        for board in boards:
+            assert np.array_equal(board.to_numpy_matrix(), boards[0].to_numpy_matrix())
+            assert np.array_equal(board.blob_as_numpy_matrix(), boards[0].blob_as_numpy_matrix())
+            assert board.state_hash == boards[0].state_hash
+            assert board.action_mask().shape == (9,)
+        move = moves[rng.integers(len(moves))]
+        for board in boards:
+            board.make_move(move)
+    assert boards[0][0, 0].color == move
+
+def test_Color_is_shared_and_Position_immutable():
+    import copy, pickle
+    assert cf.Color(3) is cf.Color(np.uint8(3)) is cf.Color["Yellow"]
+    assert cf.Position(1, 2) == cf.Position(row=1, col=2)
+    for obj in (cf.Color(3), cf.Position(1, 2)):
+        assert copy.deepcopy(obj) is obj
+        assert pickle.loads(pickle.dumps(obj)) == obj
+        with pytest.raises(AttributeError):
+            obj.__dict__
+    assert pickle.loads(pickle.dumps(cf.Color(3))) is cf.Color(3)
+    with pytest.raises(AttributeError):
+        cf.Position(1, 2).row = 5
+    with pytest.raises(AttributeError):
+        cf.Color(3).color_index = 4
+
+def test_Board_owns_its_positions_and_neighbors():
+    board = cf.Board(rows=3, cols=4)
+    assert set(board.neighbors_of(cf.Position(0, 0))) == {cf.Position(0, 1), cf.Position(1, 0)}
+    assert len(board.neighbors_of(cf.Position(1, 1))) == 4
+    assert all(neighbor is board[neighbor.row, neighbor.col].position for neighbor in board.neighbors_of(cf.Position(2, 3)))
+
+    # nothing about a board's positions outlives it on the class
+    cf.Position(-1, 0).neighbors()
+    assert not any(isinstance(value, dict) for value in vars(cf.Position).values())
+
+def test_Tile_neighbors_are_the_Board_tuples_and_Blob_tiles_recolor_through_the_Blob():
+    board = cf.Board(rows=3, cols=4)
+    tile = board[2, 3]
+    assert tile.neighbors() is board.neighbors_of(tile.position)
+    assert len(board[1, 1].neighbors()) == 4
+    loose = cf.Tile(cf.Color(0), cf.Position(0, 0))
+    assert set(loose.neighbors()) == {cf.Position(-1, 0), cf.Position(1, 0), cf.Position(0, -1), cf.Position(0, 1)}
+    position = cf.Position(1, 1)
+    assert position.neighbors() is position.neighbors()
+    import copy
+    board_copy = copy.deepcopy(board)
+    assert board_copy[2, 3].neighbors() is board_copy.neighbors_of(board_copy[2, 3].position)
+
+    blob_tile = board[0, 0]
+    blob_tile.color = board.blob.filled_color    # already its color, fine
+    other_color = next(color for color in board.possible_moves())
+    with pytest.raises(ValueError):
+        blob_tile.color = other_color
+    assert blob_tile.color == board.blob.filled_color
+    board.blob.filled_color = other_color
+    assert blob_tile.color == other_color
+
+def test_Blob_membership_and_deepcopy():
+    board = cf.Board()
+    board.make_move(board.possible_moves()[0])
+    blob = board.blob
+    assert all(tile in blob for tile in blob)
+    outside = next(tile for row in board.tiles for tile in row if tile._blob is None)
+    assert outside not in blob
+
+    blob_copy = blob.deepcopy()
+    assert len(blob_copy) == len(blob) and blob_copy.filled_color is blob.filled_color
+    assert all(tile in blob_copy for tile in blob_copy)
+    assert all(tile._blob is blob_copy for tile in blob_copy)
+
+    removed = blob.truncate(1)
+    assert all(tile not in blob for tile in removed) and blob[0] in blob
+
+@pytest.mark.parametrize("board_matrix", [np.zeros((5, 5), dtype=int), np.zeros((1, 1), dtype=int)])
+def test_single_region_boards(board_matrix):
+    from colorfill_gym_env.envs.colorfill_pool import BoardPool
+    from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+    board = cf.Board(cf.Board.from_numpy_matrix(board_matrix))
+    assert board.regions.n_regions == 1
+    assert board.possible_moves() == []
+    assert board.n_blob_tiles == board_matrix.size
+
+    pool = BoardPool(board_matrix[None].astype(np.uint8))
+    for backend in ColorfillWorldEnv.board_backends:
+        env = ColorfillWorldEnv(size=board_matrix.shape[0], board_backend=backend, board_pool=pool)
+        _, info = env.reset(options={"board_index": 0})
+        assert info["is_board_filled"]
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+import colorfill_gym_env.envs.colorfill as cf
+from colorfill_gym_env.envs.colorfill_pool import BoardPool, count_regions_batch
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+def test_generate_is_reproducible():
+    pool = BoardPool.generate(100, seed=1)
+    assert pool.boards.shape == (100, 14, 14)
+    assert pool.boards.dtype == np.uint8
+    assert np.array_equal(BoardPool.generate(40, seed=1).boards, pool.boards[:40])
+    assert not np.array_equal(BoardPool.generate(40, seed=2).boards, pool.boards[:40])
+
+def test_count_regions_batch_matches_RegionGraph():
+    pool = BoardPool.generate(50, seed=3)
+    expected = [cf.RegionGraph(board).n_regions for board in pool.boards]
+    assert pool.region_counts(batch_size=16).tolist() == expected
+
+    snake = np.array([[[0, 0, 0],
+                       [1, 1, 0],
+                       [0, 0, 0]]])
+    assert count_regions_batch(snake).tolist() == [2]
+
+def test_pool_save_load_and_env_reset(tmp_path):
+    pool = BoardPool.generate(200, seed=4)
+    hard = pool.select(pool.region_counts() >= np.median(pool.region_counts()))
+    path = str(tmp_path / "pool.npy")
+    hard.save(path)
+
+    loaded = BoardPool.load(path)
+    assert isinstance(loaded.boards, np.memmap)
+    assert np.array_equal(loaded.boards, hard.boards)
+
+    for backend in ColorfillWorldEnv.board_backends:
+        env = ColorfillWorldEnv(board_backend=backend, board_pool=loaded)
+        _, info = env.reset(options={"board_index": 7})
+        assert info["board_index"] == 7
+        assert np.array_equal(env._board.to_numpy_matrix(), hard[7])
+        env.step(int(hard[7][0, 1]))
+
+        _, info = env.reset(seed=0)
+        assert 0 <= info["board_index"] < len(loaded)
+
+def test_pool_keeps_n_colors(tmp_path):
+    pool = BoardPool.generate(20, rows=6, cols=6, seed=5, n_colors=3)
+    assert pool.n_colors == 3
+    assert pool.select(np.arange(20) % 2 == 0).n_colors == 3
+
+    path = str(tmp_path / "pool")      # np.save adds the .npy suffix
+    pool.save(path)
+    loaded = BoardPool.load(path + ".npy")
+    assert loaded.n_colors == 3
+    assert np.array_equal(loaded.boards, pool.boards)
+
+    ColorfillWorldEnv(size=6, n_colors=3, board_pool=loaded).reset(seed=0)
+    with pytest.raises(AssertionError):
+        ColorfillWorldEnv(size=6, board_pool=loaded)
+
+def test_reset_board_index_is_checked_and_leaves_rng_alone():
+    pool = BoardPool.generate(10, seed=6)
+    env_a, env_b = ColorfillWorldEnv(board_pool=pool), ColorfillWorldEnv(board_pool=pool)
+    env_a.reset(seed=1)
+    env_b.reset(seed=1)
+    env_a.reset(options={"board_index": 3})     # picking a board doesn't advance np_random
+    _, info_a = env_a.reset()
+    _, info_b = env_b.reset()
+    assert info_a["board_index"] == info_b["board_index"]
+
+    for board_index in (10, -1):
+        with pytest.raises(ValueError):
+            env_a.reset(options={"board_index": board_index})
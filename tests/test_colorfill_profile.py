@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from colorfill_gym_env.envs.colorfill_profile import Profiler
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+@pytest.mark.parametrize("backend", ["object", "array", "bitboard"])
+def test_Profiler_counts_env_phases(backend):
+    profiler = Profiler(in_info=True)
+    env = ColorfillWorldEnv(render_mode="rgb_array", board_backend=backend, profiler=profiler)
+    _, info_reset = env.reset(seed=2)
+    for action in [1, 2, 3]:
+        _, _, _, _, info = env.step(action)
+    env.render()
+
+    stats = profiler.stats()
+    assert stats["profile_make_move_calls"] == 3
+    assert stats["profile_get_obs_calls"] == 4
+    assert stats["profile_score_move_calls"] == 3
+    assert stats["profile_render_frame_calls"] == 1
+    assert stats["profile_make_move_ns"] > 0
+    assert stats["profile_tiles_absorbed"] == info["num_tiles_filled"] - info_reset["num_tiles_filled"]
+    assert stats["profile_bfs_nodes"] > 0
+    assert info["profile_make_move_calls"] == 3
+
+    profiler.reset_stats()
+    assert set(profiler.stats().values()) == {0}
+    env.close()
+
+def test_no_profiler_leaves_methods_alone():
+    env = ColorfillWorldEnv()
+    _, info = env.reset(seed=0)
+    assert "make_move" not in vars(env._board)
+    assert "_get_obs" not in vars(env)
+    assert not any(key.startswith("profile_") for key in info)
+
+@pytest.mark.parametrize("backend", ["object", "array", "bitboard"])
+def test_stats_passthrough(backend):
+    profiler = Profiler()
+    env = ColorfillWorldEnv(board_backend=backend, profiler=profiler)
+    _, info = env.reset(seed=3)
+    env.step(int(np.flatnonzero(info["action_mask"])[0]))
+    assert env.stats() == env._board.stats() == profiler.stats()
+    assert env.stats()["profile_make_move_calls"] == 1
+
+    plain = ColorfillWorldEnv(board_backend=backend)
+    plain.reset(seed=3)
+    assert plain.stats() == {}
+    assert plain._board.stats() == {}
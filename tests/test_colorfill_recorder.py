@@ -0,0 +1,64 @@
+import numpy as np
+
+from colorfill_gym_env.envs.colorfill_recorder import EpisodeReader, EpisodeRecorder
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+def play_episodes(env, seeds, rng):
+    played = []
+    for seed in seeds:
+        obs, _ = env.reset(seed=seed)
+        episode = {"board": obs["board"].copy(), "actions": [], "scores": []}
+        terminated = False
+        while not terminated:
+            action = int(rng.integers(6))
+            _, _, terminated, _, _ = env.step(action)
+            episode["actions"].append(action)
+            episode["scores"].append(env.unwrapped._score)
+        played.append(episode)
+    return played
+
+def test_recorder_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    env = EpisodeRecorder(ColorfillWorldEnv(), str(tmp_path), buffer_steps=30)
+    played = play_episodes(env, [1, 2, 3], rng)
+    env.close()
+
+    # a second recorder appends to the same files
+    env = EpisodeRecorder(ColorfillWorldEnv(), str(tmp_path))
+    played += play_episodes(env, [4], rng)
+    env.close()
+
+    reader = EpisodeReader(str(tmp_path))
+    assert len(reader) == 4
+    for k in [3, 0, 2, 1]:
+        episode = reader[k]
+        assert np.array_equal(episode.initial_board, played[k]["board"])
+        assert episode.actions.tolist() == played[k]["actions"]
+        assert episode.scores.tolist() == played[k]["scores"]
+        assert np.all(episode.tiles_gained >= 0)
+        assert np.all(episode.tiles_gained[episode.actions == np.roll(episode.actions, 1)][1:] == 0)
+
+def test_recorder_frames(tmp_path):
+    env = EpisodeRecorder(ColorfillWorldEnv(render_mode="rgb_array"), str(tmp_path), record_frames=True)
+    env.reset(seed=0)
+    env.step(1)
+    env.step(2)
+    frame = env.render()
+    env.close()
+
+    episode = EpisodeReader(str(tmp_path))[0]
+    assert episode.frames.shape == (3, *frame.shape)
+    assert np.array_equal(episode.frames[-1], frame)
+
+def test_recorder_tiles_gained_above_int16(tmp_path):
+    from colorfill_gym_env.envs.colorfill_pool import BoardPool
+    boards = np.ones((1, 200, 200), dtype=np.uint8)
+    boards[0, 0, 0] = 0
+    env = EpisodeRecorder(ColorfillWorldEnv(size=200, n_colors=2, board_pool=BoardPool(boards, n_colors=2)), str(tmp_path))
+    env.reset(options={"board_index": 0})
+    _, _, terminated, _, _ = env.step(1)
+    assert terminated
+    env.close()
+
+    episode = EpisodeReader(str(tmp_path))[0]
+    assert episode.tiles_gained.tolist() == [200 * 200 - 1]
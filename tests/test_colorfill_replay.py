@@ -0,0 +1,66 @@
+import numpy as np
+
+from colorfill_gym_env.envs.colorfill_pool import BoardPool
+from colorfill_gym_env.envs.colorfill_replay import ReplayIndex
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+def play(env, rng, **reset_kwargs):
+    obs, _ = env.reset(**reset_kwargs)
+    states = [(obs["board"].copy(), obs["blob"].copy())]
+    actions = []
+    terminated = False
+    while not terminated:
+        actions.append(int(rng.integers(6)))
+        obs, _, terminated, _, _ = env.step(actions[-1])
+        states.append((obs["board"].copy(), obs["blob"].copy()))
+    return actions, states
+
+def check_states(index, episode, states):
+    for t, (board, blob) in enumerate(states):
+        replayed = index.board_at(episode, t)
+        assert np.array_equal(replayed.to_numpy_matrix(), board)
+        assert np.array_equal(replayed.blob_as_numpy_matrix(), blob)
+
+def test_replay_from_seed_and_pool(tmp_path):
+    rng = np.random.default_rng(0)
+    pool = BoardPool.generate(10, seed=0)
+    index = ReplayIndex(keyframe_interval=4, board_pool=pool)
+
+    actions_seed, states_seed = play(ColorfillWorldEnv(), rng, seed=123)
+    actions_pool, states_pool = play(ColorfillWorldEnv(board_pool=pool), rng, options={"board_index": 6})
+    assert index.add_episode(actions_seed, seed=123) == 0
+    assert index.add_episode(actions_pool, board_index=6) == 1
+
+    check_states(index, 0, states_seed)
+    check_states(index, 1, states_pool)
+
+    path = str(tmp_path / "replay.npz")
+    index.save(path)
+    loaded = ReplayIndex.load(path)
+    assert len(loaded) == 2
+    assert loaded.actions(1).tolist() == actions_pool
+    check_states(loaded, 0, states_seed)
+
+def test_replay_from_recorder(tmp_path):
+    from colorfill_gym_env.envs.colorfill_recorder import EpisodeReader, EpisodeRecorder
+
+    env = EpisodeRecorder(ColorfillWorldEnv(), str(tmp_path))
+    _, states = play(env, np.random.default_rng(1), seed=9)
+    env.close()
+
+    index = ReplayIndex.from_reader(EpisodeReader(str(tmp_path)))
+    check_states(index, 0, states)
+
+def test_empty_replay_round_trip(tmp_path):
+    path = str(tmp_path / "empty.npz")
+    ReplayIndex(keyframe_interval=4).save(path)
+    loaded = ReplayIndex.load(path)
+    assert len(loaded) == 0
+    assert loaded.keyframe_interval == 4
+
+    # still usable after loading
+    actions, states = play(ColorfillWorldEnv(), np.random.default_rng(2), seed=5)
+    assert loaded.add_episode(actions, seed=5) == 0
+    check_states(loaded, 0, states)
+    loaded.save(path)
+    assert len(ReplayIndex.load(path)) == 1
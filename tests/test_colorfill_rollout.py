@@ -0,0 +1,67 @@
+import numpy as np
+
+import colorfill_gym_env.envs.colorfill_array as cfa
+from colorfill_gym_env.envs.colorfill_rollout import rollout
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+def test_rollout_one_move_left_scores_like_env():
+    colors = np.ones((14, 14), dtype=np.uint8)
+    colors[0, 0] = 0
+    board = cfa.ArrayBoard(colors=colors)
+
+    result = rollout(board, policy="random", n=10, moves_made=3, score=1000)
+    expected = 1000 + ColorfillWorldEnv._score_move(195) + ColorfillWorldEnv._final_move_bonus(4)
+    assert np.all(result.n_moves == 4)
+    assert np.all(result.scores == expected)
+    assert np.all(result.filled)
+    assert np.all(result.first_moves == 1)
+
+def test_rollout_policies():
+    board = cfa.ArrayBoard(rand_generator=np.random.default_rng(1))
+    random_result = rollout(board, policy="random", n=300, seed=0, batch_size=128)
+    greedy_result = rollout(board, policy="greedy", n=20, seed=0)
+
+    assert random_result.n == 300
+    assert np.all(random_result.n_moves <= ColorfillWorldEnv.MAX_MOVES)
+    assert np.all(random_result.n_moves[random_result.filled] <= ColorfillWorldEnv.MAX_MOVES)
+    assert set(random_result.first_moves.tolist()) == {color.color_index for color in board.possible_moves()}
+    assert greedy_result.scores.mean() > random_result.scores.mean()
+    assert sum(random_result.n_moves_distribution().values()) == 300
+
+def test_RolloutGraph_packed_frontier_matches_RegionGraph():
+    import colorfill_gym_env.envs.colorfill as cf
+    from colorfill_gym_env.envs.colorfill_rollout import _RolloutGraph
+    regions = cf.RegionGraph(np.random.default_rng(2).integers(0, 4, size=(30, 45)), 4)
+    graph = _RolloutGraph(regions)
+    assert graph.n_words == (regions.n_regions + 63) // 64
+    blobs = np.random.default_rng(3).random((5, regions.n_regions)) < 0.1
+    packed = graph.pack(blobs)
+    assert packed.shape == (5, graph.n_words) and np.array_equal(graph.unpack(packed), blobs)
+    rows, region_ids = graph.set_bits(packed)
+    assert np.array_equal(np.stack([rows, region_ids]), np.stack(np.nonzero(blobs)))
+
+    frontier = graph.unpack(graph.frontier(packed))
+    for blob, blob_frontier in zip(blobs, frontier):
+        expected = set().union(*(regions.adjacency[region] for region in np.flatnonzero(blob))) - set(np.flatnonzero(blob))
+        assert set(np.flatnonzero(blob_frontier).tolist()) == expected
+    assert set(np.flatnonzero(graph.unpack(graph.start_frontier)).tolist()) == set().union(*regions.frontier)
+
+    board = cfa.ArrayBoard(rows=60, cols=60, rand_generator=np.random.default_rng(0))
+    result = rollout(board, n=4, seed=0, max_moves=10**4)
+    assert np.all(result.filled)
+
+def test_rollout_default_move_limit_follows_board_size():
+    board = cfa.ArrayBoard(rows=28, cols=28, rand_generator=np.random.default_rng(5))
+    result = rollout(board, n=20, seed=0)
+    assert result.n_moves.max() <= ColorfillWorldEnv.default_max_moves(28)
+    assert result.n_moves.max() > ColorfillWorldEnv.MAX_MOVES
+
+def test_rollout_on_single_region_and_filled_boards():
+    boards = [cfa.ArrayBoard(colors=np.zeros((14, 14), dtype=np.uint8)), cfa.ArrayBoard(colors=np.zeros((1, 1), dtype=np.uint8))]
+    filled = cfa.ArrayBoard(rand_generator=np.random.default_rng(0))
+    while filled.possible_moves():
+        filled.make_move(filled.possible_moves()[0])
+    for board in boards + [filled]:
+        result = rollout(board, n=5, seed=0, moves_made=3, score=10)
+        assert np.all(result.filled) and np.all(result.n_moves == 3) and np.all(result.scores == 10)
+        assert np.all(result.first_moves == -1)
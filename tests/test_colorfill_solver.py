@@ -0,0 +1,64 @@
+import numpy as np
+
+import colorfill_gym_env.envs.colorfill as cf
+import colorfill_gym_env.envs.colorfill_array as cfa
+import colorfill_gym_env.envs.colorfill_bitboard as cfb
+from colorfill_gym_env.envs.colorfill_solver import solve
+
+def brute_force_moves(colors):
+    """Reference: breadth-first search over every reachable BitBoard state."""
+    board = cfb.BitBoard(colors=colors)
+    full = (1 << board.rows * board.cols) - 1
+    layer = {board.blob}
+    n_moves = 0
+    while full not in layer:
+        layer = {board.next_blob(blob, color_index) for blob in layer for color_index in range(cf.Color.N_COLORS)}
+        n_moves += 1
+    return n_moves
+
+def plays_out(colors, moves):
+    board = cfa.ArrayBoard(colors=colors)
+    for move in moves:
+        board.make_move(move)
+    return board.n_blob_tiles == board.rows * board.cols
+
+def test_solve_is_optimal_on_small_boards():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        colors = rng.integers(0, cf.Color.N_COLORS, size=(5, 5))
+        result = solve(cfa.ArrayBoard(colors=colors))
+        assert result.optimal
+        assert result.n_moves == brute_force_moves(colors)
+        assert result.lower_bound == result.n_moves
+        assert plays_out(colors, result.moves)
+
+def test_solve_full_board():
+    board = cf.Board(rand_generator=np.random.default_rng(5))
+    matrix = board.to_numpy_matrix()
+    result = solve(board)
+    assert result.optimal
+    assert np.array_equal(board.to_numpy_matrix(), matrix)   # not modified
+    assert plays_out(matrix, result.moves)
+
+def test_solve_out_of_budget_still_fills_board():
+    board = cfa.ArrayBoard(rand_generator=np.random.default_rng(1))
+    result = solve(board, max_nodes=10)
+    assert not result.optimal
+    assert result.lower_bound <= result.n_moves
+    assert plays_out(board.to_numpy_matrix(), result.moves)
+
+def test_solve_weighted():
+    board = cfa.ArrayBoard(rand_generator=np.random.default_rng(2))
+    optimal = solve(board)
+    weighted = solve(board, weight=2.0)
+    assert not weighted.optimal
+    assert optimal.n_moves <= weighted.n_moves <= 2 * optimal.n_moves
+    assert plays_out(board.to_numpy_matrix(), weighted.moves)
+
+def test_solve_single_region_and_filled_boards():
+    filled = cf.Board(rand_generator=np.random.default_rng(0))
+    while filled.possible_moves():
+        filled.make_move(filled.possible_moves()[0])
+    for board in [filled, cf.Board(cf.Board.from_numpy_matrix(np.zeros((6, 6), dtype=int))),
+                  cfa.ArrayBoard(colors=np.zeros((1, 1), dtype=np.uint8))]:
+        assert solve(board).n_moves == 0
@@ -0,0 +1,81 @@
+import gymnasium as gym
+import numpy as np
+
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+from colorfill_gym_env.envs.colorfill_vector import ColorfillVectorEnv
+from colorfill_gym_env.envs.colorfill_shared_vector import ColorfillSharedVectorEnv
+from colorfill_gym_env.envs.colorfill_pool import BoardPool
+
+def test_VectorEnv_matches_SyncVectorEnv():
+    num_envs = 8
+    sync_envs = gym.vector.SyncVectorEnv([lambda: ColorfillWorldEnv(board_backend="array") for _ in range(num_envs)])
+    vector_env = ColorfillVectorEnv(num_envs=num_envs)
+    assert vector_env.observation_space == sync_envs.observation_space
+
+    obs_sync, info_sync = sync_envs.reset(seed=42)
+    obs_vector, info_vector = vector_env.reset(seed=42)
+    rng = np.random.default_rng(0)
+
+    # long enough for every board to finish (25-move limit) and autoreset at least once
+    for _ in range(60):
+        for key in ("board", "blob", "action_mask"):
+            assert np.array_equal(obs_sync[key], obs_vector[key])
+        for key in ("num_tiles_filled", "num_moves_made", "is_board_filled"):
+            assert np.array_equal(info_sync[key], info_vector[key])
+
+        actions = rng.integers(0, 6, size=num_envs)
+        obs_sync, rewards_sync, terminated_sync, truncated_sync, info_sync = sync_envs.step(actions)
+        obs_vector, rewards_vector, terminated_vector, truncated_vector, info_vector = vector_env.step(actions)
+
+        assert np.array_equal(rewards_sync, rewards_vector)
+        assert np.array_equal(terminated_sync, terminated_vector)
+        assert np.array_equal(truncated_sync, truncated_vector)
+
+def test_VectorEnv_score_matches_single_env():
+    env = ColorfillWorldEnv()
+    vector_env = ColorfillVectorEnv(num_envs=1)
+    env.reset(seed=3)
+    vector_env.reset(seed=3)
+
+    terminated = False
+    while not terminated:
+        action = env._board.possible_moves()[0].color_index
+        _, _, terminated, _, _ = env.step(action)
+        _, _, _, _, info_vector = vector_env.step(np.array([action]))
+        assert info_vector["score"][0] == env._score
+
+def test_SharedVectorEnv_matches_SyncVectorEnv():
+    num_envs = 5
+    sync_envs = gym.vector.SyncVectorEnv([lambda: ColorfillWorldEnv() for _ in range(num_envs)])
+    shared_envs = ColorfillSharedVectorEnv(num_envs=num_envs, num_workers=2)
+    try:
+        assert shared_envs.observation_space == sync_envs.observation_space
+
+        obs_sync, info_sync = sync_envs.reset(seed=7)
+        obs_shared, info_shared = shared_envs.reset(seed=7)
+        rng = np.random.default_rng(0)
+
+        for _ in range(30):
+            for key in ("board", "blob", "action_mask"):
+                assert np.array_equal(obs_sync[key], obs_shared[key])
+            for key in ColorfillSharedVectorEnv.INFO_KEYS:
+                assert np.array_equal(info_sync[key], info_shared[key])
+
+            actions = rng.integers(0, 6, size=num_envs)
+            obs_sync, rewards_sync, terminated_sync, _, info_sync = sync_envs.step(actions)
+            obs_shared, rewards_shared, terminated_shared, _, info_shared = shared_envs.step(actions)
+
+            assert np.array_equal(rewards_sync, rewards_shared)
+            assert np.array_equal(terminated_sync, terminated_shared)
+    finally:
+        shared_envs.close()
+
+def test_SharedVectorEnv_reset_passes_options():
+    pool = BoardPool.generate(10, seed=3)
+    shared_envs = ColorfillSharedVectorEnv(num_envs=3, num_workers=2, env_kwargs={"board_pool": pool})
+    try:
+        obs, _ = shared_envs.reset(seed=0, options={"board_index": 4})
+        for board in obs["board"]:
+            assert np.array_equal(board, pool[4])
+    finally:
+        shared_envs.close()
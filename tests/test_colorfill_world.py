@@ -0,0 +1,196 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv
+
+def test_obs_modes_agree():
+    envs = {
+        "copy": ColorfillWorldEnv(board_backend="object", obs_mode="copy"),
+        "buffer": ColorfillWorldEnv(board_backend="array", obs_mode="buffer"),
+        "view": ColorfillWorldEnv(board_backend="array", obs_mode="view"),
+    }
+    observations = {mode: env.reset(seed=11)[0] for mode, env in envs.items()}
+
+    for action in [1, 2, 3, 4, 5, 0]:
+        for mode, obs in observations.items():
+            assert envs[mode].observation_space.contains(obs)
+            for key in ("board", "blob"):
+                assert np.array_equal(obs[key], observations["copy"][key])
+        observations = {mode: env.step(action)[0] for mode, env in envs.items()}
+
+def test_obs_mode_buffer_reuses_arrays():
+    env = ColorfillWorldEnv(obs_mode="buffer")
+    obs_reset, _ = env.reset(seed=0)
+    obs_step, _, _, _, _ = env.step(1)
+    assert obs_step["board"] is obs_reset["board"]
+    assert obs_step["board"].dtype == np.uint8
+
+def test_obs_mode_view_is_read_only():
+    env = ColorfillWorldEnv(board_backend="array", obs_mode="view")
+    obs, _ = env.reset(seed=0)
+    with pytest.raises(ValueError):
+        obs["board"][0, 0] = 1
+
+def test_obs_dtype_int():
+    env = ColorfillWorldEnv(obs_dtype=np.int64)
+    obs, _ = env.reset(seed=0)
+    assert obs["board"].dtype == np.int64
+    assert env.observation_space.contains(obs)
+
+def test_step_many_matches_step():
+    actions = [1, 2, 3, 4, 5, 0] * 5
+    env_step = ColorfillWorldEnv()
+    env_many = ColorfillWorldEnv()
+    env_step.reset(seed=7)
+    env_many.reset(seed=7)
+
+    tiles_gained = []
+    for action in actions:
+        tiles_before = env_step._board.n_blob_tiles
+        obs, _, terminated, _, info = env_step.step(action)
+        tiles_gained.append(info["num_tiles_filled"] - tiles_before)
+        if (terminated):
+            break
+
+    obs_many, rewards, terminated_many, _, info_many = env_many.step_many(actions, obs_stride=10)
+    assert terminated_many == terminated
+    assert info_many["terminated_at"] == len(tiles_gained) - 1
+    assert rewards.shape == (len(tiles_gained),)
+    assert info_many["tiles_gained"].tolist() == tiles_gained
+    assert info_many["observation_moves"] == [10, 20]
+    assert env_many._score == env_step._score
+    for key in ("board", "blob"):
+        assert np.array_equal(obs_many[key], obs[key])
+
+def test_action_mask_matches_possible_moves():
+    for backend in ColorfillWorldEnv.board_backends:
+        env = ColorfillWorldEnv(board_backend=backend)
+        obs, info = env.reset(seed=3)
+        for action in [1, 2, 3, 4, 5, 0, 2, 4]:
+            possible = [color.color_index for color in env._board.possible_moves()]
+            assert np.flatnonzero(obs["action_mask"]).tolist() == possible
+            assert np.array_equal(info["action_mask"], obs["action_mask"])
+            assert env.observation_space.contains(obs)
+            obs, _, _, _, info = env.step(action)
+
+def test_render_rgb_array():
+    env = ColorfillWorldEnv(render_mode="rgb_array")
+    env.reset(seed=0)
+    frame = env.render()
+    assert frame.shape == (env.window_size_height, env.window_size_width, 3)
+    assert frame.dtype == np.uint8
+
+    # sample the middle of every tile
+    tile_px = env.render_tile_px
+    left = (env.window_size_width - tile_px * env.size) // 2
+    centers = np.arange(env.size) * tile_px + tile_px // 2
+    tile_rgb = frame[ColorfillWorldEnv.RENDER_MARGIN_TOP + centers][:, left + centers]
+    assert np.array_equal(tile_rgb, ColorfillWorldEnv.RENDER_PALETTE[env._board.to_numpy_matrix()])
+
+    # frames are copies, and the HUD is redrawn after a move
+    env.step(2)
+    next_frame = env.render()
+    assert not np.array_equal(next_frame, frame)
+    env.close()
+
+def test_render_human_dirty_rects_match_rgb_array(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    env_human = ColorfillWorldEnv(render_mode="human", render_fps=0)
+    env_rgb = ColorfillWorldEnv(render_mode="rgb_array")
+    env_human.reset(seed=4)
+    env_rgb.reset(seed=4)
+
+    for action in [1, 2, 3]:
+        env_human.step(action)
+        env_rgb.step(action)
+        window_pixels = pygame.surfarray.array3d(env_human.window).swapaxes(0, 1)
+        assert np.array_equal(window_pixels, env_rgb.render())
+
+    # after the first frame, only the changed tiles and the HUD are redrawn
+    dirty_rects = env_human._renderer.render_window()
+    assert dirty_rects == []
+    env_human._apply_action(4)
+    dirty_rects = env_human._renderer.render_window()
+    assert 0 < sum(rect.width * rect.height for rect in dirty_rects) < env_human.window_size_width * env_human.window_size_height
+    env_human.close()
+
+def test_size_and_n_colors():
+    env = ColorfillWorldEnv(render_mode="rgb_array", size=30, n_colors=8, board_backend="array")
+    obs, _ = env.reset(seed=0)
+    assert obs["board"].shape == (30, 30)
+    assert obs["action_mask"].shape == (8,)
+    assert env.action_space.n == 8
+    assert env.observation_space.contains(obs)
+    assert env.max_moves == ColorfillWorldEnv.default_max_moves(30) > ColorfillWorldEnv.MAX_MOVES
+    assert np.array_equal(np.unique(obs["board"]), np.arange(8))
+
+    # the board is scaled down to fit the window
+    frame = env.render()
+    assert env.render_tile_px * env.size <= ColorfillWorldEnv.RENDER_BOARD_PX
+    assert frame.shape == (env.window_size_height, env.window_size_width, 3)
+
+    terminated, n_moves = False, 0
+    while not terminated:
+        obs, _, terminated, _, info = env.step(int(np.flatnonzero(obs["action_mask"])[0]))
+        n_moves += 1
+    assert n_moves <= env.max_moves
+    assert info["is_board_filled"] or n_moves == env.max_moves
+    env.close()
+
+@pytest.mark.parametrize("action", [4, 6, -1, 1.5, None])
+def test_step_rejects_actions_outside_the_action_space(action):
+    env = ColorfillWorldEnv(size=6, n_colors=4, board_backend="array")
+    env.reset(seed=0)
+    with pytest.raises(ValueError):
+        env.step(action)
+    with pytest.raises(ValueError):
+        env.step_many([0, action])
+    # rejected actions (and the rest of a rejected sequence) aren't applied
+    _, _, _, _, info = env.step(np.int64(3))
+    assert info["num_moves_made"] == 1
+    env.close()
+
+# headless import + construction + first reset(), in a fresh interpreter (~0.3s here, mostly numpy and gymnasium)
+STARTUP_BUDGET_S = 2.0
+
+def test_headless_startup_budget_and_no_pygame():
+    code = (
+        "import sys, time; start = time.perf_counter();"
+        "from colorfill_gym_env.envs.colorfill_world import ColorfillWorldEnv;"
+        "env = ColorfillWorldEnv(); env.reset(seed=0); env.step(1);"
+        "print(time.perf_counter() - start, 'pygame' in sys.modules)"
+    )
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=repo_root)
+    elapsed, pygame_imported = result.stdout.split()
+    assert pygame_imported == "False"
+    assert float(elapsed) < STARTUP_BUDGET_S
+
+def test_frontier_counts_count_tiles_on_every_backend():
+    import colorfill_gym_env.envs.colorfill as cf
+    import colorfill_gym_env.envs.colorfill_array as cfa
+    import colorfill_gym_env.envs.colorfill_bitboard as cfb
+    colors = np.random.default_rng(6).integers(0, 6, size=(14, 14))
+    boards = [cf.Board(cf.Board.from_numpy_matrix(colors)), cfa.ArrayBoard(colors=colors), cfb.BitBoard(colors=colors)]
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        counts = [board.frontier_counts for board in boards]
+        assert counts[0] == counts[1] == counts[2]
+        blob = boards[1].blob_mask
+        border = np.zeros_like(blob)
+        border[1:] |= blob[:-1]; border[:-1] |= blob[1:]; border[:, 1:] |= blob[:, :-1]; border[:, :-1] |= blob[:, 1:]
+        assert counts[0] == np.bincount(colors[border & ~blob], minlength=6).tolist()
+        assert all(np.array_equal(board.action_mask(), boards[1].action_mask()) for board in boards)
+
+        moves = boards[0].possible_moves()
+        if (not moves):
+            break
+        move = moves[rng.integers(len(moves))]
+        for board in boards:
+            board.make_move(move)
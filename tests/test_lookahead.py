@@ -0,0 +1,152 @@
+import numpy as np
+import pytest
+
+import colorfill_gym_env.envs.colorfill as cf
+import colorfill_gym_env.envs.colorfill_array as cfa
+import colorfill_gym_env.envs.colorfill_bitboard as cfb
+
+BOARD_CLASSES = [cf.Board, cfa.ArrayBoard, cfb.BitBoard]
+
+def board_state(board):
+    return board.to_numpy_matrix(), board.blob_as_numpy_matrix(), board.n_blob_tiles
+
+def assert_same_state(state_a, state_b):
+    assert np.array_equal(state_a[0], state_b[0])
+    assert np.array_equal(state_a[1], state_b[1])
+    assert state_a[2] == state_b[2]
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_push_pop_move_round_trip(board_class):
+    rng = np.random.default_rng(0)
+    board = board_class(rand_generator=np.random.default_rng(4))
+    states = []
+
+    # walk down a random line of play, then undo it all
+    for _ in range(12):
+        states.append(board_state(board))
+        moves = board.possible_moves()
+        move = moves[rng.integers(len(moves))]
+        expected_gain = board.peek_move(move)
+        assert board.push_move(move) == expected_gain
+
+    for state in reversed(states):
+        board.pop_move()
+        assert_same_state(board_state(board), state)
+
+    # and the board still plays like a fresh one
+    fresh = board_class(rand_generator=np.random.default_rng(4))
+    for move in fresh.possible_moves()[:1] * 3:
+        board.make_move(move)
+        fresh.make_move(move)
+    assert_same_state(board_state(board), board_state(fresh))
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+@pytest.mark.parametrize("seed", range(20))
+def test_nested_push_read_pop_round_trip(board_class, seed):
+    board = board_class(rand_generator=np.random.default_rng(seed))
+    state = board_state(board)
+
+    # reading the board between pushes (not between pops) mustn't leak into the undo
+    for _ in range(2):
+        board.push_move(board.possible_moves()[0])
+    board.to_numpy_matrix()
+    board.pop_move()
+    board.pop_move()
+
+    assert_same_state(board_state(board), state)
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_snapshot_restore(board_class):
+    board = board_class(rand_generator=np.random.default_rng(9))
+    board.make_move(board.possible_moves()[0])
+    snapshot = board.snapshot()
+    state = board_state(board)
+    possible = sorted(m.color_index for m in board.possible_moves())
+
+    for _ in range(5):
+        board.make_move(board.possible_moves()[-1])
+    board.restore(snapshot)
+
+    assert_same_state(board_state(board), state)
+    assert sorted(m.color_index for m in board.possible_moves()) == possible
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_peek_move_does_not_mutate(board_class):
+    board = board_class()
+    state = board_state(board)
+    for color_index in range(cf.Color.N_COLORS):
+        board.peek_move(cf.Color(color_index))
+    assert_same_state(board_state(board), state)
+
+def test_state_hash_matches_across_backends_and_from_scratch():
+    rng = np.random.default_rng(3)
+    boards = [board_class(rand_generator=np.random.default_rng(8)) for board_class in BOARD_CLASSES]
+    seen = {}
+
+    for _ in range(15):
+        hashes = {board.state_hash for board in boards}
+        assert len(hashes) == 1
+        state_hash = hashes.pop()
+        assert state_hash == cf.Zobrist.hash_state(boards[0].blob_as_numpy_matrix().astype(bool), boards[0].blob.filled_color.color_index)
+
+        # same state => same hash, different states => different hashes
+        blob_bytes = boards[0].blob_as_numpy_matrix().tobytes()
+        assert seen.setdefault(state_hash, blob_bytes) == blob_bytes
+
+        moves = boards[0].possible_moves()
+        move = moves[rng.integers(len(moves))]
+        for board in boards:
+            board.push_move(move)
+
+    before = boards[0].state_hash
+    for board in boards:
+        board.push_move(board.possible_moves()[0])
+        board.pop_move()
+        assert board.state_hash == before
+
+def test_Position_and_Tile_hashable():
+    assert len({cf.Position(1, 2), cf.Position(1, 2), cf.Position(2, 1)}) == 2
+    tile = cf.Tile(cf.Color(0), cf.Position(1, 2))
+    assert tile in {cf.Tile(cf.Color(0), cf.Position(1, 2))}
+
+def test_zobrist_key_cache_is_bounded_and_stable():
+    tile_keys, color_keys = cf.Zobrist.keys(6, 7, 5)
+    cf.Zobrist.keys.cache_clear()
+    for size in range(2, 2 + 3 * cf.Zobrist.TABLE_SHAPES):
+        board_class = BOARD_CLASSES[size % len(BOARD_CLASSES)]
+        board_class(rows=size, cols=size)
+    assert cf.Zobrist.keys.cache_info().currsize <= cf.Zobrist.TABLE_SHAPES
+    # evicted tables are rebuilt with the same keys
+    assert cf.Zobrist.keys(6, 7, 5) == (tile_keys, color_keys)
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_frontier_counts_follow_push_pop_and_restore(board_class):
+    colors = np.random.default_rng(11).integers(0, 6, size=(12, 12))
+    board = board_class(colors) if board_class is not cf.Board else cf.Board(cf.Board.from_numpy_matrix(colors))
+    rng = np.random.default_rng(12)
+
+    def expected_counts():
+        blob = board.blob_as_numpy_matrix().astype(bool)
+        return np.bincount(colors[cf.border_mask(blob)], minlength=6).tolist()
+
+    # moves pushed before the counts are first read, then more after
+    expected_stack = []
+    for depth in range(8):
+        if (depth >= 3):
+            assert board.frontier_counts == expected_counts()
+        moves = board.possible_moves()
+        if (not moves):
+            break
+        expected_stack.append(expected_counts())
+        board.push_move(moves[rng.integers(len(moves))])
+    while expected_stack:
+        board.pop_move()
+        assert board.frontier_counts == expected_stack.pop()
+
+    snapshot = board.snapshot()
+    for _ in range(4):
+        board.make_move(board.possible_moves()[0])
+    board.restore(snapshot)
+    assert board.frontier_counts == expected_counts()
+    board.make_move(board.possible_moves()[-1])
+    assert board.frontier_counts == expected_counts()